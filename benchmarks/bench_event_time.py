@@ -0,0 +1,75 @@
+"""Benchmark parsing of event timestamps.
+
+Compares the ISO fast path of `parse_event_times` with parsing every
+timestamp through dateparser on a synthetic payload of 10k events.
+
+Usage: python benchmarks/bench_event_time.py [<number of events>]
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import dateparser
+
+from reclaim.parse import parse_event_times
+
+
+def make_events(n):
+    """Create n synthetic events with ISO timestamps."""
+    start = datetime(2025, 1, 1, 8, tzinfo=timezone(timedelta(hours=1)))
+    events = []
+    for i in range(n):
+        begin = start + timedelta(minutes=30 * i)
+        end = begin + timedelta(minutes=30)
+        events.append(
+            {
+                "eventDate": {
+                    "start": begin.isoformat(),
+                    "end": end.astimezone(timezone.utc)
+                    .isoformat()
+                    .replace("+00:00", "Z"),
+                }
+            }
+        )
+    return events
+
+
+def dateparser_times(events):
+    """Parse all event timestamps with dateparser (previous behavior)."""
+    return [
+        (
+            dateparser.parse(e["eventDate"]["start"]),
+            dateparser.parse(e["eventDate"]["end"]),
+        )
+        for e in events
+    ]
+
+
+def measure(func, events):
+    """Return the runtime of func on events in seconds."""
+    start = time.perf_counter()
+    func(events)
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark."""
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    events = make_events(n)
+
+    # Both paths must agree on the parsed times
+    sample = events[:100]
+    assert parse_event_times(sample) == dateparser_times(sample)
+
+    slow = measure(dateparser_times, events)
+    fast = measure(parse_event_times, events)
+    print(f"events:     {n}")
+    print(f"dateparser: {slow:.3f}s")
+    print(f"fast path:  {fast:.3f}s ({slow / fast:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
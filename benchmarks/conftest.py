@@ -0,0 +1,124 @@
+"""Synthetic datasets for the benchmarks.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import glob
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+# Directory of the stored baselines
+BASELINES = os.path.join(os.path.dirname(__file__), ".baselines")
+
+# Number of tasks and events in the datasets
+SIZES = [1000, 10000, 100000]
+
+STATUSES = ["NEW", "SCHEDULED", "IN_PROGRESS", "COMPLETE", "ARCHIVED"]
+EVENT_TYPES = ["TASK_ASSIGNMENT", "SMART_HABIT", "SCHEDULING_LINK_MEETING"]
+PRIORITIES = ["P1", "P2", "P3", "P4"]
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """Store baselines next to the benchmarks; compare if one exists."""
+    from pytest_benchmark.utils import get_machine_id
+
+    config.option.benchmark_storage = BASELINES
+    if not glob.glob(os.path.join(BASELINES, get_machine_id(), "*.json")):
+        config.option.benchmark_compare = False
+        config.option.benchmark_compare_fail = None
+
+
+def make_task_data(n, seed=0):
+    """Create the API data of n synthetic tasks."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, 9, tzinfo=timezone.utc)
+    tasks = []
+    for i in range(n):
+        required = rng.randint(1, 32)
+        spent = rng.randint(0, required)
+        tasks.append(
+            {
+                "id": 1000000 + i,
+                "title": f"Task {rng.getrandbits(32):08x}",
+                "status": rng.choice(STATUSES),
+                "priority": rng.choice(PRIORITIES),
+                "due": (start + timedelta(hours=rng.randint(0, 2000)))
+                .isoformat()
+                .replace("+00:00", "Z"),
+                "timeChunksRequired": required,
+                "timeChunksSpent": spent,
+                "timeChunksRemaining": required - spent,
+                "atRisk": rng.random() < 0.1,
+                "eventColor": rng.choice(["NONE", "TOMATO", "BASIL"]),
+            }
+        )
+    return tasks
+
+
+def make_events(n, seed=0):
+    """Create n synthetic events with ISO timestamps."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, 8, tzinfo=timezone.utc)
+    events = []
+    for i in range(n):
+        begin = start + timedelta(minutes=30 * i)
+        end = begin + timedelta(minutes=15 * rng.randint(1, 8))
+        event_type = rng.choice(EVENT_TYPES)
+        events.append(
+            {
+                "eventId": f"e{i}",
+                "title": f"Event {i}",
+                "color": rng.choice(["TOMATO", "SAGE", None]),
+                "eventDate": {
+                    "start": begin.isoformat(),
+                    "end": end.isoformat(),
+                },
+                "reclaimData": {
+                    "reclaimEventType": event_type,
+                    "reclaimResourceId": {
+                        "type": "TaskId",
+                        "id": 1000000 + i,
+                    },
+                    "priority": rng.choice(PRIORITIES),
+                },
+            }
+        )
+    return events
+
+
+@pytest.fixture(scope="session")
+def datasets():
+    """Return a cache of synthetic datasets by kind and size."""
+    return {}
+
+
+@pytest.fixture(params=SIZES, ids=lambda n: f"{n // 1000}k")
+def size(request):
+    """Return the size of a dataset."""
+    return request.param
+
+
+@pytest.fixture
+def tasks(datasets, size):
+    """Return synthetic tasks of the SDK."""
+    from reclaim_sdk.client import ReclaimClient
+    from reclaim_sdk.resources.task import Task
+
+    if ("tasks", size) not in datasets:
+        ReclaimClient.configure(token="benchmark")
+        datasets["tasks", size] = [
+            Task.from_api_data(data) for data in make_task_data(size)
+        ]
+    return datasets["tasks", size]
+
+
+@pytest.fixture
+def events(datasets, size):
+    """Return synthetic events."""
+    if ("events", size) not in datasets:
+        datasets["events", size] = make_events(size)
+    return datasets["events", size]
@@ -0,0 +1,109 @@
+"""Benchmark the functions run per row or per argument.
+
+Each function is measured on synthetic datasets of 1k, 10k and 100k tasks
+or events. Runs are compared with the baseline stored for the machine and
+fail if the median runtime regresses by more than the threshold in
+`benchmarks/pytest.ini`.
+
+Usage:
+    pytest benchmarks                        # compare with baseline
+    pytest benchmarks --benchmark-autosave   # store a new baseline
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import argparse
+import random
+
+import pytest
+
+from reclaim.commands import load_command
+from reclaim.parse import parse_duration, parse_event_times, parse_tid
+from reclaim.str import (
+    scramble_id,
+    str_event_type,
+    str_task_id,
+    str_task_status,
+    str_tid,
+)
+from reclaim.utils import add_event_row
+
+DURATIONS = ["2h15m", "45m", "1.5h", "3 hours", "90min", "1h 30m", "8h"]
+
+
+@pytest.fixture
+def numbers(size):
+    """Return random identifiers."""
+    rng = random.Random(size)
+    return [rng.randrange(36**5) for _ in range(size)]
+
+
+def make_grid():
+    """Create an empty Rich table as used by the list commands."""
+    from rich.table import Table
+
+    return Table(box=False)
+
+
+def test_parse_duration(benchmark, size):
+    """Parse duration strings into minutes."""
+    durations = [DURATIONS[i % len(DURATIONS)] for i in range(size)]
+    benchmark(lambda: [parse_duration(d) for d in durations])
+
+
+def test_parse_tid(benchmark, numbers):
+    """Decode display IDs."""
+    ids = [str_task_id(n) for n in numbers]
+    benchmark(lambda: [parse_tid(i) for i in ids])
+
+
+def test_str_tid(benchmark, numbers):
+    """Encode identifiers in base36."""
+    benchmark(lambda: [str_tid(n) for n in numbers])
+
+
+def test_scramble_id(benchmark, numbers):
+    """Scramble identifiers."""
+    benchmark(lambda: [scramble_id(n) for n in numbers])
+
+
+def test_str_task_status(benchmark, tasks):
+    """Format the status of tasks."""
+    benchmark(lambda: [str_task_status(t) for t in tasks])
+
+
+def test_str_event_type(benchmark, events):
+    """Format the type of events."""
+    benchmark(lambda: [str_event_type(e) for e in events])
+
+
+def test_add_event_row(benchmark, events):
+    """Add events with pre-parsed times to a table."""
+    times = parse_event_times(events)
+
+    def run():
+        grid = make_grid()
+        for event, event_times in zip(events, times):
+            add_event_row(event, grid, True, times=event_times)
+
+    benchmark(run)
+
+
+def test_add_task(benchmark, tasks):
+    """Add tasks to a table."""
+    cmd = load_command("list-tasks")
+
+    def run():
+        grid = make_grid()
+        for task in tasks:
+            cmd.add_task(task, grid)
+
+    benchmark(run)
+
+
+@pytest.mark.parametrize("order", ["due", "progress", "title"])
+def test_sort_tasks(benchmark, tasks, order):
+    """Sort tasks by a field."""
+    cmd = load_command("list-tasks")
+    args = argparse.Namespace(order=order)
+    benchmark(cmd.sort_tasks, tasks, args)
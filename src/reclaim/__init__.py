@@ -3,4 +3,9 @@
 Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 """
 
+import time
+
 __version__ = "0.1.0"
+
+# Start of the import, for the timing of phases with `--profile`
+STARTED = time.perf_counter()
@@ -5,16 +5,19 @@ Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 
 import argparse
 import os
+import shlex
 import sys
 
-import argcomplete
-
 import reclaim.commands as commands
+from reclaim.profile import Profile, phase, profile_mode
 from reclaim.utils import HelpFormatter, load_config, set_api_key
 
+# Commands that are never forwarded to the daemon
+LOCAL_COMMANDS = ("serve", "shell", "import-tasks", "flush")
 
-def parse_args(cmds):
-    """Parse command line arguments."""
+
+def build_parser(cmds):
+    """Build the argument parser for a list of commands."""
     parser = argparse.ArgumentParser(
         prog="reclaim",
         description="Reclaim CLI",
@@ -30,22 +33,60 @@ def parse_args(cmds):
         default="~/.reclaim",
         help="set config file",
     )
+    parser.add_argument(
+        "--record",
+        type=str,
+        metavar="<dir>",
+        help="record responses to directory",
+    )
+    parser.add_argument(
+        "--replay",
+        type=str,
+        metavar="<dir>",
+        help="replay responses from directory",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="show data of the last successful requests",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="summary",
+        metavar="cprofile:<file>",
+        help="print timing of phases and requests",
+    )
 
     # Create subparsers
     subparsers = parser.add_subparsers(dest="command", required=True)
     for cmd in cmds:
         cmd.parse_args(subparsers)
 
+    return parser
+
+
+def parse_args(cmds, argv=None):
+    """Parse command line arguments."""
+    parser = build_parser(cmds)
+
     # Enable shell completion
-    argcomplete.autocomplete(parser)
+    if "_ARGCOMPLETE" in os.environ:
+        import argcomplete
+
+        argcomplete.autocomplete(parser)
 
     # Parse global args
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Expand user home directory
     args.config = os.path.expanduser(args.config)
 
-    # Validate arguments
+    return args
+
+
+def validate_args(cmds, args):
+    """Validate the arguments of the selected command."""
     for cmd in cmds:
         if args.command == cmd.name or args.command in cmd.aliases:
             cmd.validate_args(args)
@@ -53,26 +94,164 @@ def parse_args(cmds):
     return args
 
 
+def command_line():
+    """Return the command line arguments, also during shell completion."""
+    if "_ARGCOMPLETE" in os.environ:
+        line = os.environ.get("COMP_LINE", "")
+        point = int(os.environ.get("COMP_POINT", len(line)))
+        try:
+            return shlex.split(line[:point])[1:]
+        except ValueError:
+            return []
+    return sys.argv[1:]
+
+
 def format_exception(error):
     """Format an error message."""
     return f"Error: {str(error)}"
 
 
-def main():
-    """Run the Reclaim CLI."""
+def run(argv):
+    """Run the command selected in a command line."""
+    mode, argv = profile_mode(argv)
+    if mode is None:
+        return run_phases(argv)
+
+    profile = Profile(mode)
+    profile.start()
     try:
-        cmds = commands.load()
-        args = parse_args(cmds)
+        return run_phases(argv)
+    finally:
+        profile.stop()
+        profile.report()
+
+
+def run_phases(argv):
+    """Run the phases of a command, timed if profiling."""
+    reset_offline()
+    with phase("load commands"):
+        selected = commands.select(argv)
+        cmds = commands.load(
+            lazy=True, selected=selected.name if selected else None
+        )
+    with phase("parse arguments"):
+        args = parse_args(cmds, argv)
+    with phase("load config"):
         args = load_config(args)
+    with phase("validate arguments"):
+        args = validate_args(cmds, args)
+    with phase("set api key"):
         set_api_key(args)
-        args.func(args)
+    with phase("run command"):
+        result = args.func(args)
 
+    print_offline()
+    return result
+
+
+def reset_offline():
+    """Forget snapshots served to a previous command of this process."""
+    if "reclaim.transport" in sys.modules:
+        from reclaim.transport import reset_offline
+
+        reset_offline()
+
+
+def print_offline():
+    """Print a marker if data was served from snapshots."""
+    if "reclaim.transport" not in sys.modules:
+        return
+
+    import time
+    from datetime import datetime
+
+    from reclaim.str import str_duration
+    from reclaim.transport import offline_since
+
+    since = offline_since()
+    if since is None:
+        return
+    date = datetime.fromtimestamp(since).strftime("%Y-%m-%d %H:%M")
+    age = str_duration(int(time.time() - since) // 60)
+    print(f"! Offline | Data from: {date} | Age: {age}", file=sys.stderr)
+
+
+def execute(argv):
+    """Run a command line and return the exit code."""
+    try:
+        run(argv)
+        return 0
     except Exception as e:
         print(format_exception(e), file=sys.stderr)
+        if "reclaim.transport" in sys.modules:
+            from reclaim.transport import OfflineError, network_error
+
+            # Network errors are expected and need no traceback
+            error = network_error(e)
+            if error is not None:
+                if not isinstance(error, OfflineError):
+                    print(
+                        "Use --offline to show the last synced data",
+                        file=sys.stderr,
+                    )
+                return 1
+
         import traceback
 
         traceback.print_exc()
-        sys.exit(1)
+        return 1
+
+
+def forwarded(argv):
+    """Check if a command line is forwarded to a running daemon.
+
+    Interactive and long-running commands, such as watched listings, run
+    in-process, since the daemon serves one command at a time.
+    """
+    if "_ARGCOMPLETE" in os.environ or os.environ.get("RECLAIM_NO_DAEMON"):
+        return False
+
+    selected = commands.select(argv)
+    if selected is not None and selected.name in LOCAL_COMMANDS:
+        return False
+    if (
+        selected is not None
+        and selected.name in ("list-tasks", "list-events")
+        and any(arg.startswith(("-w", "--watch")) for arg in argv)
+    ):
+        return False
+
+    # Recording, replaying, profiling and offline mode need a process and
+    # client of their own
+    options = ("record", "replay", "profile", "offline")
+    if any(os.environ.get(f"RECLAIM_{option.upper()}") for option in options):
+        return False
+    return not any(
+        arg.split("=")[0] in [f"--{option}" for option in options]
+        for arg in argv
+    )
+
+
+def main():
+    """Run the Reclaim CLI."""
+    # The command line tool of httpx imports rich, click and pygments on
+    # every import of httpx. It is not used by the CLI, so its import is
+    # skipped. This is only done here, not for users of the package.
+    if "httpx" not in sys.modules:
+        sys.modules.setdefault("httpx._main", None)
+
+    argv = command_line()
+
+    if forwarded(argv):
+        from reclaim.daemon import forward
+
+        code = forward(argv)
+        if code is not None:
+            sys.exit(code)
+
+    code = execute(argv)
+    if code:
+        sys.exit(code)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,40 @@
+"""Cache Functions.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import json
+import os
+
+
+def cache_path(name):
+    """Return the path of a file in the cache directory."""
+    cache_dir = os.environ.get("RECLAIM_CACHE_DIR")
+    if not cache_dir:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(
+            "~/.cache"
+        )
+        cache_dir = os.path.join(base, "reclaim")
+    return os.path.join(cache_dir, name)
+
+
+def load_cache(name, default=None):
+    """Load a JSON file from the cache directory."""
+    try:
+        with open(cache_path(name)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def save_cache(name, data):
+    """Atomically write a JSON file to the cache directory."""
+    path = cache_path(name)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
@@ -3,31 +3,106 @@
 Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 """
 
-import glob
-import os
+import importlib
+from collections import namedtuple
 
 from .base import Command
 
+# Static command manifest. Only the module of the selected command is
+# imported; all other commands are represented by lightweight stubs.
+# Keep in sync with the attributes of the command classes.
+CommandInfo = namedtuple("CommandInfo", "name aliases description module")
 
-def load():
-    """Find all files in the command directory and import them."""
-    cmd_dir = os.path.relpath(os.path.dirname(__file__))
+MANIFEST = [
+    CommandInfo("add-time", ["add"], "add time to a task", "add-time"),
+    CommandInfo("config", [], "show config template", "config"),
+    CommandInfo(
+        "create-task", ["create", "new"], "create a task", "create-task"
+    ),
+    CommandInfo("delete-task", ["del"], "delete a task", "delete-task"),
+    CommandInfo("edit-task", ["edit"], "edit a task", "edit-task"),
+    CommandInfo("flush", [], "send queued changes", "flush"),
+    CommandInfo(
+        "import-tasks", ["import"], "import tasks from a file", "import-tasks"
+    ),
+    CommandInfo(
+        "list-events", ["events"], "list calendar events", "list-events"
+    ),
+    CommandInfo("list-tasks", ["tasks"], "list tasks", "list-tasks"),
+    CommandInfo("log-work", ["log"], "log work to a task", "log-work"),
+    CommandInfo(
+        "mark-task", ["mark"], "mark a task (in)complete", "mark-task"
+    ),
+    CommandInfo("serve", [], "run background daemon", "serve"),
+    CommandInfo("shell", [], "run interactive shell", "shell"),
+    CommandInfo("show-habit", ["habit"], "show a habit", "show-habit"),
+    CommandInfo("show-load", ["load"], "show estimated workload", "show-load"),
+    CommandInfo("show-task", ["task"], "show a task", "show-task"),
+    CommandInfo("start-task", ["start"], "start a task", "start-task"),
+    CommandInfo("stop-task", ["stop"], "stop a task", "stop-task"),
+    CommandInfo("sync", [], "sync local task store", "sync"),
+]
 
-    # get cmd files
-    cmd_files = [
-        filename
-        for filename in glob.glob("%s/*.py" % cmd_dir)
-        if not filename.endswith("__init__.py")
-    ]
 
-    # import all cmds (except base cmd)
-    for cmd_file in cmd_files:
-        module_name = os.path.splitext(cmd_file)[0]
-        module_name = module_name[module_name.find("reclaim/commands") :]
-        module_name = module_name.replace("/", ".")
-        if not module_name.endswith("base"):
-            __import__(module_name)
+class CommandStub(Command):
+    """Placeholder for a command whose module has not been imported."""
 
-    cmds = Command.__subclasses__()
-    cmds = [c() for c in cmds]  # Initialize the commands
+    def __init__(self, info):
+        """Initialize the stub from a manifest entry."""
+        self.name = info.name
+        self.aliases = info.aliases
+        self.description = info.description
+
+
+def find(name):
+    """Find the manifest entry of a command by name or alias."""
+    for info in MANIFEST:
+        if name == info.name or name in info.aliases:
+            return info
+    return None
+
+
+def select(argv, options=("-c", "--config", "--record", "--replay")):
+    """Return the manifest entry of the command selected in argv."""
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg in options:
+            skip = True
+        elif not arg.startswith("-"):
+            return find(arg)
+    return None
+
+
+def load_command(name):
+    """Import the module of a single command and initialize it."""
+    info = find(name)
+    if info is None:
+        raise ValueError(f"Unknown command: {name}")
+
+    module = importlib.import_module(f"{__name__}.{info.module}")
+    for obj in vars(module).values():
+        if (
+            isinstance(obj, type)
+            and issubclass(obj, Command)
+            and obj.name == info.name
+        ):
+            return obj()
+
+    raise ValueError(f"Command {name} not found in module {info.module}")
+
+
+def load(lazy=False, selected=None):
+    """Initialize the commands from the manifest.
+
+    In lazy mode, only the module of the selected command is imported and
+    all other commands are returned as stubs.
+    """
+    cmds = []
+    for info in MANIFEST:
+        if not lazy or info.name == selected:
+            cmds.append(load_command(info.name))
+        else:
+            cmds.append(CommandStub(info))
     return sorted(cmds, key=lambda x: x.name)
@@ -4,8 +4,9 @@ Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 """
 
 from ..completers import task_ids
+from ..outbox import add_queue_arg, queue
 from ..str import str_duration
-from ..utils import get_task, print_done
+from ..utils import WORKERS, for_each_task
 from .base import Command
 
 
@@ -21,21 +22,29 @@ class AddTimeCommand(Command):
         subparser = super().parse_args(subparsers)
 
         subparser.add_argument(
-            "id", type=str, metavar="<id>", help="task id to add time to"
+            "id",
+            type=str,
+            nargs="+",
+            metavar="<id>",
+            help="task ids to add time to (- reads ids from stdin)",
         ).completer = task_ids
         subparser.add_argument(
             "duration", type=str, metavar="<duration>", help="duration to add"
         )
+        add_queue_arg(subparser)
 
         return subparser
 
     def run(self, args):
         """Add time to task at Reclaim.ai."""
-        task = get_task(args.id)
+        if getattr(args, "queue", False):
+            return queue(args, "add", minutes=args.duration)
 
-        # Add time to task
-        task.add_time(args.duration / 60)  # Expects hours
         dur = str_duration(args.duration)
-        print_done(f"Added: {dur}", task)
 
-        return task
+        def add_time(task):
+            task.add_time(args.duration / 60)  # Expects hours
+            return f"Added: {dur}"
+
+        workers = getattr(args, "workers", WORKERS)
+        return for_each_task(args.id, add_time, workers)
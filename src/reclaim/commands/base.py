@@ -3,7 +3,17 @@
 Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 """
 
-from ..parse import parse_datetime, parse_duration, parse_priority, parse_tid
+import functools
+import sys
+
+from ..index import resolve_tid
+from ..parse import (
+    parse_datetime,
+    parse_duration,
+    parse_priority,
+    parse_tid,
+    read_ids,
+)
 from ..utils import HelpFormatter
 
 
@@ -14,6 +24,7 @@ class Command(object):
     description = None  # Command description
     aliases = []  # Command aliases
     hidden = False  # Hide from help
+    resolve_ids = True  # Resolve task ids by prefix and title
 
     def parse_args(self, subparsers):
         """Add arguments to the subparser."""
@@ -51,10 +62,24 @@ class Command(object):
             "work_time": parse_duration,
         }
 
+        if self.resolve_ids:
+            check_args["id"] = functools.partial(resolve_tid, config=args)
+
+        # Read IDs from stdin if "-" is given
+        if isinstance(getattr(args, "id", None), list) and "-" in args.id:
+            i = args.id.index("-")
+            args.id[i : i + 1] = read_ids(sys.stdin)
+            if not args.id:
+                raise ValueError("No ids read from stdin")
+
         for name, validate in check_args.items():
             if hasattr(args, name) and getattr(args, name) is not None:
+                value = getattr(args, name)
                 try:
-                    setattr(args, name, validate(getattr(args, name)))
+                    if isinstance(value, list):
+                        setattr(args, name, [validate(v) for v in value])
+                    else:
+                        setattr(args, name, validate(value))
                 except ValueError as e:
                     raise ValueError(f"Invalid {name}: {str(e)}")
 
@@ -6,8 +6,6 @@ Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 from collections import defaultdict
 from datetime import date, timedelta
 
-from reclaim_sdk.client import ReclaimClient
-
 from ..str import _EVENT_COLORS
 from .base import Command
 
@@ -27,6 +25,8 @@ class ConfigCommand(Command):
 
     def run(self, args):
         """Print a configuration template with discovered calendar IDs."""
+        from reclaim_sdk.client import ReclaimClient
+
         client = ReclaimClient()
         start = date.today()
         end = start + timedelta(days=60)
@@ -49,6 +49,25 @@ class ConfigCommand(Command):
 
         print("# Reclaim CLI configuration (~/.reclaim)\n")
         print("reclaim_token: <token>\n")
+        print("# Terminal theme: auto, dark or light")
+        print("theme: auto\n")
+        print("# Languages for parsing dates (default: all)")
+        print("# date_languages: [en]\n")
+        print("# Seconds after which the local task store is synced")
+        print("# sync_max_age: 60\n")
+        print("# Concurrent workers for commands on multiple tasks")
+        print("# workers: 4\n")
+        print("# Timeouts in seconds and retries of HTTP requests")
+        print("# connect_timeout: 5")
+        print("# read_timeout: 30")
+        print("# retries: 3\n")
+        print("# Requests per second and shared limit across processes")
+        print("# rate_limit: 10")
+        print("# rate_lock: false\n")
+        print("# Seconds to wait before showing the last synced data")
+        print("# offline_timeout: 10\n")
+        print("# Send changes queued with --queue in the background")
+        print("# queue_flush: true\n")
 
         if not by_cal:
             return
@@ -3,8 +3,7 @@
 Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 """
 
-from reclaim_sdk.resources.task import Task
-
+from ..store import expire_tasks
 from ..utils import print_done
 from .base import Command
 
@@ -90,8 +89,10 @@ class CreateTaskCommand(Command):
         # Add custom checks here
         return args
 
-    def run(self, args):
-        """Create task at Reclaim.ai."""
+    def build_task(self, args):
+        """Build an unsaved task from validated arguments."""
+        from reclaim_sdk.resources.task import Task
+
         task_args = {"title": args.title}
 
         # Prepare optional arguments
@@ -104,7 +105,7 @@ class CreateTaskCommand(Command):
         if args.priority:
             task_args["priority"] = args.priority
 
-        # Create task and save it
+        # Create task
         task = Task(**task_args)
 
         # Set optional arguments
@@ -115,7 +116,12 @@ class CreateTaskCommand(Command):
         if args.max_chunk_size:
             task.max_chunk_size = int(args.max_chunk_size / 15)  # Chunks
 
-        # Save task
+        return task
+
+    def run(self, args):
+        """Create task at Reclaim.ai."""
+        task = self.build_task(args)
         task.save()
+        expire_tasks()
         print_done("Created", task)
         return task
@@ -4,7 +4,7 @@ Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 """
 
 from ..completers import task_ids
-from ..utils import get_task, print_done
+from ..utils import WORKERS, for_each_task
 from .base import Command
 
 
@@ -20,7 +20,11 @@ class DeleteTaskCommand(Command):
         subparser = super().parse_args(subparsers)
 
         subparser.add_argument(
-            "id", type=str, metavar="<id>", help="task id to delete"
+            "id",
+            type=str,
+            nargs="+",
+            metavar="<id>",
+            help="task ids to delete (- reads ids from stdin)",
         ).completer = task_ids
 
         return subparser
@@ -34,9 +38,11 @@ class DeleteTaskCommand(Command):
 
     def run(self, args):
         """Delete tasks at Reclaim.ai."""
-        task = get_task(args.id)
 
-        # Delete task
-        task.delete()
-        print_done("Deleted", task)
+        def delete(task):
+            task.delete()
+            return "Deleted"
+
+        workers = getattr(args, "workers", WORKERS)
+        for_each_task(args.id, delete, workers)
         return None
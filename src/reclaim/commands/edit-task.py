@@ -4,6 +4,7 @@ Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 """
 
 from ..completers import task_ids
+from ..store import expire_tasks
 from ..utils import get_task, print_done
 from .base import Command
 
@@ -117,5 +118,6 @@ class EditTaskCommand(Command):
             task.max_chunk_size = int(args.max_chunk_size / 15)  # Chunks
 
         task.save()
+        expire_tasks()
         print_done("Edited", task)
         return task
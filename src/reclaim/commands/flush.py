@@ -0,0 +1,78 @@
+"""Command to send queued changes to Reclaim.ai.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import sys
+
+from ..outbox import RETRIES, Outbox, apply_entry, describe, outbox_path
+from ..store import expire_tasks
+from ..str import str_task_id
+from ..utils import account_id, print_done
+from .base import Command
+
+
+class FlushCommand(Command):
+    """Send queued changes to Reclaim.ai."""
+
+    name = "flush"
+    description = "send queued changes"
+    aliases = []
+
+    def parse_args(self, subparsers):
+        """Add arguments to the subparser."""
+        subparser = super().parse_args(subparsers)
+
+        subparser.add_argument(
+            "-q",
+            "--quiet",
+            action="store_true",
+            help="keep failures for a later report, e.g., in the background",
+        )
+
+        return subparser
+
+    def run(self, args):
+        """Send queued changes to Reclaim.ai."""
+        outbox = Outbox(outbox_path(account_id()))
+
+        def apply(entry):
+            task, msg = apply_entry(entry)
+            if not args.quiet:
+                print_done(msg, task)
+
+        def report(entry, error):
+            tid = str_task_id(entry["id"])
+            change = describe(entry)
+            print(
+                f"✗ Failed | Id: {tid} | Change: {change} | Error: {error}",
+                file=sys.stderr,
+            )
+
+        if not args.quiet:
+            for entry, error in outbox.failures(clear=True):
+                report(entry, error)
+
+        # Retries with backoff are only worth waiting for in the background
+        retries = RETRIES if args.quiet else 0
+        result = outbox.flush(apply, None if args.quiet else report, retries)
+        if result is None:
+            if not args.quiet:
+                print("✓ Flushing | Already running in the background")
+            return result
+
+        sent, failed, pending = result
+        if sent:
+            expire_tasks()
+        if args.quiet:
+            return result
+
+        print(f"✓ Flushed | Sent: {sent} | Failed: {failed}")
+        if pending:
+            print(
+                f"! Pending | Changes: {pending} | Reclaim.ai not reachable",
+                file=sys.stderr,
+            )
+        if failed:
+            raise ValueError(f"{failed} changes failed")
+        return result
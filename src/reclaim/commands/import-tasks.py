@@ -0,0 +1,100 @@
+"""Command to import tasks from a file to Reclaim.ai.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import sys
+
+from ..importer import import_records, read_records, task_args
+from ..store import expire_tasks
+from ..utils import WORKERS, print_done
+from .base import Command
+
+
+class ImportTasksCommand(Command):
+    """Import tasks from a file to Reclaim.ai."""
+
+    name = "import-tasks"
+    description = "import tasks from a file"
+    aliases = ["import"]
+
+    def parse_args(self, subparsers):
+        """Add arguments to the subparser."""
+        subparser = super().parse_args(subparsers)
+
+        subparser.add_argument(
+            "file",
+            type=str,
+            metavar="<file>",
+            help="file of tasks (.csv, .tsv, .jsonl, .yaml)",
+        )
+        subparser.add_argument(
+            "-C",
+            "--checkpoint",
+            type=str,
+            metavar="<file>",
+            help="checkpoint of created rows, <file>.checkpoint if unset",
+            default=None,
+        )
+        subparser.add_argument(
+            "-n",
+            "--dry-run",
+            action="store_true",
+            help="only validate the tasks",
+        )
+
+        return subparser
+
+    def run(self, args):
+        """Import tasks to Reclaim.ai."""
+        from . import load_command
+
+        create = load_command("create-task")
+
+        def prepare(record):
+            return create.build_task(create.validate_args(task_args(record)))
+
+        def save(task):
+            if not args.dry_run:
+                task.save()
+            return task
+
+        checkpoint = None
+        if not args.dry_run:
+            checkpoint = args.checkpoint or f"{args.file}.checkpoint"
+
+        created, failed = 0, 0
+        for row, task, error in import_records(
+            read_records(args.file),
+            prepare,
+            save,
+            checkpoint,
+            getattr(args, "workers", WORKERS),
+        ):
+            if error:
+                failed += 1
+                print(
+                    f"✗ Failed | Row: {row} | Error: {error}", file=sys.stderr
+                )
+            elif args.dry_run:
+                created += 1
+            else:
+                created += 1
+                print_done("Created", task)
+
+        if not args.dry_run:
+            expire_tasks()
+
+        if args.dry_run:
+            print(f"✓ Validated | Tasks: {created} | Failed: {failed}")
+        else:
+            from ..transport import throttle_stats
+
+            wait = throttle_stats()["wait"]
+            print(
+                f"✓ Imported | Tasks: {created} | Failed: {failed} | "
+                f"Throttled: {wait:.1f}s"
+            )
+        if failed:
+            raise ValueError(f"{failed} rows failed")
+        return created
@@ -5,12 +5,11 @@ Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 
 from datetime import date, timedelta
 
-from reclaim_sdk.client import ReclaimClient
-from rich.console import Console
-from rich.table import Table
-
-from ..parse import parse_datetime
-from ..utils import add_event_row
+from ..events import fetch_events
+from ..output import EVENT_FIELDS, RecordWriter, add_format_arg
+from ..parse import parse_datetime, parse_event_times
+from ..utils import event_record, event_row, fetch_parallel
+from ..watch import add_watch_arg, check_watch_args
 from .base import Command
 
 
@@ -41,12 +40,15 @@ class ListEventsCommand(Command):
             help="show events up to x days from the starting date",
             default=None,
         )
+        add_watch_arg(subparser)
+        add_format_arg(subparser)
 
         return subparser
 
     def validate_args(self, args):
         """Validate and transform command arguments."""
         args = super().validate_args(args)
+        check_watch_args(args)
 
         if args.date:
             try:
@@ -61,24 +63,47 @@ class ListEventsCommand(Command):
 
     def run(self, args):
         """List events at Reclaim.ai."""
-        start = args.date if args.date else date.today()
-
-        if args.future is not None:
-            end = start + timedelta(days=args.future + 1)
-            multi_day = True
-        else:
-            end = start + timedelta(days=1)
-            multi_day = False
+        output_format = getattr(args, "format", "table")
+        from reclaim_sdk.client import ReclaimClient
 
+        # Fetch events and habits concurrently
         client = ReclaimClient()
-        events = client.get(
-            "/api/events/v2",
-            params={
-                "start": start.strftime("%Y-%m-%d"),
-                "end": end.strftime("%Y-%m-%d"),
-                "allConnected": "true",
-            },
+        events, habits = fetch_parallel(
+            lambda: self.fetch(args, client),
+            lambda: client.get("/api/assist/habits/daily"),
         )
+        habit_lookup = {h["title"]: h["id"] for h in habits}
+
+        if output_format != "table":
+            writer = RecordWriter(output_format, EVENT_FIELDS)
+            for event, event_times in zip(events, parse_event_times(events)):
+                record = event_record(event, habit_lookup, event_times)
+                if record:
+                    writer.write(record)
+            return events
+
+        if getattr(args, "watch", None):
+            self.watch_events(client, events, habit_lookup, args)
+            return events
+
+        from rich.console import Console
+
+        multi_day = args.future is not None
+        calendars = getattr(args, "calendars", None)
+        rows = [
+            event_row(event, multi_day, habit_lookup, calendars, event_times)
+            for event, event_times in zip(events, parse_event_times(events))
+        ]
+        Console().print(self.create_table(rows, multi_day))
+        return events
+
+    def fetch(self, args, client):
+        """Fetch the events of the requested days, sorted by start."""
+        start = args.date if args.date else date.today()
+        days = 1 if args.future is None else args.future + 1
+        end = start + timedelta(days=days)
+        events = fetch_events(start, end, client, allConnected="true")
+
         start_str = start.strftime("%Y-%m-%d")
         end_str = end.strftime("%Y-%m-%d")
         events = [
@@ -89,9 +114,11 @@ class ListEventsCommand(Command):
             < end_str
         ]
         events.sort(key=lambda e: (e.get("eventDate") or {}).get("start", ""))
+        return events
 
-        habits = client.get("/api/assist/habits/daily")
-        habit_lookup = {h["title"]: h["id"] for h in habits}
+    def create_table(self, rows, multi_day):
+        """Create a table of formatted event rows."""
+        from rich.table import Table
 
         grid = Table(box=False, header_style="bold underline")
         grid.add_column("")
@@ -103,9 +130,44 @@ class ListEventsCommand(Command):
         grid.add_column("Type", justify="center")
         grid.add_column("Title")
 
-        calendars = getattr(args, "calendars", None)
-        for event in events:
-            add_event_row(event, grid, multi_day, habit_lookup, calendars)
+        for row in rows:
+            if row is not None:
+                grid.add_row(*row)
+        return grid
 
-        Console().print(grid)
-        return events
+    def watch_events(self, client, events, habit_lookup, args):
+        """Show events and update them whenever they change."""
+        import hashlib
+        import json
+
+        from ..watch import RowCache, watch
+
+        multi_day = args.future is not None
+        calendars = getattr(args, "calendars", None)
+        cache = RowCache(
+            lambda e: event_row(e, multi_day, habit_lookup, calendars)
+        )
+        pending = [events]  # Events to show at the next poll
+        digest = [None]
+
+        def poll():
+            fetched = not pending
+            current = pending.pop() if pending else self.fetch(args, client)
+            keys = [json.dumps(e, sort_keys=True) for e in current]
+            value = hashlib.sha256("\n".join(keys).encode()).digest()
+            if value == digest[0]:
+                return None
+            digest[0] = value
+
+            # Habits may have been created or renamed meanwhile
+            if fetched:
+                habits = client.get("/api/assist/habits/daily")
+                lookup = {h["title"]: h["id"] for h in habits}
+                if lookup != habit_lookup:
+                    habit_lookup.clear()
+                    habit_lookup.update(lookup)
+                    cache.clear()
+            rows = cache.get(current, keys)
+            return self.create_table(rows, multi_day)
+
+        watch(poll, args.watch)
@@ -3,14 +3,22 @@
 Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 """
 
-from reclaim_sdk.resources.task import Task, TaskStatus
-from rich.console import Console
-from rich.table import Table
-
+from ..output import TASK_FIELDS, RecordWriter, add_format_arg, task_record
 from ..parse import parse_list
 from ..str import str_duration, str_task_color, str_task_id, str_task_state
+from ..watch import add_watch_arg, check_watch_args
 from .base import Command
 
+# Task status names (see reclaim_sdk.resources.task.TaskStatus)
+STATUSES = [
+    "NEW",
+    "SCHEDULED",
+    "IN_PROGRESS",
+    "COMPLETE",
+    "CANCELLED",
+    "ARCHIVED",
+]
+
 
 class ListTasksCommand(Command):
     """List tasks at Reclaim.ai."""
@@ -57,11 +65,14 @@ class ListTasksCommand(Command):
             help="order by field: id, due, left, prog, status, title",
             default="due",
         )
+        add_watch_arg(subparser)
+        add_format_arg(subparser)
         return subparser
 
     def validate_args(self, args):
         """Validate arguments."""
         super().validate_args(args)
+        check_watch_args(args)
 
         if args.status == "active":
             args.status = "new,scheduled,in_progress"
@@ -69,22 +80,51 @@ class ListTasksCommand(Command):
         if args.all:
             args.status = "all"
 
-        # Convert status strings to enums
-        try:
-            status_list = parse_list(args.status)
-            args.status = (
-                []
-                if "all" in status_list
-                else [TaskStatus[s.upper()] for s in status_list]
-            )
-        except KeyError as e:
-            raise ValueError(f"Invalid task status: {str(e)}")
+        # Check status strings before converting them to enums
+        status_list = parse_list(args.status)
+        if "all" in status_list:
+            args.status = []
+            return args
+
+        for s in status_list:
+            if s.upper() not in STATUSES:
+                raise ValueError(f"Invalid task status: '{s.upper()}'")
+
+        from reclaim_sdk.resources.task import TaskStatus
+
+        args.status = [TaskStatus[s.upper()] for s in status_list]
 
         return args
 
     def run(self, args):
         """List (filtered and sorted) tasks."""
-        tasks = self.sort_tasks(Task.list(), args)
+        output_format = getattr(args, "format", "table")
+        from ..store import MAX_AGE, TaskStore
+
+        max_age = getattr(args, "sync_max_age", MAX_AGE)
+        store = TaskStore()
+        tasks = self.sort_tasks(store.tasks(max_age), args)
+        output = [task for task in tasks if self.filter_task(task, args)]
+
+        if output_format != "table":
+            writer = RecordWriter(output_format, TASK_FIELDS)
+            for task in output:
+                writer.write(task_record(task))
+            return output
+
+        if getattr(args, "watch", None):
+            self.watch_tasks(store, output, args)
+            return output
+
+        from rich.console import Console
+
+        console = Console()
+        console.print(self.create_table(map(self.task_row, output)))
+        return output
+
+    def create_table(self, rows):
+        """Create a table of formatted task rows."""
+        from rich.table import Table
 
         grid = Table(box=False, header_style="bold underline")
 
@@ -96,25 +136,46 @@ class ListTasksCommand(Command):
         grid.add_column("State", justify="center")
         grid.add_column("Title", justify="left")
 
-        # Print tasks
-        output = []
-        for task in tasks:
-            if self.filter_task(task, args):
-                output.append(task)
-                self.add_task(task, grid)
+        for row in rows:
+            grid.add_row(*row)
+        return grid
 
-        console = Console()
-        console.print(grid)
-        return output
+    def watch_tasks(self, store, tasks, args):
+        """Show tasks and update them whenever the store changes."""
+        from datetime import date
 
-    def add_task(self, task, grid):
-        """Format and add a task to the grid."""
+        from ..watch import RowCache, watch
+
+        cache = RowCache(self.task_row)
+        shown = {"tasks": tasks, "date": None}
+
+        def poll():
+            # Task states depend on the date, so a new day redraws
+            today = date.today()
+            if shown["date"] is None:
+                pass  # Tasks of the initial listing
+            elif store.sync():
+                current = self.sort_tasks(store.tasks(float("inf")), args)
+                shown["tasks"] = [
+                    t for t in current if self.filter_task(t, args)
+                ]
+            elif shown["date"] == today:
+                return None
+
+            shown["date"] = today
+            keys = [(t.id, t.updated, today) for t in shown["tasks"]]
+            return self.create_table(cache.get(shown["tasks"], keys))
+
+        watch(poll, args.watch)
+
+    def task_row(self, task):
+        """Format a task as a table row."""
         short_id = str_task_id(task.id)
         due_date = task.due.strftime("%Y-%m-%d") if task.due else "anytime"
         time_required = task.time_chunks_required * 15
         time_spent = task.time_chunks_spent * 15
         progress = 1 if time_required == 0 else time_spent / time_required
-        grid.add_row(
+        return (
             str_task_color(task),
             short_id,
             due_date,
@@ -124,6 +185,10 @@ class ListTasksCommand(Command):
             task.title,
         )
 
+    def add_task(self, task, grid):
+        """Format and add a task to the grid."""
+        grid.add_row(*self.task_row(task))
+
     def filter_task(self, task, args):
         """Check if task matches filter criteria."""
         if args.status and task.status not in args.status:
@@ -4,8 +4,9 @@ Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 """
 
 from ..completers import task_ids
+from ..outbox import add_queue_arg, queue
 from ..str import str_duration
-from ..utils import get_task, print_done
+from ..utils import WORKERS, for_each_task
 from .base import Command
 
 
@@ -21,7 +22,11 @@ class LogWorkCommand(Command):
         subparser = super().parse_args(subparsers)
 
         subparser.add_argument(
-            "id", type=str, metavar="<id>", help="task id to log work for"
+            "id",
+            type=str,
+            nargs="+",
+            metavar="<id>",
+            help="task ids to log work for (- reads ids from stdin)",
         ).completer = task_ids
         subparser.add_argument(
             "duration", type=str, metavar="<duration>", help="duration of work"
@@ -34,6 +39,7 @@ class LogWorkCommand(Command):
             help="set log time",
             default="now",
         )
+        add_queue_arg(subparser)
 
         return subparser
 
@@ -46,11 +52,15 @@ class LogWorkCommand(Command):
 
     def run(self, args):
         """Log work at Reclaim.ai."""
-        task = get_task(args.id)
+        if getattr(args, "queue", False):
+            end = args.log_time.timestamp()
+            return queue(args, "log", minutes=args.duration, end=end)
 
-        # Log work
-        task.log_work(args.duration, end=args.log_time)  # Expects minutes
         dur = str_duration(args.duration)
 
-        print_done(f"Logged: {dur}", task)
-        return task
+        def log_work(task):
+            task.log_work(args.duration, end=args.log_time)  # Expects minutes
+            return f"Logged: {dur}"
+
+        workers = getattr(args, "workers", WORKERS)
+        return for_each_task(args.id, log_work, workers)
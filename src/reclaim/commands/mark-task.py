@@ -4,7 +4,8 @@ Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 """
 
 from ..completers import task_ids
-from ..utils import get_task, print_done
+from ..outbox import add_queue_arg, queue
+from ..utils import WORKERS, for_each_task
 from .base import Command
 
 
@@ -20,7 +21,11 @@ class MarkTaskCommand(Command):
         subparser = super().parse_args(subparsers)
 
         subparser.add_argument(
-            "id", type=str, metavar="<id>", help="task id to add time to"
+            "id",
+            type=str,
+            nargs="+",
+            metavar="<id>",
+            help="task ids to mark (- reads ids from stdin)",
         ).completer = task_ids
         subparser.add_argument(
             "mark",
@@ -29,6 +34,7 @@ class MarkTaskCommand(Command):
             default="complete",
             help="mark to set: complete, incomplete",
         )
+        add_queue_arg(subparser)
 
         return subparser
 
@@ -44,13 +50,15 @@ class MarkTaskCommand(Command):
 
     def run(self, args):
         """Mark task at Reclaim.ai."""
-        task = get_task(args.id)
+        if getattr(args, "queue", False):
+            return queue(args, args.mark)
 
-        # Mark task
-        if args.mark == "complete":
-            task.mark_complete()
-        else:
-            task.mark_incomplete()
+        def mark(task):
+            if args.mark == "complete":
+                task.mark_complete()
+            else:
+                task.mark_incomplete()
+            return f"Marked: {args.mark}"
 
-        print_done(f"Marked: {args.mark}", task)
-        return task
+        workers = getattr(args, "workers", WORKERS)
+        return for_each_task(args.id, mark, workers)
@@ -0,0 +1,67 @@
+"""Command to run a background daemon for Reclaim CLI.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+from ..daemon import CACHE_TTL, IDLE_TIMEOUT, serve, socket_path, stop
+from ..utils import spawn_detached
+from .base import Command
+
+
+class ServeCommand(Command):
+    """Run a background daemon for Reclaim CLI."""
+
+    name = "serve"
+    description = "run background daemon"
+    aliases = []
+
+    def parse_args(self, subparsers):
+        """Add arguments to the subparser."""
+        subparser = super().parse_args(subparsers)
+
+        subparser.add_argument(
+            "-d",
+            "--detach",
+            action="store_true",
+            help="run daemon in background",
+        )
+        subparser.add_argument(
+            "-i",
+            "--idle",
+            type=int,
+            metavar="<seconds>",
+            help="exit after seconds without requests",
+            default=IDLE_TIMEOUT,
+        )
+        subparser.add_argument(
+            "-t",
+            "--ttl",
+            type=int,
+            metavar="<seconds>",
+            help="seconds to cache responses",
+            default=CACHE_TTL,
+        )
+        subparser.add_argument(
+            "-s",
+            "--stop",
+            action="store_true",
+            help="stop running daemon",
+        )
+
+        return subparser
+
+    def run(self, args):
+        """Run the daemon."""
+        if args.stop:
+            if not stop():
+                raise ValueError("No daemon running")
+            print(f"✓ Stopped | Socket: {socket_path()}")
+        elif args.detach:
+            spawn_detached(
+                "reclaim",
+                *("-c", args.config, "serve"),
+                *("-i", str(args.idle), "-t", str(args.ttl)),
+            )
+            print(f"✓ Started | Socket: {socket_path()}")
+        else:
+            serve(idle=args.idle, ttl=args.ttl)
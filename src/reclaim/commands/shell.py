@@ -0,0 +1,34 @@
+"""Command to run an interactive shell for Reclaim CLI.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+from ..shell import CACHE_TTL, Shell
+from .base import Command
+
+
+class ShellCommand(Command):
+    """Run an interactive shell for Reclaim CLI."""
+
+    name = "shell"
+    description = "run interactive shell"
+    aliases = []
+
+    def parse_args(self, subparsers):
+        """Add arguments to the subparser."""
+        subparser = super().parse_args(subparsers)
+
+        subparser.add_argument(
+            "-t",
+            "--ttl",
+            type=int,
+            metavar="<seconds>",
+            help="seconds to cache responses",
+            default=CACHE_TTL,
+        )
+
+        return subparser
+
+    def run(self, args):
+        """Run the shell."""
+        Shell(args.config, args.ttl).loop()
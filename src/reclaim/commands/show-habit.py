@@ -3,18 +3,28 @@
 Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 """
 
-from datetime import date, timedelta
-
-from reclaim_sdk.client import ReclaimClient
-from reclaim_sdk.exceptions import RecordNotFound
-from rich.console import Console
-from rich.table import Table
-
 from ..completers import habit_ids
+from ..events import OccurrenceIndex
+from ..output import RecordWriter, add_format_arg
 from ..str import str_duration, str_task_id
-from ..utils import add_event_row
+from ..utils import add_event_row, fetch_parallel
 from .base import Command
 
+# Fields of habit details
+HABIT_FIELDS = [
+    "id",
+    "title",
+    "enabled",
+    "priority",
+    "duration_min",
+    "duration_max",
+    "ideal_time",
+    "recurrence",
+    "category",
+    "created",
+    "updated",
+]
+
 
 class ShowHabitCommand(Command):
     """Show a habit at Reclaim.ai."""
@@ -23,6 +33,7 @@ class ShowHabitCommand(Command):
     description = "show a habit"
     aliases = ["habit"]
     hidden = False
+    resolve_ids = False
 
     def parse_args(self, subparsers):
         """Add arguments to the subparser."""
@@ -30,6 +41,7 @@ class ShowHabitCommand(Command):
         subparser.add_argument(
             "id", type=str, metavar="<id>", help="habit id to show"
         ).completer = habit_ids
+        add_format_arg(subparser)
         return subparser
 
     def validate_args(self, args):
@@ -37,14 +49,48 @@ class ShowHabitCommand(Command):
         args = super().validate_args(args)
         return args
 
+    def write_habit(self, habit, fmt):
+        """Write the details of a habit as a record."""
+        recurrence = habit.get("recurringAssignmentType") or ""
+        record = {
+            "id": "h" + str_task_id(habit["id"])[1:],
+            "title": habit["title"],
+            "enabled": bool(habit.get("elevated")),
+            "priority": habit.get("priority"),
+            "duration_min": habit.get("durationMin"),
+            "duration_max": habit.get("durationMax"),
+            "ideal_time": (habit.get("idealTime") or "")[:5] or None,
+            "recurrence": recurrence.replace("_HABIT", "").lower() or None,
+            "category": (habit.get("eventCategory") or "").lower() or None,
+            "created": habit.get("created"),
+            "updated": habit.get("updated"),
+        }
+        RecordWriter(fmt, HABIT_FIELDS).write(record)
+
     def run(self, args):
         """Show habit at Reclaim.ai."""
+        output_format = getattr(args, "format", "table")
+        from reclaim_sdk.client import ReclaimClient
+        from reclaim_sdk.exceptions import RecordNotFound
+
+        # Fetch habit and first window of events concurrently
         client = ReclaimClient()
+        index = OccurrenceIndex(client=client)
+        calls = [lambda: client.get(f"/api/assist/habits/daily/{args.id}")]
+        if output_format == "table":
+            calls.append(index.extend)
         try:
-            habit = client.get(f"/api/assist/habits/daily/{args.id}")
+            habit = fetch_parallel(*calls)[0]
         except RecordNotFound:
             raise ValueError(f"Habit not found: {args.id}")
 
+        if output_format != "table":
+            self.write_habit(habit, output_format)
+            return habit
+
+        from rich.console import Console
+        from rich.table import Table
+
         hid = "h" + str_task_id(habit["id"])[1:]
 
         def fmt(val):
@@ -82,26 +128,9 @@ class ShowHabitCommand(Command):
             "Updated:", fmt_date(habit.get("updated")), "Private:", private
         )
 
-        start = date.today()
-        end = start + timedelta(days=90)
-        events = client.get(
-            "/api/events/v2",
-            params={
-                "start": start.strftime("%Y-%m-%d"),
-                "end": end.strftime("%Y-%m-%d"),
-            },
-        )
-        occurrences = [
-            e
-            for e in events
-            if (e.get("reclaimData") or {})
-            .get("reclaimResourceId", {})
-            .get("type")
-            == "SmartSeriesId"
-            and e.get("title") == habit["title"]
-        ]
-        occurrences.sort(
-            key=lambda e: (e.get("eventDate") or {}).get("start", "")
+        # Find planned occurrences until more than three are found
+        occurrences = index.find(
+            title=habit["title"], enough=lambda occ: len(occ) > 3
         )
         has_more = len(occurrences) > 3
         occurrences = occurrences[:3]
@@ -3,15 +3,16 @@
 Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 """
 
-from datetime import datetime, timedelta, timezone
-
-from reclaim_sdk.resources.task import Task
-from rich.console import Console
-from rich.table import Table
+from datetime import datetime, timezone
 
+from ..load import BUCKETS, load_buckets
+from ..output import RecordWriter, add_format_arg
 from ..str import str_task_id
 from .base import Command
 
+# Fields of load records
+LOAD_FIELDS = ["period", "start", "end", "hours", "load", "tasks", "ids"]
+
 
 class ShowLoadCommand(Command):
     """Show estimated workload at Reclaim.ai."""
@@ -41,6 +42,16 @@ class ShowLoadCommand(Command):
             help="working time per week",
             default="40h",
         )
+        subparser.add_argument(
+            "-b",
+            "--bucket",
+            type=str,
+            metavar="<period>",
+            choices=BUCKETS,
+            help="aggregate load by: day, week, month",
+            default="week",
+        )
+        add_format_arg(subparser)
         return subparser
 
     def validate_args(self, args):
@@ -50,24 +61,6 @@ class ShowLoadCommand(Command):
         # Add custom checks here
         return args
 
-    def next_monday(self, today):
-        """Get date of next monday."""
-        days_until_monday = (7 - today.weekday()) % 7
-        monday = today.replace(
-            hour=0, minute=0, second=0, microsecond=0
-        ) + timedelta(days=days_until_monday)
-        return monday
-
-    def task_load(self, task, today):
-        """Calculate remaining workload for a task."""
-        work_left = (task.time_chunks_required - task.time_chunks_spent) / 4
-        if work_left <= 0:
-            return 0
-
-        start = max(task.snooze_until or today, today)
-        days_left = (task.due - start).days
-        return 7 * (work_left / days_left) if days_left > 0 else 0
-
     def format_task_list(self, tasks, cutoff=4):
         """Format list of task IDs."""
         if len(tasks) <= cutoff:
@@ -76,11 +69,21 @@ class ShowLoadCommand(Command):
             " ".join(str_task_id(t.id) for t in tasks[: cutoff - 1]) + " ..."
         )
 
-    def create_load_table(self):
+    def format_period(self, start, bucket):
+        """Format the label of a period."""
+        if bucket == "day":
+            return start.strftime("%a")
+        if bucket == "month":
+            return start.strftime("%b")
+        return f"W{start.isocalendar()[1]}"
+
+    def create_load_table(self, bucket="week"):
         """Create table for workload display."""
+        from rich.table import Table
+
         table = Table(box=False, header_style="bold underline")
         columns = [
-            ("Week", "left"),
+            (bucket.capitalize(), "left"),
             ("Start", "left"),
             ("End", "left"),
             ("Hours", "right"),
@@ -94,38 +97,54 @@ class ShowLoadCommand(Command):
 
     def run(self, args):
         """Show workload at Reclaim.ai."""
-        tasks = Task.list()
-        table = self.create_load_table()
-        today = datetime.now(timezone.utc)
-        monday = self.next_monday(today)
-
-        for week in range(args.weeks):
-            week_start = monday + timedelta(days=7 * week)
-            week_end = week_start + timedelta(days=7)
-
-            # Get active tasks
-            active_tasks = [t for t in tasks if self.task_load(t, today) > 0]
-
-            # Filter tasks that are within the week
-            week_tasks = []
-            for t in active_tasks:
-                too_early = t.due < week_start
-                too_late = (t.snooze_until or today) > week_end
-                if not (too_early or too_late):
-                    week_tasks.append(t)
-
-            # Calculate total load for the week
-            total_load = sum(self.task_load(t, today) for t in week_tasks)
+        from ..store import MAX_AGE, TaskStore
+
+        output_format = getattr(args, "format", "table")
+        bucket = getattr(args, "bucket", "week")
+        max_age = getattr(args, "sync_max_age", MAX_AGE)
+        tasks = TaskStore().tasks(max_age)
+        today = datetime.now(timezone.utc).date()
+
+        if output_format != "table":
+            writer = RecordWriter(output_format, LOAD_FIELDS)
+            table = None
+        else:
+            from rich.console import Console
+
+            table = self.create_load_table(bucket)
+
+        for start, end, hours, period_tasks in load_buckets(
+            tasks, today, bucket, args.weeks
+        ):
+            # Working time is given per week
+            load = 60 * hours / (args.work_time * (end - start).days / 7)
+
+            if table is None:
+                writer.write(
+                    {
+                        "period": self.format_period(start, bucket),
+                        "start": start.strftime("%Y-%m-%d"),
+                        "end": end.strftime("%Y-%m-%d"),
+                        "hours": round(hours, 2),
+                        "load": round(load, 4),
+                        "tasks": len(period_tasks),
+                        "ids": " ".join(
+                            str_task_id(t.id) for t in period_tasks
+                        ),
+                    }
+                )
+                continue
 
             table.add_row(
-                f"W{week_start.isocalendar()[1]}",
-                week_start.strftime("%Y-%m-%d"),
-                week_end.strftime("%Y-%m-%d"),
-                f"{total_load:.1f}h",
-                f"{60*total_load/args.work_time:.1%}",
-                f"{len(week_tasks)}",
-                self.format_task_list(sorted(week_tasks, key=lambda t: t.due)),
+                self.format_period(start, bucket),
+                start.strftime("%Y-%m-%d"),
+                end.strftime("%Y-%m-%d"),
+                f"{hours:.1f}h",
+                f"{load:.1%}",
+                f"{len(period_tasks)}",
+                self.format_task_list(period_tasks),
             )
 
-        Console().print(table)
+        if table is not None:
+            Console().print(table)
         return tasks
@@ -3,17 +3,27 @@
 Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 """
 
-from datetime import date, timedelta
-
-from reclaim_sdk.client import ReclaimClient
-from rich.console import Console
-from rich.table import Table
-
 from ..completers import task_ids
+from ..events import OccurrenceIndex, event_minutes
+from ..output import TASK_FIELDS, RecordWriter, add_format_arg, task_record
 from ..str import str_duration, str_task_id, str_task_status
-from ..utils import add_event_row, get_task
+from ..utils import add_event_row, fetch_parallel, get_task
 from .base import Command
 
+# Fields of task details
+DETAIL_FIELDS = TASK_FIELDS + [
+    "priority",
+    "required",
+    "spent",
+    "min_chunk",
+    "max_chunk",
+    "snooze_until",
+    "created",
+    "finished",
+    "at_risk",
+    "notes",
+]
+
 
 class ShowTaskCommand(Command):
     """Show a task at Reclaim.ai."""
@@ -30,6 +40,7 @@ class ShowTaskCommand(Command):
         subparser.add_argument(
             "id", type=str, metavar="<id>", help="task id to add time to"
         ).completer = task_ids
+        add_format_arg(subparser)
 
         return subparser
 
@@ -40,9 +51,43 @@ class ShowTaskCommand(Command):
         # Add custom checks here
         return args
 
+    def write_task(self, task, fmt):
+        """Write the details of a task as a record."""
+
+        def iso(date):
+            return date.isoformat() if date else None
+
+        record = task_record(task)
+        record.update(
+            {
+                "priority": str(task.priority.value),
+                "required": task.time_chunks_required * 15,
+                "spent": task.time_chunks_spent * 15,
+                "min_chunk": task.min_chunk_size * 15,
+                "max_chunk": task.max_chunk_size * 15,
+                "snooze_until": iso(task.snooze_until),
+                "created": iso(task.created),
+                "finished": iso(task.finished),
+                "at_risk": bool(task.at_risk),
+                "notes": task.notes,
+            }
+        )
+        RecordWriter(fmt, DETAIL_FIELDS).write(record)
+
     def run(self, args):
         """Show task at Reclaim.ai."""
-        task = get_task(args.id)
+        output_format = getattr(args, "format", "table")
+        if output_format != "table":
+            task = get_task(args.id)
+            self.write_task(task, output_format)
+            return task
+
+        from rich.console import Console
+        from rich.table import Table
+
+        # Fetch task and first window of events concurrently
+        index = OccurrenceIndex()
+        task, _ = fetch_parallel(lambda: get_task(args.id), index.extend)
         tid = str_task_id(task.id)
 
         # Get status
@@ -108,31 +153,11 @@ class ShowTaskCommand(Command):
             "yes" if task.deferred else "no",
         )
 
-        # Fetch planned occurrences within the next 90 days
-        start = date.today()
-        end = start + timedelta(days=90)
-        client = ReclaimClient()
-        events = client.get(
-            "/api/events/v2",
-            params={
-                "start": start.strftime("%Y-%m-%d"),
-                "end": end.strftime("%Y-%m-%d"),
-            },
-        )
-        occurrences = [
-            e
-            for e in events
-            if (e.get("reclaimData") or {})
-            .get("reclaimResourceId", {})
-            .get("type")
-            == "TaskId"
-            and (e.get("reclaimData") or {})
-            .get("reclaimResourceId", {})
-            .get("id")
-            == task.id
-        ]
-        occurrences.sort(
-            key=lambda e: (e.get("eventDate") or {}).get("start", "")
+        # Find planned occurrences until the remaining time is covered
+        remaining = (task.time_chunks_remaining or 0) * 15
+        occurrences = index.find(
+            ("TaskId", task.id),
+            enough=lambda occ: event_minutes(occ) >= remaining,
         )
 
         # Print table
@@ -4,7 +4,8 @@ Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 """
 
 from ..completers import task_ids
-from ..utils import get_task, print_done
+from ..outbox import add_queue_arg, queue
+from ..utils import WORKERS, for_each_task
 from .base import Command
 
 
@@ -20,7 +21,11 @@ class StartTaskCommand(Command):
         subparser = super().parse_args(subparsers)
 
         subparser.add_argument(
-            "id", type=str, metavar="<id>", help="task id to start"
+            "id",
+            type=str,
+            nargs="+",
+            metavar="<id>",
+            help="task ids to start (- reads ids from stdin)",
         ).completer = task_ids
 
         subparser.add_argument(
@@ -29,6 +34,7 @@ class StartTaskCommand(Command):
             action="store_true",
             help="start task in next available slot",
         )
+        add_queue_arg(subparser)
 
         return subparser
 
@@ -41,15 +47,19 @@ class StartTaskCommand(Command):
 
     def run(self, args):
         """Start task at Reclaim.ai."""
-        task = get_task(args.id)
-
-        if args.up_next:
-            # Start task in next available slot
-            task.up_next = True
-            task.save()
-            print_done("Up next", task)
-        else:
+        if getattr(args, "queue", False):
+            return queue(args, "up-next" if args.up_next else "start")
+
+        def start(task):
+            if args.up_next:
+                # Start task in next available slot
+                task.up_next = True
+                task.save()
+                return "Up next"
+
             # Start task immediately
             task.start()
-            print_done("Started", task)
-        return task
+            return "Started"
+
+        workers = getattr(args, "workers", WORKERS)
+        return for_each_task(args.id, start, workers)
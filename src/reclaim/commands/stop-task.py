@@ -4,7 +4,8 @@ Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 """
 
 from ..completers import task_ids
-from ..utils import get_task, print_done
+from ..outbox import add_queue_arg, queue
+from ..utils import WORKERS, for_each_task
 from .base import Command
 
 
@@ -20,8 +21,13 @@ class StopTaskCommand(Command):
         subparser = super().parse_args(subparsers)
 
         subparser.add_argument(
-            "id", type=str, metavar="<id>", help="task id to stop"
+            "id",
+            type=str,
+            nargs="+",
+            metavar="<id>",
+            help="task ids to stop (- reads ids from stdin)",
         ).completer = task_ids
+        add_queue_arg(subparser)
 
         return subparser
 
@@ -34,9 +40,12 @@ class StopTaskCommand(Command):
 
     def run(self, args):
         """Stop task at Reclaim.ai."""
-        task = get_task(args.id)
+        if getattr(args, "queue", False):
+            return queue(args, "stop")
 
-        # Stop task
-        task.stop()
-        print_done("Stopped", task)
-        return task
+        def stop(task):
+            task.stop()
+            return "Stopped"
+
+        workers = getattr(args, "workers", WORKERS)
+        return for_each_task(args.id, stop, workers)
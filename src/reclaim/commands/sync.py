@@ -0,0 +1,35 @@
+"""Command to sync the local task store with Reclaim.ai.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+from ..store import TaskStore
+from .base import Command
+
+
+class SyncCommand(Command):
+    """Sync the local task store with Reclaim.ai."""
+
+    name = "sync"
+    description = "sync local task store"
+    aliases = []
+
+    def parse_args(self, subparsers):
+        """Add arguments to the subparser."""
+        subparser = super().parse_args(subparsers)
+
+        subparser.add_argument(
+            "-f",
+            "--full",
+            action="store_true",
+            help="resync all tasks",
+        )
+
+        return subparser
+
+    def run(self, args):
+        """Sync the local task store."""
+        store = TaskStore()
+        changes = store.sync(full=args.full)
+        print(f"✓ Synced | Changes: {changes} | Store: {store.path}")
+        return changes
@@ -1,9 +1,27 @@
 """Shell completion functions.
 
+Completions are answered from a cache file. If the cache is older than
+`COMPLETION_TTL`, it is refreshed in a detached background process and
+completion waits at most `COMPLETION_DEADLINE` for the new results.
+
 Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 """
 
 import argparse
+import os
+import sys
+import time
+
+from .cache import cache_path, load_cache, save_cache
+
+# Seconds after which cached completions are refreshed
+COMPLETION_TTL = 300
+
+# Seconds to wait for a refresh before answering from the cache
+COMPLETION_DEADLINE = 0.15
+
+# Seconds after which a refresh lock is considered stale
+_LOCK_TIMEOUT = 60
 
 
 def _setup_auth():
@@ -19,31 +37,98 @@ def _setup_auth():
         return False
 
 
-def task_ids(**kwargs):
-    """Return active task display IDs for shell completion."""
-    if not _setup_auth():
-        return []
+def _fetch_task_ids():
+    """Return active task display IDs and titles."""
+    from reclaim_sdk.resources.task import TaskStatus
+
+    from reclaim.store import TaskStore
+    from reclaim.str import str_task_id
+
+    active = {TaskStatus.NEW, TaskStatus.SCHEDULED, TaskStatus.IN_PROGRESS}
+    return {
+        str_task_id(t.id): t.title
+        for t in TaskStore().tasks()
+        if t.status in active
+    }
+
+
+def _fetch_habit_ids():
+    """Return habit display IDs and titles."""
+    from reclaim_sdk.client import ReclaimClient
+
+    from reclaim.str import str_habit_id
+
+    habits = ReclaimClient().get("/api/assist/habits/daily")
+    return {str_habit_id(h["id"]): h["title"] for h in habits}
+
+
+_FETCHERS = {"tasks": _fetch_task_ids, "habits": _fetch_habit_ids}
+
+
+def refresh(kind):
+    """Fetch completions and write them to the cache."""
+    lock = cache_path(f"completions-{kind}.lock")
     try:
-        from reclaim_sdk.resources.task import Task, TaskStatus
+        if _setup_auth():
+            items = _FETCHERS[kind]()
+            save_cache(
+                f"completions-{kind}.json",
+                {"time": time.time(), "items": items},
+            )
+    finally:
+        try:
+            os.remove(lock)
+        except OSError:
+            pass
 
-        from reclaim.str import str_task_id
 
-        active = {TaskStatus.NEW, TaskStatus.SCHEDULED, TaskStatus.IN_PROGRESS}
-        return [str_task_id(t.id) for t in Task.list() if t.status in active]
-    except Exception:
-        return []
+def _spawn_refresh(kind):
+    """Start a detached refresh unless one is already running."""
+    from reclaim.utils import spawn_detached
 
+    lock = cache_path(f"completions-{kind}.lock")
+    try:
+        if time.time() - os.path.getmtime(lock) > _LOCK_TIMEOUT:
+            os.remove(lock)
+    except OSError:
+        pass
 
-def habit_ids(**kwargs):
-    """Return habit display IDs for shell completion."""
-    if not _setup_auth():
-        return []
     try:
-        from reclaim_sdk.client import ReclaimClient
+        os.makedirs(os.path.dirname(lock), exist_ok=True)
+        os.close(os.open(lock, os.O_CREAT | os.O_EXCL))
+    except OSError:
+        return  # Refresh already running
 
-        from reclaim.str import str_task_id
+    spawn_detached("reclaim.completers", kind)
 
-        habits = ReclaimClient().get("/api/assist/habits/daily")
-        return ["h" + str_task_id(h["id"])[1:] for h in habits]
-    except Exception:
-        return []
+
+def _complete(kind):
+    """Return cached completions, refreshing them if stale."""
+    deadline = time.monotonic() + COMPLETION_DEADLINE
+    cached = load_cache(f"completions-{kind}.json", {})
+    if time.time() - cached.get("time", 0) <= COMPLETION_TTL:
+        return cached["items"]
+
+    _spawn_refresh(kind)
+    while time.monotonic() < deadline:
+        time.sleep(0.01)
+        fresh = load_cache(f"completions-{kind}.json", {})
+        if fresh.get("time", 0) > cached.get("time", 0):
+            return fresh["items"]
+
+    # Answer with stale or empty results instead of blocking
+    return cached.get("items", {})
+
+
+def task_ids(**kwargs):
+    """Return active task display IDs and titles for shell completion."""
+    return _complete("tasks")
+
+
+def habit_ids(**kwargs):
+    """Return habit display IDs and titles for shell completion."""
+    return _complete("habits")
+
+
+if __name__ == "__main__":
+    refresh(sys.argv[1])
@@ -0,0 +1,283 @@
+"""Background Daemon.
+
+The daemon keeps the Reclaim client, its connections and a cache of
+responses in memory. Command lines are forwarded to it over a Unix socket
+and the output is streamed back. Requests and responses are JSON lines.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import io
+import json
+import os
+import socket
+import sys
+
+from .cache import cache_path
+
+# Seconds without requests after which the daemon exits
+IDLE_TIMEOUT = 3600
+
+# Seconds for which responses are cached by the daemon
+CACHE_TTL = 30
+
+# Seconds to connect and be greeted before running in-process
+CONNECT_TIMEOUT = 1.0
+
+# Seconds without output after which a forwarded command is given up
+READ_TIMEOUT = 300.0
+
+# Environment forwarded from the client, e.g., for terminal output
+ENVIRONMENT = (
+    "RECLAIM_TOKEN",
+    "TERM",
+    "TERM_PROGRAM",
+    "COLORTERM",
+    "COLORFGBG",
+    "NO_COLOR",
+    "FORCE_COLOR",
+    "TMUX",
+    "SSH_TTY",
+    "COLUMNS",
+    "LINES",
+)
+
+
+def socket_path():
+    """Return the path of the daemon socket."""
+    return os.environ.get("RECLAIM_SOCKET") or cache_path("daemon.sock")
+
+
+def _connect(path):
+    """Connect to the daemon and wait for its greeting, or return None.
+
+    The daemon greets a client when it is ready to run a command. If it
+    is busy with another client or stuck, None is returned before any
+    request is sent, such that the command can be run in-process.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(path)
+        reader = sock.makefile("r", encoding="utf-8")
+        if reader.readline():
+            sock.settimeout(READ_TIMEOUT)
+            return sock, reader
+    except OSError:
+        pass
+    sock.close()
+    return None
+
+
+def _send(sock, message):
+    """Send a message as JSON line."""
+    sock.sendall((json.dumps(message) + "\n").encode())
+
+
+def _environment():
+    """Return the environment forwarded to the daemon."""
+    env = {key: os.environ[key] for key in ENVIRONMENT if key in os.environ}
+    if sys.stdout.isatty() and "COLUMNS" not in env:
+        size = os.get_terminal_size(sys.stdout.fileno())
+        env["COLUMNS"], env["LINES"] = str(size.columns), str(size.lines)
+    return env
+
+
+def forward(argv, path=None):
+    """Run a command line in the daemon and return the exit code.
+
+    None is returned if no daemon is running or it declines the request,
+    such that the command can be run in-process instead. Once a request
+    is sent, it is never run again in-process, since the daemon may have
+    applied a change before the connection was lost.
+    """
+    out, err = sys.stdout, sys.stderr
+
+    stdin = None
+    if "-" in argv:
+        stdin = sys.stdin.read()
+        sys.stdin = io.StringIO(stdin)  # Keep it for a fallback
+
+    connection = _connect(path or socket_path())
+    if connection is None:
+        return None
+
+    sock, reader = connection
+    with sock:
+        try:
+            _send(
+                sock,
+                {
+                    "argv": argv,
+                    "cwd": os.getcwd(),
+                    "env": _environment(),
+                    "tty": [out.isatty(), err.isatty()],
+                    "stdin": stdin,
+                },
+            )
+        except OSError:
+            return None  # The request was not sent, run in-process
+
+        try:
+            for line in reader:
+                frame = json.loads(line)
+                if "out" in frame:
+                    out.write(frame["out"])
+                    out.flush()
+                elif "err" in frame:
+                    err.write(frame["err"])
+                    err.flush()
+                elif "exit" in frame:
+                    return frame["exit"]
+                elif "decline" in frame:
+                    return None
+        except TimeoutError:
+            print("Error: Daemon not responding", file=err)
+            return 1
+        except (OSError, ValueError):
+            pass
+
+    print("Error: Connection to daemon lost", file=err)
+    return 1
+
+
+def stop(path=None):
+    """Ask the daemon to exit; return False if none is running."""
+    connection = _connect(path or socket_path())
+    if connection is None:
+        return False
+    sock, reader = connection
+    with sock:
+        _send(sock, {"stop": True})
+        reader.readline()
+    return True
+
+
+class _Stream(io.TextIOBase):
+    """Text stream sending its output to the client."""
+
+    def __init__(self, sock, key, tty, lock):
+        """Initialize the stream for a socket."""
+        self.sock = sock
+        self.key = key
+        self.tty = tty
+        self.lock = lock
+
+    def write(self, text):
+        """Send text to the client."""
+        if text:
+            with self.lock:
+                _send(self.sock, {self.key: text})
+        return len(text)
+
+    def isatty(self):
+        """Return whether the output of the client is a terminal."""
+        return self.tty
+
+
+def _execute(request, sock):
+    """Run a forwarded command line with the output sent to the client."""
+    import contextlib
+    import threading
+
+    from .__main__ import execute, reset_offline
+    from .parse import parse_datetime
+
+    lock = threading.Lock()
+    out = _Stream(sock, "out", request["tty"][0], lock)
+    err = _Stream(sock, "err", request["tty"][1], lock)
+
+    saved = {key: os.environ.get(key) for key in ENVIRONMENT}
+    os.environ.update(request["env"])
+    for key in set(ENVIRONMENT) - set(request["env"]):
+        os.environ.pop(key, None)
+
+    # Relative dates, such as "in 2h", depend on the time of the request
+    parse_datetime.cache_clear()
+    reset_offline()
+
+    cwd = os.getcwd()
+    stdin = sys.stdin
+    try:
+        os.chdir(request["cwd"])
+        sys.stdin = io.StringIO(request["stdin"] or "")
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                return execute(request["argv"])
+            except SystemExit as e:
+                code = e.code
+                return code if isinstance(code, int) else int(bool(code))
+    finally:
+        sys.stdin = stdin
+        os.chdir(cwd)
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def serve(path=None, idle=IDLE_TIMEOUT, ttl=CACHE_TTL):
+    """Serve forwarded command lines until stopped or idle.
+
+    Requests are handled one after another, since the output of a command
+    is captured by redirecting the standard streams of the process. While
+    a command runs, other clients are not greeted and run in-process.
+    """
+    import socketserver
+
+    from .__main__ import forwarded
+    from .transport import CachingTransport, add_transport
+
+    path = path or socket_path()
+
+    # A busy daemon accepts connections without greeting
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        if sock.connect_ex(path) == 0:
+            raise ValueError(f"Daemon already running at {path}")
+    if os.path.exists(path):
+        os.remove(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    add_transport(lambda transport: CachingTransport(transport, ttl))
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            self.connection.settimeout(READ_TIMEOUT)
+            try:
+                _send(self.connection, {"ready": True})
+                line = self.rfile.readline()
+            except OSError:
+                return
+            if not line:
+                return  # The client gave up waiting
+            request = json.loads(line)
+            if request.get("stop"):
+                self.server.done = True
+                code = 0
+            elif not forwarded(request["argv"]):
+                _send(self.connection, {"decline": True})
+                return
+            else:
+                code = _execute(request, self.connection)
+            _send(self.connection, {"exit": code})
+
+    class Server(socketserver.UnixStreamServer):
+        done = False
+
+        def handle_timeout(self):
+            self.done = True
+
+    umask = os.umask(0o077)  # Socket only accessible by the user
+    try:
+        server = Server(path, Handler)
+    finally:
+        os.umask(umask)
+
+    server.timeout = idle
+    try:
+        while not server.done:
+            server.handle_request()
+    finally:
+        server.server_close()
+        os.remove(path)
@@ -0,0 +1,111 @@
+"""Event Functions.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+
+from .parse import parse_event_times
+
+# Days of the expanding windows for searching occurrences
+WINDOWS = [7, 30, 90]
+
+
+def fetch_events(start, end, client=None, **params):
+    """Fetch the events between two dates from Reclaim.ai."""
+    if client is None:
+        from reclaim_sdk.client import ReclaimClient
+
+        client = ReclaimClient()
+
+    return client.get(
+        "/api/events/v2",
+        params={
+            "start": start.strftime("%Y-%m-%d"),
+            "end": end.strftime("%Y-%m-%d"),
+            **params,
+        },
+    )
+
+
+def resource_key(event):
+    """Return the Reclaim resource of an event as (type, id) tuple."""
+    reclaim_data = event.get("reclaimData") or {}
+    resource_id = reclaim_data.get("reclaimResourceId") or {}
+    id_type = resource_id.get("type")
+
+    if id_type == "SmartSeriesId":
+        return id_type, resource_id.get("seriesId")
+    elif id_type in ("TaskId", "SchedulingLinkId"):
+        return id_type, resource_id.get("id")
+    return None
+
+
+def event_start(event):
+    """Return the start string of an event for sorting."""
+    return (event.get("eventDate") or {}).get("start", "")
+
+
+def event_minutes(events):
+    """Return the total duration of events in minutes."""
+    return sum(
+        (end - start).total_seconds() / 60
+        for start, end in parse_event_times(events)
+        if start and end
+    )
+
+
+class OccurrenceIndex(object):
+    """Index of events by Reclaim resource, fetched in expanding windows.
+
+    Events are fetched window by window (e.g., 7, 30 and 90 days) and
+    grouped once by their resource. Habit events are additionally grouped
+    by title, since daily habits and their series have different IDs.
+    """
+
+    def __init__(self, start=None, windows=WINDOWS, client=None):
+        """Initialize an empty index starting at a date."""
+        self.start = start or date.today()
+        self.windows = list(windows)
+        self.client = client
+        self.days = 0  # Days fetched so far
+        self.resources = defaultdict(list)
+        self.titles = defaultdict(list)
+        self.seen = set()
+
+    def add(self, events):
+        """Group events by resource and habit title."""
+        for event in events:
+            key = resource_key(event)
+            if not key or event.get("eventId") in self.seen:
+                continue
+            if event.get("eventId"):
+                self.seen.add(event["eventId"])
+            self.resources[key].append(event)
+            if key[0] == "SmartSeriesId":
+                self.titles[event.get("title")].append(event)
+
+    def extend(self):
+        """Fetch the next window of events; return False if exhausted."""
+        if not self.windows:
+            return False
+
+        days = self.windows.pop(0)
+        start = self.start + timedelta(days=self.days)
+        end = self.start + timedelta(days=days)
+        self.add(fetch_events(start, end, self.client))
+        self.days = days
+        return True
+
+    def find(self, key=None, title=None, enough=None):
+        """Find the occurrences of a resource or habit title.
+
+        The window is extended until `enough(occurrences)` holds or all
+        windows are fetched. Occurrences are sorted by start time.
+        """
+        while True:
+            events = self.resources[key] if key else self.titles[title]
+            events = sorted(events, key=event_start)
+            if (enough and enough(events)) or not self.extend():
+                return events
@@ -0,0 +1,145 @@
+"""Bulk Task Import.
+
+Records are streamed from CSV, TSV, JSONL or YAML files and created by a
+pool of workers. Created rows are appended to a checkpoint file, such that
+an interrupted import can be resumed without creating duplicates.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import argparse
+import json
+import os
+import re
+
+# Fields of a task record, matching the arguments of create-task
+FIELDS = (
+    "title",
+    "notes",
+    "due",
+    "priority",
+    "duration",
+    "min_chunk_size",
+    "max_chunk_size",
+    "snooze_until",
+)
+
+
+def _field(key):
+    """Normalize a field name, e.g., "Snooze until" or "snoozeUntil"."""
+    key = re.sub(r"(?<=[a-z])(?=[A-Z])", "_", str(key).strip())
+    return re.sub(r"[\s-]+", "_", key).lower()
+
+
+def read_records(path):
+    """Stream (row, record) pairs from a CSV, TSV, JSONL or YAML file."""
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, newline="") as f:
+        if ext in (".csv", ".tsv"):
+            import csv
+
+            delimiter = "\t" if ext == ".tsv" else ","
+            records = csv.DictReader(f, delimiter=delimiter)
+        elif ext in (".jsonl", ".ndjson"):
+            records = (line for line in f if line.strip())
+        elif ext in (".yaml", ".yml"):
+            import yaml
+
+            records = _yaml_records(yaml.safe_load_all(f))
+        else:
+            raise ValueError(f"Unsupported file format: {ext}")
+
+        for row, record in enumerate(records, 1):
+            yield row, record
+
+
+def _yaml_records(documents):
+    """Yield records from YAML documents holding records or lists."""
+    for doc in documents:
+        if isinstance(doc, list):
+            yield from doc
+        elif doc is not None:
+            yield doc
+
+
+def task_args(record):
+    """Convert a record or JSON line to arguments for create-task."""
+    if isinstance(record, str):
+        record = json.loads(record)
+    if not isinstance(record, dict):
+        raise ValueError("Record is not a mapping")
+
+    args = argparse.Namespace(**dict.fromkeys(FIELDS))
+    for key, value in record.items():
+        name = _field(key)
+        if name not in FIELDS:
+            raise ValueError(f"Unknown field: {key}")
+        if value is not None and str(value).strip():
+            setattr(args, name, str(value).strip())
+
+    if not args.title:
+        raise ValueError("Missing title")
+    return args
+
+
+def load_checkpoint(path):
+    """Return the rows recorded in a checkpoint file."""
+    rows = set()
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    rows.add(json.loads(line)["row"])
+                except (ValueError, KeyError):
+                    pass  # Truncated by an interrupted import
+    except FileNotFoundError:
+        pass
+    return rows
+
+
+def import_records(records, prepare, create, checkpoint=None, workers=4):
+    """Create tasks from records and yield (row, task, error) tuples.
+
+    Records are prepared in the calling thread and created by a pool of
+    workers with a bounded number of pending rows. Rows in the checkpoint
+    file are skipped and created rows are appended to it.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    done = load_checkpoint(checkpoint) if checkpoint else set()
+    log = open(checkpoint, "a") if checkpoint else None
+    pending = {}
+
+    def collect(futures):
+        for future in futures:
+            row = pending.pop(future)
+            try:
+                task = future.result()
+            except Exception as e:
+                yield row, None, e
+                continue
+            if log:
+                log.write(json.dumps({"row": row, "id": task.id}) + "\n")
+                log.flush()
+            yield row, task, None
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            for row, record in records:
+                if row in done:
+                    continue
+                try:
+                    task = prepare(record)
+                except Exception as e:
+                    yield row, None, e
+                    continue
+
+                pending[pool.submit(create, task)] = row
+                if len(pending) >= 2 * workers:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from collect(finished)
+
+            yield from collect(list(pending))
+    finally:
+        if log:
+            log.close()
@@ -0,0 +1,170 @@
+"""Local Index of Task IDs.
+
+Task arguments accept display IDs, unique prefixes of display IDs and
+fragments of task titles. They are resolved against an index of display
+IDs, titles and states that is written next to the local task store on
+every sync, such that no request is needed to resolve an argument.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import marshal
+import os
+from array import array
+
+from .cache import cache_path
+from .parse import parse_tid
+from .str import str_task_id
+
+# Version of the index format; a change triggers a rebuild
+VERSION = 2
+
+# Minimum share of the trigrams of a fragment found in a title
+MIN_SCORE = 0.5
+
+# Task states preferred over others for ambiguous matches
+ACTIVE = ("NEW", "SCHEDULED", "IN_PROGRESS")
+
+
+def trigrams(text):
+    """Return the trigrams of a text, padded at word boundaries."""
+    text = f"  {' '.join(text.lower().split())} "
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class TaskIndex(object):
+    """Index of tasks by display ID and title trigrams."""
+
+    def __init__(self, path):
+        """Initialize the index stored in a file."""
+        self.path = path
+        self.tasks = []  # Entries of (display ID, id, title, status, grams)
+        self.grams = {}  # Trigrams mapped to packed entry positions
+
+    def load(self):
+        """Load the index; return False if missing or outdated."""
+        try:
+            with open(self.path, "rb") as f:
+                version, self.tasks, self.grams = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return False
+        return version == VERSION
+
+    def build(self, tasks):
+        """Build and save the index from (id, title, status) tuples."""
+        self.tasks, grams = [], {}
+        for task_id, title, status in tasks:
+            pos = len(self.tasks)
+            title = title or ""
+            title_grams = trigrams(title)
+            self.tasks.append(
+                (
+                    str_task_id(task_id),
+                    task_id,
+                    title,
+                    status,
+                    len(title_grams),
+                )
+            )
+            for gram in title_grams:
+                grams.setdefault(gram, array("I")).append(pos)
+        self.grams = {gram: pos.tobytes() for gram, pos in grams.items()}
+
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp, "wb") as f:
+                marshal.dump((VERSION, self.tasks, self.grams), f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def find(self, text):
+        """Return the entries matching an ID prefix or title fragment.
+
+        Titles containing all trigrams of the fragment are returned
+        together. Otherwise, titles containing most trigrams are ranked by
+        their similarity to the fragment; only the best are returned.
+        Entries with a matching ID prefix are returned in addition, such
+        that a fragment resembling an ID is not mistaken for one.
+        """
+        key = text.lower()
+        prefix = key if key[:1] == "t" else "t" + key
+        matches = [e for e in self.tasks if e[0].startswith(prefix)]
+        if len(key) == 6 and [e[0] for e in matches] == [key]:
+            return matches  # Complete display ID
+
+        query = trigrams(text)
+        counts = {}
+        for gram in query:
+            for pos in array("I", self.grams.get(gram, b"")):
+                counts[pos] = counts.get(pos, 0) + 1
+
+        full = [pos for pos, n in counts.items() if n == len(query)]
+        if full:
+            return matches + [self.tasks[pos] for pos in sorted(full)]
+
+        # Rank by the similarity of the trigram sets of fragment and title
+        scores = {
+            pos: n / (len(query) + self.tasks[pos][4] - n)
+            for pos, n in counts.items()
+            if n / len(query) >= MIN_SCORE
+        }
+        if not scores:
+            return matches
+        best = max(scores.values())
+        return matches + [
+            self.tasks[pos] for pos, s in scores.items() if s == best
+        ]
+
+    def resolve(self, text):
+        """Resolve an ID prefix or title fragment to a task id."""
+        matches = list(dict.fromkeys(self.find(text)))
+        active = [e for e in matches if e[3] in ACTIVE]
+        matches = active or matches
+        if len(matches) > 1:
+            names = ", ".join(f"{e[0]} ({e[2]})" for e in matches[:5])
+            raise ValueError(f"Ambiguous task {text!r}: {names}")
+        return matches[0][1] if matches else None
+
+
+def index_path(account):
+    """Return the path of the index next to the task store of an account."""
+    return cache_path(f"tasks-{account}.index")
+
+
+def resolve_tid(text, config=None):
+    """Resolve a task argument to a task id.
+
+    Arguments are looked up in the local index, which is synced once if
+    the argument is not found, e.g., for a task created recently. Queued
+    changes only use the local index, such that they return without
+    waiting for the network. As misses, e.g., typos, would otherwise
+    download all tasks each time, the index is not synced if the store
+    was synced within `MAX_AGE` seconds. Only if no task matches, an
+    argument is decoded as display ID, such that words like "thesis" are
+    not mistaken for IDs of other tasks.
+    """
+    from .utils import account_id, client_token, set_api_key
+
+    account = account_id(client_token(config))
+    index = TaskIndex(index_path(account))
+    task_id = index.resolve(text) if index.load() else None
+    if task_id is None and not getattr(config, "queue", False):
+        from .store import MAX_AGE, TaskStore, store_path
+
+        store = TaskStore(store_path(account))
+        if store.age() > MAX_AGE:
+            try:
+                set_api_key(config)
+                store.sync()
+            except Exception:
+                pass  # Not reachable, decode the argument below
+            task_id = index.resolve(text) if index.load() else None
+
+    if task_id is None:
+        try:
+            return parse_tid(text)  # Display ID of a task not listed
+        except ValueError:
+            raise ValueError(f"No task matches {text!r}")
+    return task_id
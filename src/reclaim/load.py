@@ -0,0 +1,107 @@
+"""Workload Engine.
+
+The remaining work of each task is spread evenly over the days from its
+start (or today) until its due date. The daily rates of all tasks are
+accumulated once with a difference array, such that the load of any
+period is a difference of prefix sums.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import bisect
+from datetime import date, timedelta
+from itertools import accumulate
+
+# Periods for aggregating the load
+BUCKETS = ["day", "week", "month"]
+
+
+def _next_month(day):
+    """Return the first day of the following month."""
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def bucket_bounds(today, bucket, weeks):
+    """Return the bounds of the periods covering a number of weeks.
+
+    Periods start with the first full period on or after today, e.g.,
+    the next Monday for weeks, and the last period may exceed the horizon.
+    """
+    if bucket == "day":
+        start, step = today, lambda d: d + timedelta(days=1)
+    elif bucket == "week":
+        start = today + timedelta(days=(7 - today.weekday()) % 7)
+        step = lambda d: d + timedelta(days=7)  # noqa: E731
+    elif bucket == "month":
+        start = today if today.day == 1 else _next_month(today)
+        step = _next_month
+    else:
+        raise ValueError(f"Invalid bucket: {bucket}")
+
+    end = start + timedelta(days=7 * weeks)
+    bounds = [start]
+    while bounds[-1] < end:
+        bounds.append(step(bounds[-1]))
+    return bounds
+
+
+def task_span(task, today):
+    """Return the first day, end day and daily hours of a task's load."""
+    if not task.due:
+        return None
+
+    work_left = (task.time_chunks_required - task.time_chunks_spent) / 4
+    start = task.snooze_until.date() if task.snooze_until else today
+    start = max(start, today)
+    days = (task.due.date() - start).days
+    if work_left <= 0 or days <= 0:
+        return None
+    return start, task.due.date(), work_left / days
+
+
+def load_buckets(tasks, today, bucket="week", weeks=4):
+    """Aggregate the load of tasks by period.
+
+    Returns a list of (start, end, hours, tasks) tuples, where tasks are
+    the tasks with load in the period, sorted by due date.
+    """
+    bounds = bucket_bounds(today, bucket, weeks)
+    origin, horizon = bounds[0], (bounds[-1] - bounds[0]).days
+
+    # Add daily rates to the difference array in one pass over the tasks
+    diff = [0.0] * (horizon + 1)
+    spans = []
+    for task in tasks:
+        span = task_span(task, today)
+        if span is None:
+            continue
+        first = max(0, (span[0] - origin).days)
+        last = min(horizon, (span[1] - origin).days)
+        if first >= last:
+            continue
+        diff[first] += span[2]
+        diff[last] -= span[2]
+        spans.append((first, last, task))
+
+    # Prefix sums of daily load allow summing any period in constant time
+    total = [0.0, *accumulate(accumulate(diff[:horizon]))]
+
+    # Sweep over the periods, keeping the active tasks sorted by due date.
+    # A task ends with its due date, so finished tasks form a prefix.
+    spans.sort(key=lambda s: s[0])
+    active, k = [], 0
+    result = []
+    for start, end in zip(bounds, bounds[1:]):
+        i, j = (start - origin).days, (end - origin).days
+        while k < len(spans) and spans[k][0] < j:
+            first, last, task = spans[k]
+            bisect.insort(active, (task.due, k, last, task))
+            k += 1
+        done = 0
+        while done < len(active) and active[done][2] <= i:
+            done += 1
+        del active[:done]
+
+        period_tasks = [entry[3] for entry in active]
+        result.append((start, end, total[j] - total[i], period_tasks))
+    return result
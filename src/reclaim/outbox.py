@@ -0,0 +1,334 @@
+"""Outbox of Queued Changes.
+
+With `--queue`, changes of tasks are appended to a local outbox instead
+of being sent, such that commands return without waiting for the API.
+The outbox is a file of JSON lines, each written with fsync. Queued
+changes are sent in order by a background flusher or `reclaim flush`.
+Redundant changes are coalesced before, e.g., a start followed by a
+stop becomes a single log of the time in between.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import json
+import os
+import sys
+import time
+
+from .cache import cache_path
+from .str import str_duration, str_task_id
+
+# Attempts to send a change if the API cannot be reached
+RETRIES = 3
+
+# Seconds of backoff before the first retry
+BACKOFF = 2.0
+
+# Changes marking a task
+MARKS = ("complete", "incomplete")
+
+
+def add_queue_arg(subparser):
+    """Add the queue argument to a subparser."""
+    subparser.add_argument(
+        "-q",
+        "--queue",
+        action="store_true",
+        help="queue the change and send it in the background",
+    )
+
+
+def outbox_path(account):
+    """Return the path of the outbox of an account."""
+    return cache_path(f"outbox-{account}.jsonl")
+
+
+def describe(entry):
+    """Return a short description of a queued change."""
+    op = entry["op"]
+    if op in ("log", "add"):
+        return f"{op} {str_duration(entry['minutes'])}"
+    if op in MARKS:
+        return f"mark {op}"
+    return op.replace("-", " ")
+
+
+def coalesce(entries):
+    """Coalesce redundant changes of the same task.
+
+    Only consecutive changes of a task are coalesced; changes of other
+    tasks in between are independent. Returns a list of changes to send,
+    each with the keys of the queued entries it replaces. A change of
+    None means that nothing is left to send.
+    """
+    changes, last = [], {}
+    for entry in entries:
+        task_id, op = entry["id"], entry["op"]
+        change = {"entry": entry, "keys": [entry["key"]]}
+        prev = changes[last[task_id]] if task_id in last else None
+        prev_op = prev["entry"]["op"] if prev and prev["entry"] else None
+
+        if (prev_op, op) in (("start", "start"), ("stop", "stop")):
+            prev["keys"].append(entry["key"])  # Repeated, keep the first
+            continue
+        if prev_op in MARKS and op in MARKS:
+            pass  # The last mark wins
+        elif (prev_op, op) == ("add", "add"):
+            minutes = prev["entry"]["minutes"] + entry["minutes"]
+            change["entry"] = dict(entry, minutes=minutes)
+        elif (prev_op, op) == ("start", "stop"):
+            # The task was worked on between start and stop
+            minutes = round((entry["time"] - prev["entry"]["time"]) / 60)
+            log = dict(entry, op="log", minutes=minutes, end=entry["time"])
+            change["entry"] = log if minutes > 0 else None
+        else:
+            prev = None
+
+        if prev is not None:
+            change["keys"] = prev["keys"] + change["keys"]
+            changes[last[task_id]] = None
+        last[task_id] = len(changes)
+        changes.append(change)
+    return [change for change in changes if change is not None]
+
+
+class Outbox(object):
+    """Append-only outbox of queued changes."""
+
+    def __init__(self, path):
+        """Initialize the outbox stored in a file."""
+        self.path = path
+        self.claimed = f"{path}.claimed"  # Entries taken by a flush
+        self.failed = f"{path}.failed"  # Entries failed in the background
+        self.lock = f"{path}.lock"  # Held while flushing
+
+    def append(self, entry):
+        """Append an entry and wait until it is written to disk."""
+        import fcntl
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        line = (json.dumps(entry) + "\n").encode()
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            os.write(fd, line)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def entries(self):
+        """Return the claimed and queued entries in order."""
+        entries = _read(self.claimed)
+        keys = {entry["key"] for entry in entries}
+        for entry in _read(self.path):
+            if entry["key"] not in keys:
+                entries.append(entry)
+        return entries
+
+    def claim(self):
+        """Move the queued entries to the claimed ones and return all.
+
+        Entries are written to the claimed file before the outbox is
+        truncated. If a flush is interrupted in between, entries found in
+        both files are only sent once.
+        """
+        import fcntl
+
+        try:
+            f = open(self.path, "r+b")
+        except FileNotFoundError:
+            return _read(self.claimed)
+
+        with f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            entries = self.entries()
+            _write(self.claimed, entries)
+            f.truncate(0)
+            os.fsync(f.fileno())
+        return entries
+
+    def flush(self, apply, report=None, retries=RETRIES, sleep=time.sleep):
+        """Send the queued changes in order.
+
+        `apply(entry)` sends a change. Changes that cannot be sent since
+        the API is not reachable are retried with backoff and otherwise
+        kept for the next flush. Changes rejected by the API are reported
+        with `report(entry, error)`, or kept in the file of failed entries
+        if no report function is given. Returns the number of sent, failed
+        and pending changes, or None if another flush is running.
+        """
+        total = None
+        while True:
+            result = self._flush(apply, report, retries, sleep)
+            if result is None:
+                return total
+            total = tuple(a + b for a, b in zip(total or (0, 0, 0), result))
+
+            # Changes queued before the lock was released are left to us
+            if result[2] or not _read(self.path):
+                return total
+
+    def _flush(self, apply, report, retries, sleep):
+        """Send the queued changes while holding the lock."""
+        import fcntl
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.lock, "w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return None
+
+            sent = failed = 0
+            while True:
+                entries = self.claim()
+                if not entries:
+                    return sent, failed, 0
+
+                done = set()
+                for change in coalesce(entries):
+                    entry = change["entry"]
+                    error = self._send(entry, apply, retries, sleep)
+                    if error is _PENDING:
+                        return sent, failed, len(entries) - len(done)
+                    if error is not None:
+                        failed += 1
+                        if report:
+                            report(entry, error)
+                        else:
+                            self._fail(entry, error)
+                    elif entry is not None:
+                        sent += 1
+
+                    done.update(change["keys"])
+                    rest = [e for e in entries if e["key"] not in done]
+                    _write(self.claimed, rest)
+
+    def _send(self, entry, apply, retries, sleep):
+        """Send a change; return an error, _PENDING or None if sent."""
+        import httpx
+
+        from .transport import OfflineError, network_error
+
+        if entry is None:
+            return None
+        for attempt in range(retries + 1):
+            try:
+                apply(entry)
+                return None
+            except Exception as e:
+                error = network_error(e)
+                # Only changes that were not sent can be sent again
+                if not isinstance(
+                    error, (httpx.ConnectError, httpx.ConnectTimeout)
+                ):
+                    return _PENDING if isinstance(error, OfflineError) else e
+            if attempt < retries:
+                sleep(BACKOFF * 2**attempt)
+        return _PENDING
+
+    def _fail(self, entry, error):
+        """Keep a failed entry for reporting."""
+        record = {"entry": entry, "error": str(error)}
+        with open(self.failed, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def failures(self, clear=False):
+        """Return the entries and errors of failed changes."""
+        records = _read(self.failed)
+        if clear and records:
+            os.remove(self.failed)
+        return [(record["entry"], record["error"]) for record in records]
+
+
+# Marker of changes kept for a later flush
+_PENDING = object()
+
+
+def _read(path):
+    """Read entries from a file of JSON lines."""
+    entries = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    pass  # Partial line of an interrupted write
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def _write(path, entries):
+    """Atomically write entries to a file of JSON lines."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.writelines(json.dumps(entry) + "\n" for entry in entries)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def apply_entry(entry):
+    """Send a queued change to Reclaim.ai; return the task and a message."""
+    from datetime import datetime
+
+    from .utils import get_task
+
+    task, op = get_task(entry["id"]), entry["op"]
+    if op == "log":
+        end = datetime.fromtimestamp(entry["end"])
+        task.log_work(entry["minutes"], end=end)
+        msg = f"Logged: {str_duration(entry['minutes'])}"
+    elif op == "add":
+        task.add_time(entry["minutes"] / 60)
+        msg = f"Added: {str_duration(entry['minutes'])}"
+    elif op == "complete":
+        task.mark_complete()
+        msg = f"Marked: {op}"
+    elif op == "incomplete":
+        task.mark_incomplete()
+        msg = f"Marked: {op}"
+    elif op == "up-next":
+        task.up_next = True
+        task.save()
+        msg = "Up next"
+    elif op == "start":
+        task.start()
+        msg = "Started"
+    elif op == "stop":
+        task.stop()
+        msg = "Stopped"
+    else:
+        raise ValueError(f"Unknown change: {op}")
+    return task, msg
+
+
+def queue(args, op, **fields):
+    """Queue a change of the tasks of a command and start a flush."""
+    from .utils import account_id, client_token, spawn_detached
+
+    outbox = Outbox(outbox_path(account_id(client_token(args))))
+    task_ids = args.id if isinstance(args.id, list) else [args.id]
+    now = time.time()
+    for task_id in task_ids:
+        entry = {"key": os.urandom(8).hex(), "op": op, "id": task_id}
+        entry.update(fields, time=now)
+        outbox.append(entry)
+        tid = str_task_id(task_id)
+        print(f"✓ Queued | Id: {tid} | Change: {describe(entry)}")
+
+    failed = len(outbox.failures())
+    if failed:
+        print(
+            f"! Failed | Changes: {failed} | Run: reclaim flush",
+            file=sys.stderr,
+        )
+
+    from .transport import is_offline
+
+    if getattr(args, "queue_flush", True) and not is_offline(args):
+        spawn_detached("reclaim", "-c", args.config, "flush", "--quiet")
+    return task_ids
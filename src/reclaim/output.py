@@ -0,0 +1,79 @@
+"""Machine-readable Output.
+
+Records are written as JSON lines, CSV or TSV directly to a stream as
+they are produced, without rendering tables.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import json
+import sys
+
+# Output formats; "table" is rendered with rich
+FORMATS = ["table", "jsonl", "csv", "tsv"]
+
+# Fields of task records
+TASK_FIELDS = ["id", "due", "left", "progress", "state", "status", "title"]
+
+# Fields of event records
+EVENT_FIELDS = ["id", "date", "start", "end", "duration", "type", "title"]
+
+
+def add_format_arg(subparser):
+    """Add the output format argument to a subparser."""
+    subparser.add_argument(
+        "--format",
+        type=str,
+        metavar="<format>",
+        choices=FORMATS,
+        help="output format: table, jsonl, csv, tsv",
+        default="table",
+    )
+
+
+class RecordWriter(object):
+    """Write records with fixed fields as JSON lines, CSV or TSV."""
+
+    def __init__(self, fmt, fields, stream=None):
+        """Initialize the writer and write a header if needed."""
+        self.fmt = fmt
+        self.fields = fields
+        self.stream = stream or sys.stdout
+        self.writer = None
+
+        if fmt in ("csv", "tsv"):
+            import csv
+
+            self.writer = csv.writer(
+                self.stream,
+                delimiter="\t" if fmt == "tsv" else ",",
+                lineterminator="\n",
+            )
+            self.writer.writerow(fields)
+
+    def write(self, record):
+        """Write a record; missing fields are written as null."""
+        values = [record.get(field) for field in self.fields]
+        if self.writer:
+            self.writer.writerow(["" if v is None else v for v in values])
+        else:
+            line = json.dumps(dict(zip(self.fields, values)), default=str)
+            self.stream.write(line + "\n")
+
+
+def task_record(task):
+    """Convert a task to a record of plain values."""
+    from .str import str_task_id, str_task_status
+
+    time_required = task.time_chunks_required * 15
+    time_spent = task.time_chunks_spent * 15
+    progress = 1 if time_required == 0 else time_spent / time_required
+    return {
+        "id": str_task_id(task.id),
+        "due": task.due.strftime("%Y-%m-%d") if task.due else None,
+        "left": time_required - time_spent,
+        "progress": round(progress, 2),
+        "state": str_task_status(task),
+        "status": str(task.status.value),
+        "title": task.title,
+    }
@@ -3,16 +3,48 @@
 Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 """
 
+import functools
+import json
 import re
-
-import dateparser
-from reclaim_sdk.resources.task import TaskPriority
+from datetime import datetime, timedelta
 
 from .str import unscramble_id
 
 # Base36 character set
 ID_CHARS = "0123456789abcdefghijklmnopqrstuvwxyz"
 
+# Fractional seconds in ISO timestamps
+_ISO_FRACTION = re.compile(r"\.(\d+)")
+
+# Task display IDs in text, e.g., the output of list-tasks
+_TASK_ID = re.compile(r"(?<![0-9a-z])t[0-9a-z]{5}(?![0-9a-z])")
+
+# Languages for dateparser (None for all languages) and parser instance
+_LANGUAGES = None
+_DATE_PARSER = None
+
+# Hour at which a working day ends ("eod", "eow")
+END_OF_DAY = 17
+
+# Fast path for common datetime expressions, e.g., "tomorrow 17:00",
+# "in 3 days", "fri", "2025-06-01 9am" or "eow"
+_DATETIME = re.compile(
+    r"^(?:(?P<word>now|today|tomorrow|yesterday|eod|eow)"
+    r"|(?P<weekday>mon(?:day)?|tue(?:s|sday)?|wed(?:nesday)?"
+    r"|thu(?:r|rs|rsday)?|fri(?:day)?|sat(?:urday)?|sun(?:day)?)"
+    r"|(?P<date>\d{4}-\d{2}-\d{2})"
+    r"|(?:in\s*)?(?P<num>\d+)\s*(?P<unit>(?![ap]m\b)[a-z]+))?"
+    r"\s*(?:at\s*)?"
+    r"(?:(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<ampm>am|pm)?)?$"
+)
+_WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+_UNITS = {
+    **dict.fromkeys(["m", "min", "mins", "minute", "minutes"], 1),
+    **dict.fromkeys(["h", "hr", "hrs", "hour", "hours"], 60),
+    **dict.fromkeys(["d", "day", "days"], 60 * 24),
+    **dict.fromkeys(["w", "wk", "wks", "week", "weeks"], 60 * 24 * 7),
+}
+
 
 def parse_tid(encoded):
     """Convert a display ID string back to an integer identifier."""
@@ -26,6 +58,32 @@ def parse_tid(encoded):
         raise ValueError(f"Cannot decode ID {encoded}")
 
 
+def read_ids(stream):
+    """Read task IDs from a stream, one per line.
+
+    Lines may hold a single ID, a JSON record with an "id" field, a CSV or
+    TSV record starting with an ID or a row of a task listing, from which
+    the first task display ID is taken. Header lines are skipped.
+    """
+    ids = []
+    for line in stream:
+        line = line.strip()
+        if line.startswith("{"):
+            ids.append(str(json.loads(line)["id"]))
+        elif "\t" in line or "," in line:
+            import csv
+
+            delimiter = "\t" if "\t" in line else ","
+            field = next(csv.reader([line], delimiter=delimiter))[0]
+            if _TASK_ID.fullmatch(field.strip()):
+                ids.append(field.strip())
+        elif len(line.split()) == 1:
+            ids.append(line)
+        elif _TASK_ID.search(line):
+            ids.append(_TASK_ID.search(line).group(0))
+    return ids
+
+
 def parse_list(str_list):
     """Convert a string to a list."""
     return [s.strip() for s in str_list.split(",")] if str_list else []
@@ -63,11 +121,114 @@ def parse_duration(time_str):
     return minutes
 
 
-def parse_datetime(str):
-    """Parse a datetime string into a datetime object."""
-    dt = dateparser.parse(str, settings={"PREFER_DATES_FROM": "future"})
+def set_languages(languages):
+    """Set the languages used by dateparser (None for all languages)."""
+    global _LANGUAGES, _DATE_PARSER
+    if isinstance(languages, str):
+        languages = parse_list(languages)
+    languages = list(languages) if languages else None
+    if languages == _LANGUAGES:
+        return
+    _LANGUAGES = languages
+    _DATE_PARSER = None
+    parse_datetime.cache_clear()
+
+
+def _parse_time(match):
+    """Return the hour and minute of a fast-path match."""
+    if not match["hour"]:
+        return None
+    if not (match["minute"] or match["ampm"]):
+        raise ValueError("Ambiguous time")
+
+    hour, minute = int(match["hour"]), int(match["minute"] or 0)
+    if match["ampm"]:
+        if not 1 <= hour <= 12:
+            raise ValueError("Invalid hour")
+        hour = hour % 12 + (12 if match["ampm"] == "pm" else 0)
+    if hour > 23 or minute > 59:
+        raise ValueError("Invalid time")
+    return hour, minute
+
+
+def parse_datetime_fast(text, now=None):
+    """Parse common datetime expressions without dateparser.
+
+    Dates are resolved like dateparser with future preference: weekdays
+    refer to the next occurrence, times without a date to the next time
+    of day. "eod" and "eow" refer to the end of the next working day and
+    week. Returns None if the expression is not supported.
+    """
+    match = _DATETIME.match(" ".join(text.lower().split()))
+    if not match or not any(match.groupdict().values()):
+        return None
+
+    try:
+        time = _parse_time(match)
+    except ValueError:
+        return None
+
+    now = now or datetime.now()
+    word, dt = match["word"], now
+    if word == "tomorrow":
+        dt = now + timedelta(days=1)
+    elif word == "yesterday":
+        dt = now - timedelta(days=1)
+    elif word in ("eod", "eow"):
+        days = (4 - now.weekday()) % 7 if word == "eow" else 0
+        dt = now.replace(hour=END_OF_DAY, minute=0, second=0, microsecond=0)
+        dt += timedelta(days=days)
+        if dt < now:
+            dt += timedelta(days=7 if word == "eow" else 1)
+    elif match["weekday"]:
+        weekday = _WEEKDAYS.index(match["weekday"][:3])
+        days = (weekday - now.weekday() - 1) % 7 + 1
+        dt = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        dt += timedelta(days=days)
+    elif match["date"]:
+        try:
+            dt = datetime.strptime(match["date"], "%Y-%m-%d")
+        except ValueError:
+            return None
+    elif match["num"]:
+        if match["unit"] not in _UNITS:
+            return None
+        dt = now + timedelta(minutes=int(match["num"]) * _UNITS[match["unit"]])
+
+    if time:
+        dt = dt.replace(hour=time[0], minute=time[1], second=0, microsecond=0)
+        if dt <= now and not any(match[g] for g in ("word", "date", "num")):
+            dt += timedelta(days=1)
+
+    return dt
+
+
+def _date_parser():
+    """Return a reusable dateparser instance."""
+    global _DATE_PARSER
+    if _DATE_PARSER is None:
+        from dateparser.date import DateDataParser
+
+        _DATE_PARSER = DateDataParser(
+            languages=_LANGUAGES, settings={"PREFER_DATES_FROM": "future"}
+        )
+    return _DATE_PARSER
+
+
+@functools.lru_cache(maxsize=256)
+def parse_datetime(text):
+    """Parse a datetime string into a datetime object.
+
+    Results are memoized, such that repeated expressions are parsed once.
+    """
+    dt = parse_datetime_fast(text)
+    if not dt:
+        from .profile import phase
+
+        with phase("dateparser"):
+            dt = _date_parser().get_date_data(text).date_obj
     if not dt:
-        raise ValueError(f"Invalid datetime string: {str}")
+        raise ValueError(f"Invalid datetime string: {text}")
     return dt
 
 
@@ -78,11 +239,51 @@ def parse_priority(priority):
         priority = f"P{priority}"
     if not priority[1:].isdigit():
         raise ValueError(f"Invalid priority: {priority}")
+
+    from reclaim_sdk.resources.task import TaskPriority
+
     return TaskPriority(priority)
 
 
+def parse_iso_time(value):
+    """Parse a strict ISO timestamp, including "Z" suffixes and offsets."""
+    if value[-1:] in "Zz":
+        value = value[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        # Python 3.10 only accepts fractions with 3 or 6 digits
+        value = _ISO_FRACTION.sub(
+            lambda m: "." + m.group(1)[:6].ljust(6, "0"), value, count=1
+        )
+        return datetime.fromisoformat(value)
+
+
 def parse_event_time(value):
     """Parse an ISO timestamp string to a datetime object."""
     if not value or not isinstance(value, str):
         return None
+
+    try:
+        return parse_iso_time(value)
+    except ValueError:
+        pass
+
+    # Fall back to dateparser for malformed timestamps
+    import dateparser
+
     return dateparser.parse(value)
+
+
+def parse_event_times(events):
+    """Parse the start and end times of a list of events in one pass."""
+    times = []
+    for event in events:
+        event_date = event.get("eventDate") or {}
+        times.append(
+            (
+                parse_event_time(event_date.get("start")),
+                parse_event_time(event_date.get("end")),
+            )
+        )
+    return times
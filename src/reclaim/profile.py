@@ -0,0 +1,151 @@
+"""Profiling of Commands.
+
+With `--profile` or `RECLAIM_PROFILE=1`, the phases of a command and all
+API requests are timed and a summary is printed to stderr. With
+`--profile=cprofile:<file>`, a full profile is additionally written for
+analysis with `pstats` or `snakeviz`.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import contextlib
+import os
+import sys
+import threading
+import time
+
+import reclaim
+
+# Profile of the running command, if any
+_ACTIVE = None
+
+
+def profile_mode(argv):
+    """Return the profile mode of a command line and the remaining args.
+
+    The mode is None if profiling is disabled, "summary" for timing only
+    and "cprofile:<file>" for a full profile, given as `--profile=<mode>`
+    or `--profile <mode>`.
+    """
+    mode = os.environ.get("RECLAIM_PROFILE") or None
+    if mode in ("0", "false", "no"):
+        mode = None
+    elif mode in ("1", "true", "yes"):
+        mode = "summary"
+
+    rest, args = [], iter(argv)
+    for arg in args:
+        if arg == "--profile":
+            mode = "summary"
+            # The mode may also be given as separate argument
+            arg = next(args, None)
+            if arg is not None and arg.startswith("cprofile:"):
+                mode = arg
+            elif arg is not None:
+                rest.append(arg)
+        elif arg.startswith("--profile="):
+            mode = arg.split("=", 1)[1] or "summary"
+        else:
+            rest.append(arg)
+
+    if mode not in (None, "summary") and not mode.startswith("cprofile:"):
+        raise ValueError(f"Invalid profile mode: {mode}")
+    return mode, rest
+
+
+def phase(name):
+    """Return a context timing a phase of the running command."""
+    if _ACTIVE is None:
+        return contextlib.nullcontext()
+    return _ACTIVE.phase(name)
+
+
+class Profile(object):
+    """Timing of the phases and API requests of a command."""
+
+    def __init__(self, mode="summary"):
+        """Initialize the profile; the imports have already been done."""
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.phases = [("imports", 0, time.perf_counter() - reclaim.STARTED)]
+        self.requests = []
+        self.depth = 0
+        self.profiler = None
+        self.wrapper = None
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time a phase; phases can be nested."""
+        index = len(self.phases)
+        self.phases.append((name, self.depth, 0.0))
+        self.depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            seconds = time.perf_counter() - start
+            self.phases[index] = (name, self.depth, seconds)
+
+    def record(self, method, path, status, size, seconds):
+        """Record an API request; called from the transport."""
+        with self.lock:
+            self.requests.append((method, path, status, size, seconds))
+
+    def start(self):
+        """Start profiling and record the API requests."""
+        global _ACTIVE
+        from .transport import ProfilingTransport, add_transport
+
+        _ACTIVE = self
+        self.wrapper = lambda t: ProfilingTransport(t, self.record)
+        add_transport(self.wrapper)
+        if self.mode.startswith("cprofile:"):
+            import cProfile
+
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def stop(self):
+        """Stop profiling and write the profile if requested."""
+        global _ACTIVE
+        from .transport import remove_transport
+
+        _ACTIVE = None
+        remove_transport(self.wrapper)
+        if self.profiler:
+            self.profiler.disable()
+            self.profiler.dump_stats(self.mode.split(":", 1)[1])
+
+    def report(self, stream=None):
+        """Print the phases and API requests."""
+        stream = stream or sys.stderr
+        total = sum(s for _, depth, s in self.phases if depth == 0)
+
+        print("Profile", file=stream)
+        for name, depth, seconds in self.phases:
+            label = "  " * depth + name
+            print(f"  {label:<28} {seconds * 1000:9.1f} ms", file=stream)
+        print(f"  {'total':<28} {total * 1000:9.1f} ms", file=stream)
+
+        if self.requests:
+            print("Requests", file=stream)
+        for method, path, status, size, seconds in self.requests:
+            status = status or "ERR"
+            print(
+                f"  {method:<6} {path:<40} {status:>3} "
+                f"{size / 1024:8.1f} kB {seconds * 1000:9.1f} ms",
+                file=stream,
+            )
+        if self.requests:
+            size = sum(r[3] for r in self.requests)
+            seconds = sum(r[4] for r in self.requests)
+            summary = f"{len(self.requests)} requests"
+            print(
+                f"  {summary:<51}"
+                f"{size / 1024:8.1f} kB {seconds * 1000:9.1f} ms",
+                file=stream,
+            )
+
+        if self.profiler:
+            print(f"Profile written to {self.mode[9:]}", file=stream)
@@ -0,0 +1,131 @@
+"""Schema of the Configuration File.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import difflib
+import re
+
+from .str import _EVENT_COLORS
+
+# Types of numbers in the config file
+NUMBER = (int, float)
+
+# Types of the known keys of the config file
+SCHEMA = {
+    "reclaim_token": str,
+    "theme": str,
+    "date_languages": (list, str, type(None)),
+    "sync_max_age": NUMBER,
+    "workers": int,
+    "connect_timeout": NUMBER,
+    "read_timeout": NUMBER,
+    "retries": int,
+    "retry_backoff": NUMBER,
+    "pool_size": int,
+    "rate_limit": NUMBER,
+    "rate_burst": int,
+    "rate_lock": bool,
+    "offline": bool,
+    "offline_timeout": NUMBER,
+    "queue_flush": bool,
+    "calendars": dict,
+}
+
+# Types of the keys of a calendar; empty values are allowed
+CALENDAR_SCHEMA = {
+    "name": (str, type(None)),
+    "color": (str, type(None)),
+}
+
+# Terminal themes
+THEMES = ("auto", "dark", "light")
+
+# Hex colors of calendars
+_HEX_COLOR = re.compile(r"^#[0-9a-fA-F]{6}$")
+
+
+def _check_type(name, value, types):
+    """Return an error if a value does not match the types."""
+    types = types if isinstance(types, tuple) else (types,)
+    if isinstance(value, bool) and bool not in types:
+        pass  # Booleans are integers in Python, but not here
+    elif isinstance(value, types):
+        return None
+    expected = " or ".join(
+        "null" if t is type(None) else t.__name__ for t in types
+    )
+    return f"{name}: expected {expected}, got {value!r}"
+
+
+def _unknown_key(name, key, known):
+    """Return an error for an unknown key, with a suggestion."""
+    close = difflib.get_close_matches(str(key), known, n=1)
+    hint = f" (did you mean {close[0]!r}?)" if close else ""
+    return f"{name}: unknown key {key!r}{hint}"
+
+
+def calendar_errors(calendars):
+    """Return the errors of the calendar map."""
+    errors = []
+    for cal_id, calendar in calendars.items():
+        name = f"calendars.{cal_id}"
+        if not isinstance(cal_id, (int, str)):
+            errors.append(f"{name}: invalid calendar id")
+        if calendar is None:
+            continue
+        if not isinstance(calendar, dict):
+            errors.append(_check_type(name, calendar, dict))
+            continue
+
+        for key, value in calendar.items():
+            if key not in CALENDAR_SCHEMA:
+                errors.append(_unknown_key(name, key, list(CALENDAR_SCHEMA)))
+                continue
+            error = _check_type(f"{name}.{key}", value, CALENDAR_SCHEMA[key])
+            if error:
+                errors.append(error)
+
+        color = calendar.get("color")
+        if (
+            isinstance(color, str)
+            and color.upper() not in _EVENT_COLORS
+            and color.upper() != "NONE"
+            and not _HEX_COLOR.match(color)
+        ):
+            errors.append(f"{name}.color: unknown color {color!r}")
+    return errors
+
+
+def config_errors(config):
+    """Return the errors of a configuration.
+
+    Unknown keys are reported only if they resemble a known key, such
+    that typos are caught while other keys are left to the user.
+    """
+    if not isinstance(config, dict):
+        return ["expected a mapping of keys to values"]
+
+    errors = []
+    for key, value in config.items():
+        if key not in SCHEMA:
+            if difflib.get_close_matches(str(key), list(SCHEMA), n=1):
+                errors.append(_unknown_key("config", key, list(SCHEMA)))
+            continue
+        error = _check_type(key, value, SCHEMA[key])
+        if error:
+            errors.append(error)
+
+    if config.get("theme") not in (None, *THEMES):
+        errors.append(f"theme: expected one of {', '.join(THEMES)}")
+    if isinstance(config.get("calendars"), dict):
+        errors += calendar_errors(config["calendars"])
+    return errors
+
+
+def validate_config(config, path):
+    """Validate a configuration; raise an error listing all problems."""
+    errors = config_errors(config)
+    if errors:
+        raise ValueError(f"Invalid config {path}: " + "; ".join(errors))
+    return config
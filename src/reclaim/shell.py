@@ -0,0 +1,169 @@
+"""Interactive Shell.
+
+The shell builds the parser once and keeps the Reclaim client with an
+in-memory cache of responses across commands. Mutations are written
+through to the cache, such that repeated reads need no network requests.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import shlex
+import sys
+
+from .cache import cache_path
+
+# Seconds for which responses are cached in a session
+CACHE_TTL = 300
+
+# Commands that cannot be run inside the shell
+_EXCLUDED = ("serve", "shell")
+
+# Global options that only apply when starting the shell
+_SESSION_OPTIONS = ("config", "record", "replay", "offline", "profile")
+
+
+class Shell(object):
+    """Read-eval-print loop for Reclaim CLI commands."""
+
+    prompt = "reclaim> "
+
+    def __init__(self, config, ttl=CACHE_TTL):
+        """Build the parser and install the response cache."""
+        import reclaim.commands as commands
+
+        from .__main__ import build_parser
+        from .transport import CachingTransport, add_transport
+        from .utils import read_config
+
+        self.cmds = [c for c in commands.load() if c.name not in _EXCLUDED]
+        self.parser = build_parser(self.cmds)
+        self.names = sorted(
+            {c.name for c in self.cmds}
+            | {a for c in self.cmds for a in c.aliases}
+        )
+        self.config_path = config
+        self.config = read_config(config) or {}
+        self.ids = None
+
+        self.cache = None
+
+        def wrap(transport):
+            self.cache = CachingTransport(transport, ttl)
+            return self.cache
+
+        add_transport(wrap)
+
+    def execute(self, line):
+        """Run a command line and return the exit code."""
+        from .__main__ import (
+            format_exception,
+            print_offline,
+            reset_offline,
+            validate_args,
+        )
+        from .parse import parse_datetime
+        from .utils import load_config
+
+        argv = shlex.split(line)
+        if not argv:
+            return 0
+        if argv[0] in ("exit", "quit"):
+            raise EOFError
+        if argv[0] == "help":
+            self.parser.print_help()
+            return 0
+        if argv[0] == "refresh":
+            if self.cache is not None:  # No request sent so far
+                self.cache.clear()
+            self.ids = None
+            return 0
+
+        # Relative dates, such as "in 2h", depend on the time of the command
+        parse_datetime.cache_clear()
+        reset_offline()
+
+        try:
+            args = self.parser.parse_args(argv)
+            for name in _SESSION_OPTIONS:
+                if getattr(args, name) != self.parser.get_default(name):
+                    self.parser.error(
+                        f"--{name} is only supported when starting the shell"
+                    )
+            args.config = self.config_path
+            args = load_config(args, self.config)
+            args = validate_args(self.cmds, args)
+            args.func(args)
+            print_offline()
+            return 0
+        except SystemExit as e:
+            return e.code if isinstance(e.code, int) else int(bool(e.code))
+        except Exception as e:
+            print(format_exception(e), file=sys.stderr)
+            return 1
+        finally:
+            self.ids = None  # Tasks may have changed
+
+    def task_ids(self):
+        """Return the display IDs of tasks in the local store."""
+        if self.ids is None:
+            from .store import MAX_AGE, TaskStore
+            from .str import str_task_id
+
+            try:
+                tasks = TaskStore().tasks(max_age=MAX_AGE)
+                self.ids = sorted(str_task_id(t.id) for t in tasks)
+            except Exception:
+                self.ids = []
+        return self.ids
+
+    def complete(self, text, state):
+        """Complete command names and task IDs for readline."""
+        import readline
+
+        line = readline.get_line_buffer()[: readline.get_begidx()]
+        if not line.strip():
+            options = self.names + ["exit", "help", "refresh"]
+        elif text.startswith("-"):
+            options = []
+        else:
+            options = self.task_ids()
+
+        matches = [o for o in options if o.startswith(text)]
+        return matches[state] if state < len(matches) else None
+
+    def loop(self):
+        """Read and run command lines until end of input."""
+        try:
+            import readline
+        except ImportError:
+            readline = None  # No line editing, e.g., on Windows
+
+        history = cache_path("shell-history")
+        if readline:
+            readline.set_completer(self.complete)
+            readline.set_completer_delims(" \t")
+            readline.parse_and_bind("tab: complete")
+            try:
+                readline.read_history_file(history)
+            except OSError:
+                pass
+
+        try:
+            while True:
+                try:
+                    line = input(self.prompt)
+                except KeyboardInterrupt:
+                    print()
+                    continue
+                try:
+                    self.execute(line)
+                except ValueError as e:
+                    print(f"Error: {e}", file=sys.stderr)
+        except EOFError:
+            print()
+        finally:
+            if readline:
+                import os
+
+                os.makedirs(os.path.dirname(history), exist_ok=True)
+                readline.write_history_file(history)
@@ -0,0 +1,169 @@
+"""Local Task Store.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+from .cache import cache_path
+from .index import TaskIndex
+from .parse import parse_iso_time
+
+# Seconds after which the store is synced on read
+MAX_AGE = 60
+
+# Version of the database schema; a change triggers a full resync
+SCHEMA = 1
+
+
+def _updated(data):
+    """Return the update time of a task as a timestamp."""
+    try:
+        return parse_iso_time(data["updated"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return 0.0
+
+
+def store_path(account):
+    """Return the path of the task store of an account."""
+    return cache_path(f"tasks-{account}.sqlite")
+
+
+class TaskStore(object):
+    """Local SQLite store of tasks with incremental sync."""
+
+    def __init__(self, path=None):
+        """Initialize the store for the configured account."""
+        if path is None:
+            from .utils import account_id
+
+            path = store_path(account_id())
+        self.path = path
+        self._db = None
+
+    @property
+    def db(self):
+        """Return the database connection, creating tables if needed."""
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._db = sqlite3.connect(self.path)
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY,
+                    updated REAL,
+                    status TEXT,
+                    data TEXT
+                );
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+                """)
+        return self._db
+
+    def get_meta(self, key, default=None):
+        """Get a value from the meta table."""
+        row = self.db.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key, value):
+        """Set a value in the meta table."""
+        self.db.execute(
+            "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+            (key, json.dumps(value)),
+        )
+
+    def age(self):
+        """Return the seconds since the last sync."""
+        return time.time() - self.get_meta("synced", 0)
+
+    def expire(self):
+        """Mark the store as outdated, such that the next read syncs."""
+        if self._db is None and not os.path.exists(self.path):
+            return
+        with self.db:
+            self.set_meta("synced", 0)
+
+    def sync(self, full=False):
+        """Sync the store with Reclaim.ai and return the number of changes.
+
+        Only new tasks and tasks whose update time differs from the
+        stored one are written. A full resync is done on request, on an
+        empty store or on a schema change.
+        """
+        from reclaim_sdk.client import ReclaimClient
+        from reclaim_sdk.resources.task import Task
+
+        from .transport import offline_since
+
+        items = ReclaimClient().get(Task.ENDPOINT)
+
+        full = full or self.get_meta("schema") != SCHEMA
+        known = dict(self.db.execute("SELECT id, updated FROM tasks"))
+
+        changed = [
+            data
+            for data in items
+            if full or known.get(data["id"]) != _updated(data)
+        ]
+        removed = known.keys() - {data["id"] for data in items}
+
+        with self.db:
+            if full:
+                self.db.execute("DELETE FROM tasks")
+            self.db.executemany(
+                "INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?)",
+                [
+                    (d["id"], _updated(d), d.get("status"), json.dumps(d))
+                    for d in changed
+                ],
+            )
+            self.db.executemany(
+                "DELETE FROM tasks WHERE id = ?", [(i,) for i in removed]
+            )
+            self.set_meta("schema", SCHEMA)
+            self.set_meta("synced", offline_since() or time.time())
+
+        index = os.path.splitext(self.path)[0] + ".index"
+        if changed or removed or not os.path.exists(index):
+            self.build_index(index)
+        return len(changed) + len(removed)
+
+    def build_index(self, path):
+        """Write the index of task IDs and titles to a file."""
+        rows = self.db.execute("SELECT id, status, data FROM tasks")
+        TaskIndex(path).build(
+            (task_id, json.loads(data).get("title"), status)
+            for task_id, status, data in rows
+        )
+
+    def tasks(self, max_age=MAX_AGE):
+        """Return all tasks, syncing first if the store is outdated."""
+        from reclaim_sdk.resources.task import Task
+
+        if self.age() > max_age:
+            self.sync()
+
+        return [
+            Task.from_api_data(json.loads(row[0]))
+            for row in self.db.execute("SELECT data FROM tasks")
+        ]
+
+    def close(self):
+        """Close the database connection."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def expire_tasks():
+    """Mark the local task store as outdated after a mutation."""
+    try:
+        TaskStore().expire()
+    except (OSError, sqlite3.Error):
+        pass
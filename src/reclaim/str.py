@@ -3,13 +3,18 @@
 Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 """
 
+import functools
 import os
 import select
 import sys
 import termios
 import tty
 
-from reclaim_sdk.resources.task import TaskStatus
+from .cache import load_cache, save_cache
+
+# Terminal theme: dark, light or auto (detect and cache)
+_THEME = "auto"
+THEMES = ["auto", "dark", "light"]
 
 
 def is_dark_terminal():
@@ -54,6 +59,42 @@ def is_dark_terminal():
     return None
 
 
+def terminal_id():
+    """Identify the terminal by its type, program and tmux/ssh session."""
+    keys = ["TERM", "TERM_PROGRAM", "TMUX", "SSH_TTY", "COLORFGBG"]
+    return "|".join(os.environ.get(k, "") for k in keys)
+
+
+def set_theme(theme):
+    """Set the terminal theme: dark, light or auto."""
+    global _THEME
+    theme = str(theme).lower()
+    if theme not in THEMES:
+        raise ValueError(f"Invalid theme: {theme}")
+    _THEME = theme
+    _event_colors.cache_clear()
+
+
+def dark_terminal():
+    """Return whether the terminal is dark, using a persistent cache.
+
+    Only detected themes are cached. If detection fails, e.g., without a
+    terminal, it is tried again next time.
+    """
+    if _THEME != "auto":
+        return _THEME == "dark"
+
+    themes = load_cache("themes.json", {})
+    key = terminal_id()
+    if themes.get(key) is None:
+        dark = is_dark_terminal()
+        if dark is None:
+            return None
+        themes[key] = dark
+        save_cache("themes.json", themes)
+    return themes[key]
+
+
 def _brighten(hex_color, amount=50):
     """Brighten a hex color by adding a fixed amount to each channel."""
     h = hex_color.lstrip("#")
@@ -92,6 +133,8 @@ def str_duration(minutes):
 
 def str_task_status(task):
     """Convert a task status to a string."""
+    from reclaim_sdk.resources.task import TaskStatus
+
     # Get status character
     if task.status == TaskStatus.CANCELLED:
         status = "X"
@@ -145,16 +188,20 @@ _EVENT_COLORS = {
     "GRAPHITE": "#616161",
 }
 
-_DARK_TERMINAL = is_dark_terminal()
-if _DARK_TERMINAL:
-    _EVENT_COLORS = {k: _brighten(v) for k, v in _EVENT_COLORS.items()}
+
+@functools.lru_cache(maxsize=None)
+def _event_colors():
+    """Return the color palette, brightened on dark terminals."""
+    if dark_terminal():
+        return {k: _brighten(v) for k, v in _EVENT_COLORS.items()}
+    return _EVENT_COLORS
 
 
 def _resolve_color(raw, default=""):
     """Resolve a Google Calendar color name or hex string to a hex value."""
     if not raw or raw.upper() == "NONE":
         return default
-    return _EVENT_COLORS.get(raw.upper()) or (
+    return _event_colors().get(raw.upper()) or (
         raw if raw.startswith("#") else default
     )
 
@@ -192,8 +239,8 @@ def str_task_color(task):
     )
 
 
-def str_event_type(event, calendars=None):
-    """Convert an event type and priority to a compact colored string."""
+def str_event_label(event):
+    """Convert an event type and priority to a compact string."""
     type_chars = {
         "TASK_ASSIGNMENT": "T",
         "SMART_HABIT": "H",
@@ -209,8 +256,12 @@ def str_event_type(event, calendars=None):
 
     type_char = type_chars.get(event_type, "E")
     prio_digit = priority[1] if len(priority) == 2 else ""
-    label = f"{type_char}{prio_digit}"
+    return f"{type_char}{prio_digit}"
+
 
+def str_event_type(event, calendars=None):
+    """Convert an event type and priority to a compact colored string."""
+    label = str_event_label(event)
     hex_color = _event_hex_color(event, calendars)
     if not hex_color:
         return label
@@ -245,9 +296,9 @@ def str_task_state(task):
 
     state = str_task_status(task)
     if task.due and task.due < datetime.now(timezone.utc):
-        c = _EVENT_COLORS["TOMATO"]
+        c = _event_colors()["TOMATO"]
     elif task.at_risk:
-        c = _EVENT_COLORS["BANANA"]
+        c = _event_colors()["BANANA"]
     else:
         return state
     return f"[{c}]{state}[/{c}]"
@@ -0,0 +1,779 @@
+"""HTTP Transport Layers.
+
+The requests of the Reclaim client pass through a chain of transports: a
+pooled keep-alive connection transport, a rate limiter, retries of
+transient failures and wrappers registered with `add_transport`, e.g., for
+caching responses in long-running processes.
+
+Successful GET responses are kept as snapshots, which are served when
+offline (`--offline` or `RECLAIM_OFFLINE`) or if a request still fails
+after all retries. For testing and benchmarking, responses can be
+recorded to a directory of cassette files and replayed without network
+access (`RECLAIM_RECORD` and `RECLAIM_REPLAY` or the options `--record`
+and `--replay`).
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+
+import httpx
+
+from .cache import cache_path
+
+# Settings of the transport, overridable in the config file
+SETTINGS = {
+    "connect_timeout": 5.0,  # Seconds to establish a connection
+    "read_timeout": 30.0,  # Seconds to wait for a response
+    "retries": 3,  # Retries of idempotent requests
+    "retry_backoff": 0.5,  # Seconds of backoff before the first retry
+    "pool_size": 10,  # Connections kept alive
+    "rate_limit": 10.0,  # Requests per second (0 for no limit)
+    "rate_burst": 10,  # Requests sent without delay
+    "rate_lock": False,  # Share the rate limit across processes
+    "offline_timeout": 10.0,  # Seconds until a snapshot is served
+}
+
+# Methods that can be repeated without side effects
+IDEMPOTENT = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+# Status codes of transient server errors
+TRANSIENT = (500, 502, 503, 504)
+
+# Wrappers of the transport, applied in order of registration
+_WRAPPERS = []
+
+# Rate limiter of the configured client
+_LIMITER = None
+
+# Time of the oldest snapshot served instead of a response
+_OFFLINE_SINCE = None
+
+# Endpoints of task mutations returning the updated task
+_TASK_MUTATION = re.compile(r"^/api/(tasks|planner/[\w-]+/task)(?:/(\d+))?$")
+
+# Endpoint of a single task
+_TASK_ITEM = re.compile(r"^/api/tasks/\d+$")
+
+# Dates in query parameters, masked to replay cassettes on any day
+_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# Dates with optional times in requests, masked in keys of cassettes
+_TIMESTAMP = re.compile(
+    r"\d{4}-\d{2}-\d{2}(?:T[\d:.]+(?:Z|[+-]\d{2}:?\d{2})?)?"
+)
+
+# Headers that do not apply to cached, decoded content
+_STALE_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+def add_transport(wrapper):
+    """Register a wrapper for the transport of the Reclaim client."""
+    from reclaim_sdk.client import ReclaimClient
+
+    _WRAPPERS.append(wrapper)
+
+    # Wrap the transport of an already configured client
+    client = ReclaimClient._instance
+    if client is not None and hasattr(client, "session"):
+        client.session._transport = wrapper(client.session._transport)
+
+
+def remove_transport(wrapper):
+    """Unregister a wrapper for clients configured in the future."""
+    if wrapper in _WRAPPERS:
+        _WRAPPERS.remove(wrapper)
+
+
+def install(client, config=None):
+    """Set up the session of a Reclaim client with the transport chain."""
+    settings = {
+        key: getattr(config, key, default) for key, default in SETTINGS.items()
+    }
+
+    pool = httpx.Limits(
+        max_connections=settings["pool_size"],
+        max_keepalive_connections=settings["pool_size"],
+    )
+    record, replay = cassettes(config)
+    if replay:
+        transport = CassetteTransport(replay)
+    else:
+        transport = httpx.HTTPTransport(limits=pool)
+    if record:
+        transport = CassetteTransport(record, transport)
+    if settings["rate_limit"] and not replay:
+        global _LIMITER
+        transport = _LIMITER = RateLimitTransport(
+            transport,
+            settings["rate_limit"],
+            settings["rate_burst"],
+            settings["retries"],
+            cache_path("ratelimit.json") if settings["rate_lock"] else None,
+        )
+    offline = is_offline(config)
+    transport = RetryTransport(
+        transport,
+        0 if replay or offline else settings["retries"],
+        settings["retry_backoff"],
+    )
+
+    # Snapshots are only served once all retries have failed
+    if not replay:
+        from .utils import account_id
+
+        account = account_id(client._config.token)
+        transport = SnapshotTransport(
+            transport,
+            cache_path(f"snapshots-{account}.sqlite"),
+            offline,
+            settings["offline_timeout"],
+        )
+    for wrapper in _WRAPPERS:
+        transport = wrapper(transport)
+
+    # Replace the session of the SDK; httpx requests gzip by default
+    session = client.session
+    client.session = httpx.Client(
+        base_url=session.base_url,
+        headers=session.headers,
+        timeout=httpx.Timeout(
+            settings["read_timeout"], connect=settings["connect_timeout"]
+        ),
+        transport=transport,
+    )
+    session.close()
+    return client
+
+
+def cassettes(config=None):
+    """Return the directories for recording and replaying responses."""
+    record = getattr(config, "record", None) or os.environ.get(
+        "RECLAIM_RECORD"
+    )
+    replay = getattr(config, "replay", None) or os.environ.get(
+        "RECLAIM_REPLAY"
+    )
+    return record, replay
+
+
+def is_offline(config=None):
+    """Check if responses are served from snapshots only."""
+    return bool(
+        getattr(config, "offline", None) or os.environ.get("RECLAIM_OFFLINE")
+    )
+
+
+def offline_since():
+    """Return the time of the oldest snapshot served, if any."""
+    return _OFFLINE_SINCE
+
+
+def reset_offline():
+    """Forget served snapshots, e.g., before the next command."""
+    global _OFFLINE_SINCE
+    _OFFLINE_SINCE = None
+
+
+def network_error(error):
+    """Return the network error causing an error of the client, if any."""
+    while error is not None:
+        if isinstance(error, httpx.TransportError):
+            return error
+        error = error.__cause__ or error.__context__
+    return None
+
+
+def throttle_stats():
+    """Return the counters of the rate limiter."""
+    if _LIMITER is None:
+        return {"requests": 0, "throttled": 0, "wait": 0.0, "limited": 0}
+    with _LIMITER.lock:
+        return dict(_LIMITER.stats)
+
+
+def retry_after(response, default=1.0):
+    """Return the seconds to wait given by a Retry-After header."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+class RateLimitTransport(httpx.BaseTransport):
+    """Pace requests with a token bucket shared by all threads.
+
+    Each request takes a token from a bucket refilled at `rate` tokens per
+    second up to `burst`. A response with status 429 pauses all requests
+    for the time given by Retry-After and the request is sent again. With
+    a lock file, the bucket is shared by concurrent processes.
+    """
+
+    def __init__(self, transport, rate=10.0, burst=10, retries=3, path=None):
+        """Initialize the token bucket around a transport."""
+        self.transport = transport
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.retries = retries
+        self.path = path
+        self.lock = threading.Lock()
+        self.state = {"tokens": self.burst, "time": time.time(), "until": 0}
+        self.stats = {"requests": 0, "throttled": 0, "wait": 0.0, "limited": 0}
+
+    def _shared(self, update):
+        """Apply an update to the bucket, shared across processes if set."""
+        with self.lock:
+            if not self.path:
+                return update(self.state)
+
+            import fcntl
+
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a+") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                f.seek(0)
+                try:
+                    self.state = json.loads(f.read())
+                except ValueError:
+                    pass  # New or damaged file, keep own state
+                result = update(self.state)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(self.state))
+                return result
+
+    def _take(self, state):
+        """Take a token and return 0 or return the seconds to wait."""
+        now = time.time()
+        elapsed = max(0.0, now - state["time"])
+        state["tokens"] = min(
+            self.burst, state["tokens"] + elapsed * self.rate
+        )
+        state["time"] = now
+        if now < state["until"]:
+            return state["until"] - now
+        if state["tokens"] < 1:
+            return (1 - state["tokens"]) / self.rate
+        state["tokens"] -= 1
+        return 0.0
+
+    def acquire(self):
+        """Wait until a request may be sent."""
+        waited = 0.0
+        while True:
+            delay = self._shared(self._take)
+            if not delay:
+                break
+            time.sleep(delay)
+            waited += delay
+
+        with self.lock:
+            self.stats["requests"] += 1
+            if waited:
+                self.stats["throttled"] += 1
+                self.stats["wait"] += waited
+
+    def pause(self, seconds):
+        """Pause all requests for a number of seconds."""
+
+        def update(state):
+            state["until"] = max(state["until"], time.time() + seconds)
+
+        self._shared(update)
+
+    def handle_request(self, request):
+        """Send a request when a token is available."""
+        for attempt in range(self.retries + 1):
+            self.acquire()
+            response = self.transport.handle_request(request)
+            if response.status_code != 429 or attempt == self.retries:
+                return response
+
+            # Rejected requests were not processed and can be repeated
+            with self.lock:
+                self.stats["limited"] += 1
+            self.pause(retry_after(response, 2**attempt))
+            response.close()
+
+    def close(self):
+        """Close the wrapped transport."""
+        self.transport.close()
+
+
+class RetryTransport(httpx.BaseTransport):
+    """Retry transient failures with jittered exponential backoff.
+
+    Idempotent requests are retried on connection errors, timeouts and
+    transient server errors. Other requests are only retried if the
+    connection could not be established, since they were not sent.
+    """
+
+    def __init__(self, transport, retries=3, backoff=0.5):
+        """Initialize the retries around a transport."""
+        self.transport = transport
+        self.retries = retries
+        self.backoff = backoff
+
+    def handle_request(self, request):
+        """Send a request, retrying transient failures."""
+        idempotent = request.method in IDEMPOTENT
+        for attempt in range(self.retries + 1):
+            last = attempt == self.retries
+            try:
+                response = self.transport.handle_request(request)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                if last:
+                    raise
+            except httpx.TransportError:
+                if last or not idempotent:
+                    raise
+            else:
+                if last or not idempotent:
+                    return response
+                if response.status_code not in TRANSIENT:
+                    return response
+                response.close()
+
+            time.sleep(self.delay(attempt))
+
+    def delay(self, attempt):
+        """Return a random delay up to an exponential backoff."""
+        return random.uniform(0, self.backoff * 2**attempt)
+
+    def close(self):
+        """Close the wrapped transport."""
+        self.transport.close()
+
+
+class CassetteTransport(httpx.BaseTransport):
+    """Record responses to cassette files or replay them.
+
+    With a wrapped transport, responses are recorded; without, they are
+    replayed from the cassettes. Each request is stored in a file keyed by
+    method, path, query and a digest of the body of requests other than
+    GET, where dates and times are masked. Repeated requests replay the
+    recorded responses in order, the last one indefinitely.
+    """
+
+    def __init__(self, path, transport=None):
+        """Initialize the cassettes in a directory."""
+        self.path = os.path.expanduser(path)
+        self.transport = transport
+        self.lock = threading.Lock()
+        self.counts = {}
+
+    def key(self, request):
+        """Return the key of a request, independent of the current date."""
+        query = sorted(request.url.params.multi_items())
+        query = "&".join(f"{k}={_TIMESTAMP.sub('DATE', v)}" for k, v in query)
+        key = f"{request.method} {request.url.path}"
+        key = f"{key}?{query}" if query else key
+
+        # Changes with another payload must not replay the response
+        body = request.read()
+        if request.method not in ("GET", "HEAD") and body:
+            body = _TIMESTAMP.sub("DATE", body.decode("utf-8", "replace"))
+            key = f"{key} #{hashlib.sha256(body.encode()).hexdigest()[:16]}"
+        return key
+
+    def cassette(self, key):
+        """Return the path of the cassette file for a key."""
+        digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+        return os.path.join(self.path, f"{digest}.json")
+
+    def handle_request(self, request):
+        """Record or replay the response of a request."""
+        key = self.key(request)
+        with self.lock:
+            index = self.counts.get(key, 0)
+            self.counts[key] = index + 1
+
+        if self.transport is None:
+            return self.replay(request, key, index)
+
+        response = self.transport.handle_request(request)
+        self.record(key, index, response)
+        return response
+
+    def replay(self, request, key, index):
+        """Return the recorded response of a request."""
+        try:
+            with open(self.cassette(key)) as f:
+                responses = json.load(f)["responses"]
+        except (OSError, ValueError, KeyError):
+            raise httpx.ConnectError(
+                f"No recorded response for {key}", request=request
+            )
+
+        status, headers, body = responses[min(index, len(responses) - 1)]
+        return httpx.Response(
+            status, headers=headers, content=body.encode(), request=request
+        )
+
+    def record(self, key, index, response):
+        """Append a response to the cassette of its request."""
+        body = response.read().decode("utf-8", "replace")
+        headers = [
+            (k, v)
+            for k, v in response.headers.items()
+            if k.lower() not in _STALE_HEADERS
+        ]
+
+        path = self.cassette(key)
+        with self.lock:
+            responses = []
+            if index > 0:  # Overwrite cassettes of earlier recordings
+                try:
+                    with open(path) as f:
+                        responses = json.load(f)["responses"]
+                except (OSError, ValueError, KeyError):
+                    pass
+            responses.append((response.status_code, headers, body))
+
+            os.makedirs(self.path, exist_ok=True)
+            with open(path, "w") as f:
+                json.dump({"request": key, "responses": responses}, f)
+
+    def close(self):
+        """Close the wrapped transport."""
+        if self.transport is not None:
+            self.transport.close()
+
+
+class OfflineError(httpx.TransportError):
+    """Error of a request that cannot be answered offline."""
+
+
+class SnapshotTransport(httpx.BaseTransport):
+    """Keep snapshots of GET responses and serve them when offline.
+
+    Successful GET responses are stored in a SQLite database. In offline
+    mode, GET requests are answered from the snapshots and all other
+    requests fail. Otherwise, a snapshot is served if a request fails or
+    hits a transient server error. If a snapshot exists, a request
+    including connecting, reading and retries may take at most `timeout`
+    seconds before the snapshot is served. Single tasks are also looked
+    up in the snapshot of the task list.
+    """
+
+    def __init__(self, transport, path, offline=False, timeout=5.0):
+        """Initialize the snapshots around a transport."""
+        self.transport = transport
+        self.path = path
+        self.offline = offline
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self._db = None
+
+    @property
+    def db(self):
+        """Return the database connection, creating the table if needed."""
+        if self._db is None:
+            import sqlite3
+
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    url TEXT PRIMARY KEY,
+                    masked TEXT,
+                    time REAL,
+                    headers TEXT,
+                    body BLOB
+                );
+                CREATE INDEX IF NOT EXISTS masked ON snapshots (masked);
+                """)
+        return self._db
+
+    def handle_request(self, request):
+        """Send a request, falling back to a snapshot for GET requests."""
+        if request.method != "GET":
+            if self.offline:
+                raise OfflineError(
+                    f"Offline: cannot send {request.method} requests",
+                    request=request,
+                )
+            return self.transport.handle_request(request)
+
+        if self.offline:
+            response = self.serve(request)
+            if response is None:
+                raise OfflineError(
+                    f"Offline: no snapshot of {request.url.path}",
+                    request=request,
+                )
+            return response
+
+        deadline = None
+        if self.timeout and self.has_snapshot(request):
+            deadline = self.timeout
+
+        try:
+            response = self.send(request, deadline)
+        except httpx.TransportError:
+            snapshot = self.serve(request)
+            if snapshot is None:
+                raise
+            return snapshot
+
+        if response.status_code in TRANSIENT:
+            snapshot = self.serve(request)
+            if snapshot is not None:
+                response.close()
+                return snapshot
+        elif response.status_code == 200:
+            self.save(request, response)
+        return response
+
+    def send(self, request, timeout=None):
+        """Send a request and read its response within a timeout.
+
+        With a timeout, the request is sent in a thread, which is left to
+        finish in the background if no response is read in time.
+        """
+        if timeout is None:
+            return self.transport.handle_request(request)
+
+        result = []
+
+        def run():
+            try:
+                response = self.transport.handle_request(request)
+                response.read()
+                result.append(response)
+            except Exception as e:
+                result.append(e)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        thread.join(timeout)
+        if not result:
+            raise httpx.TimeoutException(
+                f"No response within {timeout:g} seconds", request=request
+            )
+        if isinstance(result[0], Exception):
+            raise result[0]
+        return result[0]
+
+    def has_snapshot(self, request):
+        """Check if there is a snapshot for a request."""
+        with self.lock:
+            row = self.db.execute(
+                "SELECT 1 FROM snapshots WHERE url = ?", (str(request.url),)
+            ).fetchone()
+        return row is not None
+
+    def save(self, request, response):
+        """Store the response of a request as snapshot."""
+        headers = [
+            (k, v)
+            for k, v in response.headers.items()
+            if k.lower() not in _STALE_HEADERS
+        ]
+        url = str(request.url)
+        with self.lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?)",
+                (
+                    url,
+                    _DATE.sub("DATE", url),
+                    time.time(),
+                    json.dumps(headers),
+                    response.read(),
+                ),
+            )
+
+    def lookup(self, request):
+        """Return the time, headers and body of the snapshot of a request."""
+        url = str(request.url)
+        with self.lock:
+            row = self.db.execute(
+                "SELECT time, headers, body FROM snapshots WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:  # The same request on another day
+                row = self.db.execute(
+                    "SELECT time, headers, body FROM snapshots "
+                    "WHERE masked = ? ORDER BY time DESC LIMIT 1",
+                    (_DATE.sub("DATE", url),),
+                ).fetchone()
+        if row is not None:
+            return row[0], json.loads(row[1]), row[2]
+
+        # Single tasks are part of the snapshot of the task list
+        if not _TASK_ITEM.match(request.url.path):
+            return None
+        task_id = int(request.url.path.rsplit("/", 1)[1])
+        tasks = self.lookup(
+            httpx.Request("GET", request.url.join("/api/tasks"))
+        )
+        if tasks is None:
+            return None
+        for task in json.loads(tasks[2]):
+            if task.get("id") == task_id:
+                return tasks[0], [], json.dumps(task).encode()
+        return None
+
+    def serve(self, request):
+        """Return the snapshot of a request as response, if any."""
+        global _OFFLINE_SINCE
+        snapshot = self.lookup(request)
+        if snapshot is None:
+            return None
+
+        created, headers, body = snapshot
+        with self.lock:
+            _OFFLINE_SINCE = min(_OFFLINE_SINCE or created, created)
+        return httpx.Response(
+            200, headers=headers, content=body, request=request
+        )
+
+    def close(self):
+        """Close the database and the wrapped transport."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        self.transport.close()
+
+
+class ProfilingTransport(httpx.BaseTransport):
+    """Report the method, path, status, size and latency of requests."""
+
+    def __init__(self, transport, record):
+        """Initialize the profiling around a transport."""
+        self.transport = transport
+        self.record = record
+
+    def handle_request(self, request):
+        """Send a request and report it once the response is read."""
+        start = time.perf_counter()
+        try:
+            response = self.transport.handle_request(request)
+            response.read()
+        except httpx.TransportError:
+            seconds = time.perf_counter() - start
+            self.record(request.method, request.url.path, None, 0, seconds)
+            raise
+        self.record(
+            request.method,
+            request.url.path,
+            response.status_code,
+            response.num_bytes_downloaded or len(response.content),
+            time.perf_counter() - start,
+        )
+        return response
+
+    def close(self):
+        """Close the wrapped transport."""
+        self.transport.close()
+
+
+class CachingTransport(httpx.BaseTransport):
+    """Cache successful GET responses in memory.
+
+    Cached responses are served for `ttl` seconds. Tasks returned by a
+    mutation are written through to the cached tasks, while all other
+    cached responses are dropped, as they may have changed.
+    """
+
+    def __init__(self, transport, ttl=30):
+        """Initialize the cache around a transport."""
+        self.transport = transport
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.cache = {}
+
+    def handle_request(self, request):
+        """Serve a request from the cache or the wrapped transport."""
+        if request.method != "GET":
+            response = self.transport.handle_request(request)
+            self.update(request, response)
+            return response
+
+        key = str(request.url)
+        with self.lock:
+            entry = self.cache.get(key)
+        if entry and time.monotonic() - entry[0] < self.ttl:
+            _, status, headers, content = entry
+            return httpx.Response(
+                status, headers=headers, content=content, request=request
+            )
+
+        response = self.transport.handle_request(request)
+        if response.status_code == 200:
+            content = response.read()
+            headers = [
+                (k, v)
+                for k, v in response.headers.items()
+                if k.lower() not in _STALE_HEADERS
+            ]
+            with self.lock:
+                self.cache[key] = (time.monotonic(), 200, headers, content)
+        return response
+
+    def update(self, request, response):
+        """Write a mutated task through to the cache."""
+        match = _TASK_MUTATION.match(request.url.path)
+        task, task_id = None, None
+        if match and response.is_success:
+            if request.method == "DELETE":
+                task_id = int(match[2]) if match[2] else None
+            else:
+                try:
+                    task = json.loads(response.read())
+                except ValueError:
+                    task = None
+                if isinstance(task, dict):
+                    task = task.get("taskOrHabit", task)
+                if isinstance(task, dict) and "id" in task:
+                    task_id = task["id"]
+                else:
+                    task = None  # Unknown response, drop everything
+
+        item = str(request.url.join(f"/api/tasks/{task_id}"))
+        with self.lock:
+            for key in list(self.cache):
+                url = httpx.URL(key)
+                if task_id and url.path == "/api/tasks" and not url.query:
+                    self._update_list(key, task_id, task)
+                elif not task_id or not _TASK_ITEM.match(url.path):
+                    del self.cache[key]
+
+            if task:
+                content = json.dumps(task).encode()
+                self.cache[item] = (time.monotonic(), 200, [], content)
+            else:
+                self.cache.pop(item, None)
+
+    def _update_list(self, key, task_id, task):
+        """Replace or remove a task in a cached task list."""
+        created, status, headers, content = self.cache[key]
+        tasks = [t for t in json.loads(content) if t.get("id") != task_id]
+        if task:
+            tasks.append(task)
+        content = json.dumps(tasks).encode()
+        self.cache[key] = (created, status, headers, content)
+
+    def clear(self):
+        """Drop all cached responses."""
+        with self.lock:
+            self.cache.clear()
+
+    def close(self):
+        """Close the wrapped transport."""
+        self.transport.close()
@@ -5,33 +5,38 @@ Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 
 import argparse
 import os
+import sys
 
-import yaml
-from reclaim_sdk.client import ReclaimClient
-from reclaim_sdk.exceptions import RecordNotFound
-from reclaim_sdk.resources.task import Task
-
-from .parse import parse_event_time
+from .cache import cache_path
+from .parse import parse_event_times, set_languages
 from .str import (
     scramble_id,
+    set_theme,
     str_duration,
     str_event_color,
     str_event_id,
+    str_event_label,
     str_event_type,
     str_task_id,
     str_tid,
 )
 
+# Number of concurrent workers for mutations of multiple tasks
+WORKERS = 4
+
+# Version of the compiled config cache; a change triggers a reparse
+CONFIG_VERSION = 1
+
 
 class HelpFormatter(argparse.ArgumentDefaultsHelpFormatter):
     """Custom help formatter with fixed width and position."""
 
     def __init__(self, prog):
         """Initialize the help formatter."""
-        try:
-            width = os.get_terminal_size().columns
-        except OSError:
-            width = 80  # fallback if terminal size can't be determined
+        import shutil
+
+        # Honors COLUMNS and falls back to 80 without a terminal
+        width = shutil.get_terminal_size().columns
         super().__init__(prog, max_help_position=24, width=width)
 
     def _format_usage(self, usage, actions, groups, prefix):
@@ -62,34 +67,149 @@ class HelpFormatter(argparse.ArgumentDefaultsHelpFormatter):
         return super()._format_action(action)
 
 
-def load_config(args):
-    """Load configuration file."""
+def read_config(path):
+    """Read the configuration file as dictionary.
+
+    The parsed and validated configuration is cached in a compiled form,
+    keyed by path, modification time and size of the file. YAML is only
+    parsed if the file has changed.
+    """
+    import marshal
+
+    path = os.path.abspath(os.path.expanduser(path))
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    key = (path, stat.st_mtime_ns, stat.st_size, CONFIG_VERSION)
+    cache = cache_path("config.marshal")
+    try:
+        with open(cache, "rb") as f:
+            cached_key, config = marshal.loads(f.read())
+        if cached_key == key:
+            return config
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    import yaml
+
+    from .schema import validate_config
+
+    with open(path) as f:
+        config = validate_config(yaml.safe_load(f) or {}, path)
+
+    # The cache holds the token and is only readable by the user
+    tmp = f"{cache}.{os.getpid()}.tmp"
+    try:
+        data = marshal.dumps((key, config))
+        os.makedirs(os.path.dirname(cache), exist_ok=True)
+        with os.fdopen(
+            os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb"
+        ) as f:
+            f.write(data)
+        os.replace(tmp, cache)
+    except (OSError, ValueError):
+        pass  # Not cached, e.g., if it holds dates
+
+    return config
+
+
+def load_config(args, config=None):
+    """Load configuration file, unless already read."""
     args.config = os.path.expanduser(args.config)
-    if not os.path.exists(args.config):
+    if config is None:
+        config = read_config(args.config)
+    if config is None:
         return args
 
-    with open(args.config) as f:
-        config = yaml.safe_load(f)
-        for key, value in config.items():
-            setattr(args, key, value)
+    for key, value in config.items():
+        setattr(args, key, value)
+
+    if hasattr(args, "theme"):
+        set_theme(args.theme)
+    if hasattr(args, "date_languages"):
+        set_languages(args.date_languages)
 
     return args
 
 
+def api_token(cfg):
+    """Return the API token from the environment or the configuration."""
+    if os.environ.get("RECLAIM_TOKEN"):
+        return os.environ.get("RECLAIM_TOKEN")
+    return getattr(cfg, "reclaim_token", None)
+
+
+def client_token(cfg):
+    """Return the token of the client, a placeholder if replaying."""
+    token = api_token(cfg)
+    if not token:
+        from .transport import cassettes
+
+        # Replayed responses need no token
+        if cassettes(cfg)[1]:
+            token = "replay"
+    return token
+
+
 def set_api_key(cfg):
     """Set the API key in the configuration file."""
-    token = None
-    if os.environ.get("RECLAIM_TOKEN"):
-        token = os.environ.get("RECLAIM_TOKEN")
-    elif hasattr(cfg, "reclaim_token"):
-        token = cfg.reclaim_token
+    token = client_token(cfg)
+
+    from .transport import install
+
     if not token:
         raise Exception("No Reclaim API token set")
-    ReclaimClient.configure(token=token)
+
+    from reclaim_sdk.client import ReclaimClient
+
+    # Keep the connections of a long-running process
+    config = ReclaimClient._config
+    if ReclaimClient._instance and config and config.token == token:
+        return
+
+    install(ReclaimClient.configure(token=token), cfg)
+
+
+def account_id(token=None):
+    """Return a short identifier of an account or the configured one."""
+    import hashlib
+
+    if token is None:
+        from reclaim_sdk.client import ReclaimClient
+
+        token = ReclaimClient()._config.token
+    return hashlib.sha256(token.encode()).hexdigest()[:12]
+
+
+def fetch_parallel(*calls):
+    """Run independent API calls concurrently and return their results."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+        futures = [pool.submit(call) for call in calls]
+        return [future.result() for future in futures]
+
+
+def spawn_detached(module, *args):
+    """Run a Python module in a detached background process."""
+    import subprocess
+
+    subprocess.Popen(
+        [sys.executable, "-m", module, *args],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
 
 
 def get_task(task_id):
     """Get a task from Reclaim.ai."""
+    from reclaim_sdk.exceptions import RecordNotFound
+    from reclaim_sdk.resources.task import Task
+
     try:
         task = Task.get(task_id)
     except RecordNotFound:
@@ -99,27 +219,72 @@ def get_task(task_id):
     return task
 
 
+def for_each_task(task_ids, action, workers=WORKERS):
+    """Apply an action to one or more tasks with a pool of workers.
+
+    The action receives a task, mutates it and returns a message. Results
+    are reported per task and an error is raised if any task failed.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from .store import expire_tasks
+
+    if not isinstance(task_ids, list):
+        task_ids = [task_ids]
+
+    def apply(task_id):
+        task = get_task(task_id)
+        return task, action(task)
+
+    tasks, failed = [], 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(apply, task_id) for task_id in task_ids]
+        for task_id, future in zip(task_ids, futures):
+            try:
+                task, msg = future.result()
+            except Exception as e:
+                if len(task_ids) == 1:
+                    raise
+                failed += 1
+                tid = str_task_id(task_id)
+                print(f"✗ Failed | Id: {tid} | Error: {e}", file=sys.stderr)
+                continue
+            print_done(msg, task)
+            tasks.append(task)
+
+    expire_tasks()
+    if failed:
+        raise ValueError(f"{failed} of {len(task_ids)} tasks failed")
+    return tasks
+
+
 def print_done(msg, task):
     """Print a message with the task id and title."""
     tid = str_task_id(task.id)
     print(f"✓ {msg} | Id: {tid} | Title: {task.title}")
 
 
-def add_event_row(event, grid, multi_day, habit_lookup=None, calendars=None):
-    """Format and add an event to a Rich table grid."""
+def event_record(event, habit_lookup=None, times=None):
+    """Convert an event to a record of plain values.
+
+    All-day events are skipped and None is returned. The start and end
+    times can be passed pre-parsed as `times`, e.g., from
+    `parse_event_times`.
+    """
     if event.get("dateMode") == "ALL_DAY":
-        return
+        return None
 
-    raw_title = event.get("title") or "Untitled"
+    title = event.get("title") or "Untitled"
 
-    event_date = event.get("eventDate") or {}
-    event_start = parse_event_time(event_date.get("start"))
-    event_end = parse_event_time(event_date.get("end"))
+    if times:
+        event_start, event_end = times
+    else:
+        event_start, event_end = parse_event_times([event])[0]
 
     reclaim_data = event.get("reclaimData") or {}
     resource_id = reclaim_data.get("reclaimResourceId") or {}
     if resource_id.get("type") == "SmartSeriesId" and habit_lookup:
-        habit_id = habit_lookup.get(raw_title)
+        habit_id = habit_lookup.get(title)
         event_id = (
             "h" + str_tid(scramble_id(habit_id)).zfill(5)
             if habit_id
@@ -128,19 +293,47 @@ def add_event_row(event, grid, multi_day, habit_lookup=None, calendars=None):
     else:
         event_id = str_event_id(event)
 
+    duration = None
     if event_start and event_end:
-        duration = str_duration(
-            int((event_end - event_start).total_seconds() / 60)
-        )
-    else:
-        duration = ""
+        duration = int((event_end - event_start).total_seconds() / 60)
 
-    row = [str_event_color(event, calendars), event_id]
+    return {
+        "id": event_id,
+        "date": event_start.strftime("%Y-%m-%d") if event_start else None,
+        "start": event_start.strftime("%H:%M") if event_start else None,
+        "end": event_end.strftime("%H:%M") if event_end else None,
+        "duration": duration,
+        "type": str_event_label(event),
+        "title": title,
+    }
+
+
+def add_event_row(
+    event, grid, multi_day, habit_lookup=None, calendars=None, times=None
+):
+    """Format and add an event to a Rich table grid.
+
+    The start and end times can be passed pre-parsed as `times`, e.g.,
+    from `parse_event_times`.
+    """
+    row = event_row(event, multi_day, habit_lookup, calendars, times)
+    if row is not None:
+        grid.add_row(*row)
+
+
+def event_row(event, multi_day, habit_lookup=None, calendars=None, times=None):
+    """Format an event as a table row; return None for all-day events."""
+    record = event_record(event, habit_lookup, times)
+    if record is None:
+        return None
+
+    row = [str_event_color(event, calendars), record["id"]]
     if multi_day:
-        row.append(event_start.strftime("%Y-%m-%d") if event_start else "")
-    row.append(event_start.strftime("%H:%M") if event_start else "")
-    row.append(duration)
+        row.append(record["date"] or "")
+    row.append(record["start"] or "")
+    row.append(
+        "" if record["duration"] is None else str_duration(record["duration"])
+    )
     row.append(str_event_type(event, calendars))
-    row.append(raw_title)
-
-    grid.add_row(*row)
+    row.append(record["title"])
+    return row
@@ -0,0 +1,110 @@
+"""Watching of Listings.
+
+In watch mode, a listing is polled in one process with a persistent
+client. The table is only redrawn if the data has changed, rows of
+unchanged items are reused, and polling backs off while nothing changes.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import time
+from datetime import datetime
+
+# Factor by which the poll interval grows while nothing changes
+BACKOFF = 1.5
+
+# Maximum poll interval as a multiple of the requested interval
+MAX_BACKOFF = 4
+
+
+def add_watch_arg(subparser):
+    """Add the watch argument to a subparser."""
+    subparser.add_argument(
+        "-w",
+        "--watch",
+        type=float,
+        metavar="<seconds>",
+        help="update the table every few seconds",
+        default=None,
+    )
+
+
+def check_watch_args(args):
+    """Check the watch argument against the output format."""
+    watch = getattr(args, "watch", None)
+    if watch is None:
+        return
+    if watch <= 0:
+        raise ValueError("--watch must be positive")
+    if getattr(args, "format", "table") != "table":
+        raise ValueError("--watch requires the table format")
+
+
+class RowCache(object):
+    """Formatted table rows of items, reused while the items are unchanged."""
+
+    def __init__(self, format_row):
+        """Initialize the cache with a function formatting an item."""
+        self.format_row = format_row
+        self.rows = {}
+
+    def get(self, items, keys):
+        """Return the rows of items, formatting only new or changed ones.
+
+        Each item has a key that changes whenever its row would change,
+        e.g., its update time or a serialization of the item.
+        """
+        cache, rows = {}, []
+        for item, key in zip(items, keys):
+            if key not in cache:
+                cache[key] = self.rows.get(key) or self.format_row(item)
+            rows.append(cache[key])
+        self.rows = cache
+        return rows
+
+    def clear(self):
+        """Discard all rows, e.g., if their formatting has changed."""
+        self.rows = {}
+
+
+def next_interval(delay, interval, changed):
+    """Return the delay until the next poll."""
+    if changed:
+        return interval
+    return min(delay * BACKOFF, interval * MAX_BACKOFF)
+
+
+def watch(poll, interval, sleep=time.sleep):
+    """Show a listing in a live display and update it on changes.
+
+    `poll()` returns a renderable if the listing has changed and None
+    otherwise. Errors of a poll are shown below the last listing and
+    polling continues with backoff. Watching ends with Ctrl-C.
+    """
+    from rich.console import Group
+    from rich.live import Live
+    from rich.text import Text
+
+    delay, shown = interval, ""
+    with Live(auto_refresh=False) as live:
+        while True:
+            try:
+                renderable, error = poll(), None
+            except KeyboardInterrupt:
+                return
+            except Exception as e:
+                renderable, error = None, e
+
+            if renderable is not None:
+                shown = renderable
+                status = Text(f"Updated {datetime.now():%H:%M:%S}", "dim")
+            elif error is not None:
+                status = Text(f"Error: {error}", "red")
+            if renderable is not None or error is not None:
+                live.update(Group(shown, status), refresh=True)
+            delay = next_interval(delay, interval, renderable is not None)
+
+            try:
+                sleep(delay)
+            except KeyboardInterrupt:
+                return
@@ -1,23 +1,118 @@
 import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, datetime
 
+import httpx
 import pytest
 from reclaim_sdk.client import ReclaimClient
 from reclaim_sdk.resources.task import Task
 
 from reclaim.commands import load
 from reclaim.str import str_task_id
-from reclaim.utils import load_config, set_api_key
+from reclaim.transport import cassettes
+from reclaim.utils import api_token, load_config, set_api_key
+
+from .standin import StandIn
+
+# Recorded responses replayed without an API token of a test account
+CASSETTES = os.path.join(os.path.dirname(__file__), "cassettes")
+
+# File with the time of the recording in a directory of cassettes
+CLOCK = "clock.json"
+
+
+def pin_clock(monkeypatch, now):
+    """Pin the current date and time in the modules of the package."""
+
+    class PinnedDate(date):
+        @classmethod
+        def today(cls):
+            return now.date()
+
+    class PinnedDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now if tz is None else now.astimezone(tz)
+
+        @classmethod
+        def today(cls):
+            return now
+
+    for name, module in list(sys.modules.items()):
+        if name.split(".")[0] != "reclaim":
+            continue
+        if getattr(module, "date", None) is date:
+            monkeypatch.setattr(module, "date", PinnedDate)
+        if getattr(module, "datetime", None) is datetime:
+            monkeypatch.setattr(module, "datetime", PinnedDatetime)
 
 
 @pytest.fixture
-def commands():
-    """Return all available Reclaim CLI commands."""
+def commands(monkeypatch, tmp_path, request):
+    """Return all available Reclaim CLI commands.
+
+    Without an API token of a test account, the recorded responses in
+    `tests/cassettes` are replayed. With `RECLAIM_STANDIN`, requests are
+    answered by a stand-in of the API instead, e.g., for recording the
+    cassettes. When recording or replaying, each test has its own
+    directory of cassettes and starts with a new client and an empty
+    cache, such that responses are replayed in the order they were
+    recorded. Replayed tests run at the time of the recording.
+    """
     args = argparse.Namespace(
         config="~/.reclaim-dev",
     )
     args = load_config(args)
+    record, replay = cassettes(args)
+    standin = os.environ.get("RECLAIM_STANDIN") and StandIn()
+    if standin:
+        monkeypatch.setenv("RECLAIM_TOKEN", "standin")
+        monkeypatch.setattr(
+            httpx, "HTTPTransport", lambda **kwargs: standin.transport()
+        )
+    elif not (record or replay or api_token(args)):
+        replay = CASSETTES  # No test account configured
+    for name, path in (("RECORD", record), ("REPLAY", replay)):
+        if path:
+            path = os.path.join(os.path.expanduser(path), request.node.name)
+            monkeypatch.setenv(f"RECLAIM_{name}", path)
+    if record or replay or standin:
+        monkeypatch.setenv("RECLAIM_CACHE_DIR", str(tmp_path / "cache"))
+        monkeypatch.setattr(ReclaimClient, "_instance", None)
     set_api_key(args)
-    return {cmd.name: cmd for cmd in load()}
+    commands = {cmd.name: cmd for cmd in load()}
+
+    record, replay = cassettes(args)
+    if record:
+        os.makedirs(record, exist_ok=True)
+        with open(os.path.join(record, CLOCK), "w") as f:
+            json.dump({"now": datetime.now().isoformat()}, f)
+    elif replay and os.path.exists(os.path.join(replay, CLOCK)):
+        with open(os.path.join(replay, CLOCK)) as f:
+            pin_clock(monkeypatch, datetime.fromisoformat(json.load(f)["now"]))
+    return commands
+
+
+@pytest.fixture
+def settle():
+    """Return a function waiting for the API to apply a change.
+
+    Replayed responses are recorded after the change and the stand-in of
+    the API applies changes at once, so there is no need to wait in these
+    cases.
+    """
+
+    def wait(seconds=3):
+        """Wait for a number of seconds unless replaying."""
+        if not any(
+            os.environ.get(f"RECLAIM_{name}") for name in ("REPLAY", "STANDIN")
+        ):
+            time.sleep(seconds)
+
+    return wait
 
 
 @pytest.fixture
@@ -0,0 +1,216 @@
+"""Stand-in of the Reclaim API for recording cassettes.
+
+The stand-in answers the requests of the command tests with synthetic
+tasks, habits and events, such that the cassettes in `tests/cassettes`
+can be recorded again and compared without an account at Reclaim.ai.
+Changes are applied at once and answered like the API does:
+
+    RECLAIM_STANDIN=1 RECLAIM_RECORD=tests/cassettes pytest tests/test_cmds.py
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import json
+import re
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+# Routes of the API answered by the stand-in
+ROUTES = [
+    ("GET", r"/api/tasks", "list_tasks"),
+    ("POST", r"/api/tasks", "create_task"),
+    ("GET", r"/api/tasks/(\d+)", "get_task"),
+    ("PATCH", r"/api/tasks/(\d+)", "update_task"),
+    ("DELETE", r"/api/tasks/(\d+)", "delete_task"),
+    ("POST", r"/api/planner/done/task/(\d+)", "complete_task"),
+    ("GET", r"/api/assist/habits/daily", "list_habits"),
+    ("GET", r"/api/assist/habits/daily/(\d+)", "get_habit"),
+    ("GET", r"/api/events/v2", "list_events"),
+]
+
+# Fields of tasks set by the API only
+READ_ONLY = ("id", "created", "updated")
+
+
+def iso(dt):
+    """Return a time in the format of the API."""
+    return dt.isoformat().replace("+00:00", "Z")
+
+
+class StandIn(object):
+    """Synthetic account at Reclaim.ai answering API requests."""
+
+    def __init__(self, now=None):
+        """Initialize the account with a few tasks and a habit."""
+        self.now = (now or datetime.now(timezone.utc)).replace(microsecond=0)
+        self.next_id = 10000101
+        self.tasks = {}
+        for task in (
+            self.task(10000011, "Review paper", at_risk=True, days=1),
+            self.task(10000012, "Prepare slides", "IN_PROGRESS", days=5),
+            self.task(10000013, "Book travel", "NEW", days=14),
+        ):
+            self.tasks[task["id"]] = task
+        self.habit = {
+            "id": 20000021,
+            "title": "Focus time",
+            "elevated": True,
+            "priority": "P2",
+            "durationMin": 60,
+            "durationMax": 120,
+            "idealTime": "09:00:00",
+            "recurringAssignmentType": "DAILY_HABIT",
+            "eventCategory": "WORK",
+            "defenseAggression": "DEFAULT",
+            "alwaysPrivate": False,
+            "created": iso(self.now - timedelta(days=30)),
+            "updated": iso(self.now - timedelta(days=2)),
+        }
+
+    def task(self, task_id, title, status="SCHEDULED", at_risk=False, days=3):
+        """Return a task due in a number of days."""
+        return {
+            "id": task_id,
+            "title": title,
+            "notes": "",
+            "eventCategory": "WORK",
+            "eventSubType": "FOCUS",
+            "timeSchemeId": None,
+            "timeChunksRequired": 8,
+            "minChunkSize": 2,
+            "maxChunkSize": 8,
+            "timeChunksSpent": 2,
+            "timeChunksRemaining": 6,
+            "priority": "P1" if at_risk else "P2",
+            "onDeck": False,
+            "atRisk": at_risk,
+            "deleted": False,
+            "adjusted": False,
+            "deferred": False,
+            "alwaysPrivate": False,
+            "status": status,
+            "due": iso(self.now + timedelta(days=days)),
+            "created": iso(self.now - timedelta(days=10)),
+            "updated": iso(self.now - timedelta(days=1)),
+            "finished": None,
+            "snoozeUntil": None,
+            "index": float(task_id % 1000),
+            "eventColor": "NONE",
+        }
+
+    def transport(self):
+        """Return a transport answering requests with the stand-in."""
+        return httpx.MockTransport(self.handle)
+
+    def handle(self, request):
+        """Answer a request like the API."""
+        for method, pattern, name in ROUTES:
+            match = re.fullmatch(pattern, request.url.path)
+            if request.method == method and match:
+                args = [int(arg) for arg in match.groups()]
+                return getattr(self, name)(request, *args)
+        return httpx.Response(404, json={"message": "Not found"})
+
+    def find_task(self, task_id):
+        """Return a task that is not deleted or None."""
+        task = self.tasks.get(task_id)
+        return task if task and not task["deleted"] else None
+
+    def list_tasks(self, request):
+        """List all tasks that are not deleted."""
+        tasks = [t for t in self.tasks.values() if not t["deleted"]]
+        return httpx.Response(200, json=tasks)
+
+    def create_task(self, request):
+        """Create a task from the fields given."""
+        data = json.loads(request.content)
+        task = self.task(self.next_id, data["title"], "NEW")
+        task.update(
+            (k, v)
+            for k, v in data.items()
+            if v is not None and k not in READ_ONLY
+        )
+        task["timeChunksSpent"] = 0
+        task["timeChunksRemaining"] = task["timeChunksRequired"]
+        task["created"] = task["updated"] = iso(self.now)
+        self.tasks[task["id"]] = task
+        self.next_id += 1
+        return httpx.Response(200, json=task)
+
+    def get_task(self, request, task_id):
+        """Return a task."""
+        task = self.find_task(task_id)
+        if task is None:
+            return httpx.Response(404, json={"message": "Task not found"})
+        return httpx.Response(200, json=task)
+
+    def update_task(self, request, task_id):
+        """Update the fields of a task."""
+        task = self.find_task(task_id)
+        if task is None:
+            return httpx.Response(404, json={"message": "Task not found"})
+        data = json.loads(request.content)
+        task.update((k, v) for k, v in data.items() if k not in READ_ONLY)
+        task["updated"] = iso(self.now + timedelta(seconds=1))
+        return httpx.Response(200, json=task)
+
+    def delete_task(self, request, task_id):
+        """Delete a task."""
+        task = self.find_task(task_id)
+        if task is None:
+            return httpx.Response(404, json={"message": "Task not found"})
+        task["deleted"] = True
+        return httpx.Response(204)
+
+    def complete_task(self, request, task_id):
+        """Mark a task as complete."""
+        task = self.find_task(task_id)
+        if task is None:
+            return httpx.Response(404, json={"message": "Task not found"})
+        task.update(status="ARCHIVED", finished=iso(self.now))
+        return httpx.Response(200, json={"taskOrHabit": task})
+
+    def list_habits(self, request):
+        """List the daily habits."""
+        return httpx.Response(200, json=[self.habit])
+
+    def get_habit(self, request, habit_id):
+        """Return a daily habit."""
+        if habit_id != self.habit["id"]:
+            return httpx.Response(404, json={"message": "Habit not found"})
+        return httpx.Response(200, json=self.habit)
+
+    def list_events(self, request):
+        """List a habit, a task and a meeting on each day of a range."""
+        params = request.url.params
+        day = datetime.fromisoformat(params["start"])
+        end = datetime.fromisoformat(params["end"])
+        events = []
+        while day < end:
+            for hour, minutes, title, resource in (
+                (9, 60, "Focus time", self.habit["id"]),
+                (11, 120, "Review paper", 10000011),
+                (14, 30, "Team meeting", None),
+            ):
+                start = day.replace(hour=hour, tzinfo=timezone.utc)
+                stop = start + timedelta(minutes=minutes)
+                if resource == self.habit["id"]:
+                    resource = {"type": "SmartSeriesId", "seriesId": resource}
+                elif resource is not None:
+                    resource = {"type": "TaskId", "id": resource}
+                events.append(
+                    {
+                        "eventId": f"e{start:%Y%m%d%H}",
+                        "title": title,
+                        "eventDate": {
+                            "start": start.isoformat(),
+                            "end": stop.isoformat(),
+                        },
+                        "calendarId": 1,
+                        "reclaimData": resource
+                        and {"reclaimResourceId": resource},
+                    }
+                )
+            day += timedelta(days=1)
+        return httpx.Response(200, json=events)
@@ -4,7 +4,6 @@ Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
 """
 
 import argparse
-import time
 from datetime import timedelta
 
 import pytest
@@ -28,7 +27,7 @@ def test_delete_task(commands, test_task):
         get_task(args.id)
 
 
-def test_mark_task(commands, test_task):
+def test_mark_task(commands, test_task, settle):
     """Test mark-task command."""
     args = argparse.Namespace(id=test_task, mark="complete")
 
@@ -38,7 +37,7 @@ def test_mark_task(commands, test_task):
     cmd.run(args)
 
     # Wait for task to be updated
-    time.sleep(3)
+    settle()
 
     # Verify task is complete
     task = get_task(args.id)
@@ -46,7 +45,30 @@ def test_mark_task(commands, test_task):
     # No need to delete task
 
 
-def test_create_task(commands):
+def test_mark_task_queued(commands, test_task, settle, tmp_path, monkeypatch):
+    """Test mark-task command with a queued change."""
+    monkeypatch.setenv("RECLAIM_CACHE_DIR", str(tmp_path))
+    args = argparse.Namespace(
+        id=test_task, mark="complete", queue=True, queue_flush=False
+    )
+    args.config = "~/.reclaim-dev"
+
+    # Validate and queue
+    cmd = commands["mark-task"]
+    cmd.validate_args(args)
+    cmd.run(args)
+    assert get_task(args.id).status != TaskStatus.ARCHIVED
+
+    # Send the queued change
+    result = commands["flush"].run(argparse.Namespace(quiet=False))
+    assert result == (1, 0, 0)
+    settle()
+
+    task = get_task(args.id)
+    assert task.status == TaskStatus.ARCHIVED
+
+
+def test_create_task(commands, settle):
     """Test create-task command."""
     args = argparse.Namespace(
         title="Test Task",
@@ -64,7 +86,7 @@ def test_create_task(commands):
     cmd.validate_args(args)
     task = cmd.run(args)
 
-    time.sleep(3)
+    settle()
 
     task = get_task(task.id)
     assert task.title == args.title
@@ -263,7 +285,7 @@ def test_show_habit_invalid(commands):
         cmd.run(args)
 
 
-def test_edit_task(commands, test_task):
+def test_edit_task(commands, test_task, settle):
     """Test edit-task command."""
     args = argparse.Namespace(
         id=test_task,
@@ -282,7 +304,7 @@ def test_edit_task(commands, test_task):
     cmd.validate_args(args)
     task = cmd.run(args)
 
-    time.sleep(3)
+    settle()
 
     task = get_task(task.id)
     assert task.title == args.title
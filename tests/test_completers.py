@@ -0,0 +1,47 @@
+"""Test cases for shell completion.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import time
+
+import pytest
+
+import reclaim.completers as completers
+from reclaim.cache import save_cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Use a temporary cache directory and record spawned refreshes."""
+    monkeypatch.setenv("RECLAIM_CACHE_DIR", str(tmp_path))
+    spawned = []
+    monkeypatch.setattr(
+        "reclaim.utils.spawn_detached", lambda *args: spawned.append(args)
+    )
+    return spawned
+
+
+def test_complete_fresh(cache_dir):
+    """Fresh completions are answered from the cache without refresh."""
+    items = {"t00001": "Task"}
+    save_cache("completions-tasks.json", {"time": time.time(), "items": items})
+    assert completers.task_ids() == items
+    assert not cache_dir
+
+
+def test_complete_stale(cache_dir):
+    """Stale completions trigger one refresh and respect the deadline."""
+    items = {"h00001": "Habit"}
+    save_cache("completions-habits.json", {"time": 0, "items": items})
+
+    start = time.monotonic()
+    assert completers.habit_ids() == items
+    assert time.monotonic() - start < 2 * completers.COMPLETION_DEADLINE
+    assert completers.habit_ids() == items
+    assert cache_dir == [("reclaim.completers", "habits")]
+
+
+def test_complete_empty(cache_dir):
+    """Missing completions return empty results."""
+    assert completers.task_ids() == {}
@@ -0,0 +1,88 @@
+"""Test cases for the background daemon.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import socket
+import threading
+import time
+
+import reclaim.daemon
+import reclaim.transport
+from reclaim.__main__ import forwarded
+from reclaim.daemon import forward, serve, stop
+
+
+def test_forward(tmp_path, capsys, monkeypatch):
+    """Command lines are run by the daemon and output is streamed back."""
+    monkeypatch.setattr(reclaim.transport, "_WRAPPERS", [])
+    path = str(tmp_path / "daemon.sock")
+    assert forward(["--help"], path) is None
+
+    thread = threading.Thread(target=serve, args=(path, 10))
+    thread.start()
+    try:
+        while forward(["--help"], path) is None:
+            time.sleep(0.01)
+        capsys.readouterr()
+
+        assert forward(["--help"], path) == 0
+        assert "usage: reclaim" in capsys.readouterr().out
+        assert forward(["unknown-command"], path) == 2
+        assert "invalid choice" in capsys.readouterr().err
+
+        # Commands that are not forwarded are declined
+        assert forward(["flush", "--quiet"], path) is None
+    finally:
+        assert stop(path)
+        thread.join()
+
+
+def test_forward_busy(tmp_path, monkeypatch):
+    """Commands run in-process if the daemon does not greet in time."""
+    monkeypatch.setattr(reclaim.daemon, "CONNECT_TIMEOUT", 0.1)
+    path = str(tmp_path / "daemon.sock")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(path)
+        sock.listen()  # Connections are accepted, but never served
+        start = time.time()
+        assert forward(["--help"], path) is None
+        assert time.time() - start < 1
+
+
+def test_forward_lost(tmp_path, capsys):
+    """Commands are not run again if the connection is lost after sending."""
+    path = str(tmp_path / "daemon.sock")
+    requests = []
+
+    def crash(sock):
+        conn, _ = sock.accept()
+        with conn:
+            conn.sendall(b'{"ready": true}\n')
+            requests.append(conn.makefile("r").readline())
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(path)
+        sock.listen()
+        thread = threading.Thread(target=crash, args=(sock,))
+        thread.start()
+        assert forward(["mark-task", "t2abcd", "complete"], path) == 1
+        thread.join()
+
+    assert "mark-task" in requests[0]
+    assert "Connection to daemon lost" in capsys.readouterr().err
+
+
+def test_forwarded(monkeypatch):
+    """Long-running and interactive commands are not forwarded."""
+    monkeypatch.delenv("RECLAIM_NO_DAEMON", raising=False)
+    for option in ("RECORD", "REPLAY", "PROFILE", "OFFLINE"):
+        monkeypatch.delenv(f"RECLAIM_{option}", raising=False)
+
+    assert forwarded(["list-tasks"])
+    assert forwarded(["log-work", "t2abcd", "1h"])
+    assert not forwarded(["list-tasks", "--watch", "5"])
+    assert not forwarded(["import-tasks", "tasks.csv"])
+    assert not forwarded(["flush", "--quiet"])
+    assert not forwarded(["shell"])
+    assert not forwarded(["--offline", "list-tasks"])
@@ -0,0 +1,75 @@
+"""Test cases for event functions.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+from datetime import date, timedelta
+
+from reclaim.events import OccurrenceIndex
+
+
+class FakeClient(object):
+    """Serve one task and one habit event per day."""
+
+    def __init__(self):
+        """Initialize the list of requested windows."""
+        self.windows = []
+
+    def get(self, endpoint, params):
+        """Return the events between start and end."""
+        start = date.fromisoformat(params["start"])
+        end = date.fromisoformat(params["end"])
+        self.windows.append((end - start).days)
+
+        events = []
+        for i in range((end - start).days):
+            day = (start + timedelta(days=i)).isoformat()
+            events.append(
+                {
+                    "eventId": f"t{day}",
+                    "eventDate": {
+                        "start": f"{day}T09:00:00Z",
+                        "end": f"{day}T10:00:00Z",
+                    },
+                    "reclaimData": {
+                        "reclaimResourceId": {"type": "TaskId", "id": 1}
+                    },
+                }
+            )
+            events.append(
+                {
+                    "eventId": f"h{day}",
+                    "title": "Lunch",
+                    "eventDate": {"start": f"{day}T12:00:00Z"},
+                    "reclaimData": {
+                        "reclaimResourceId": {
+                            "type": "SmartSeriesId",
+                            "seriesId": 2,
+                        }
+                    },
+                }
+            )
+        return events
+
+
+def test_find_stops_early():
+    """Only the first window is fetched if it has enough occurrences."""
+    client = FakeClient()
+    index = OccurrenceIndex(client=client)
+    found = index.find(title="Lunch", enough=lambda occ: len(occ) > 3)
+    assert len(found) == 7
+    assert client.windows == [7]
+
+
+def test_find_expands_windows():
+    """Windows expand without refetching days until enough is found."""
+    client = FakeClient()
+    index = OccurrenceIndex(client=client)
+    found = index.find(("TaskId", 1), enough=lambda occ: len(occ) >= 10)
+    assert len(found) == 30
+    assert client.windows == [7, 23]
+    assert found == sorted(found, key=lambda e: e["eventDate"]["start"])
+
+    # Unknown resources exhaust all windows
+    assert index.find(("TaskId", 3), enough=bool) == []
+    assert client.windows == [7, 23, 60]
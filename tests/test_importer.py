@@ -0,0 +1,68 @@
+"""Test cases for bulk task import.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import types
+
+import pytest
+
+from reclaim.importer import import_records, read_records, task_args
+
+
+def test_read_records(tmp_path):
+    """Records are streamed from CSV, JSONL and YAML files."""
+    path = tmp_path / "tasks.csv"
+    path.write_text("Title,Duration,Snooze until\nWrite,1h,\n")
+    rows = list(read_records(str(path)))
+    args = task_args(rows[0][1])
+    assert rows[0][0] == 1
+    assert (args.title, args.duration, args.snooze_until) == (
+        "Write",
+        "1h",
+        None,
+    )
+
+    path = tmp_path / "tasks.jsonl"
+    path.write_text('{"title": "Write"}\n\n{"title": "Review"}\n')
+    titles = [task_args(r).title for _, r in read_records(str(path))]
+    assert titles == ["Write", "Review"]
+
+    path = tmp_path / "tasks.yaml"
+    path.write_text("- title: Write\n  duration: 2h\n- title: Review\n")
+    titles = [task_args(r).title for _, r in read_records(str(path))]
+    assert titles == ["Write", "Review"]
+
+
+def test_task_args_invalid():
+    """Records without title or with unknown fields are rejected."""
+    with pytest.raises(ValueError, match="Missing title"):
+        task_args({"duration": "1h"})
+    with pytest.raises(ValueError, match="Unknown field"):
+        task_args({"title": "Write", "color": "red"})
+
+
+def test_import_records_resume(tmp_path):
+    """Created rows are checkpointed and skipped when resuming."""
+    checkpoint = str(tmp_path / "tasks.checkpoint")
+    records = [(i, {"title": f"Task {i}"}) for i in range(1, 6)]
+
+    def prepare(record):
+        return types.SimpleNamespace(title=record["title"], id=None)
+
+    def create(task):
+        if task.title == "Task 3":
+            raise ValueError("Failed")
+        task.id = int(task.title.split()[1])
+        return task
+
+    results = list(import_records(records, prepare, create, checkpoint))
+    assert sorted(row for row, task, _ in results if task) == [1, 2, 4, 5]
+
+    created = []
+    results = list(
+        import_records(
+            records, prepare, lambda t: created.append(t) or t, checkpoint
+        )
+    )
+    assert [task.title for task in created] == ["Task 3"]
@@ -0,0 +1,157 @@
+"""Test cases for the local index of task IDs.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import argparse
+
+import pytest
+
+from reclaim.index import TaskIndex, index_path, resolve_tid
+from reclaim.str import str_task_id
+from reclaim.utils import account_id
+
+TASKS = [
+    (1, "Write quarterly report", "NEW"),
+    (2, "Review quarterly budget", "COMPLETE"),
+    (3, "Prepare team meeting", "SCHEDULED"),
+    (4, "Prepare talk", "IN_PROGRESS"),
+    (5, "Call Anna", "NEW"),
+    (6, "Call Bert", "NEW"),
+    (7, "Write thesis", "NEW"),
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Return an index of a few tasks."""
+    index = TaskIndex(str(tmp_path / "tasks.index"))
+    index.build(TASKS)
+    return index
+
+
+def test_index_load(index):
+    """The index is persisted and loaded."""
+    loaded = TaskIndex(index.path)
+    assert loaded.load()
+    assert loaded.tasks == index.tasks
+    assert not TaskIndex(index.path + ".missing").load()
+
+
+def test_index_resolve(index):
+    """Tasks are resolved by ID prefix and title fragment."""
+    tid = str_task_id(3)
+    assert index.resolve(tid[:4]) == 3
+    assert index.resolve(tid[1:4]) == 3
+    assert index.resolve("quarterly rep") == 1
+    assert index.resolve("team meet") == 3
+    assert index.resolve("prepre talk") == 4  # Most similar title
+    assert index.resolve("budget") == 2
+    assert index.resolve("quarterly") == 1  # Active tasks are preferred
+    assert index.resolve("unrelated words") is None
+
+    with pytest.raises(ValueError, match="Ambiguous"):
+        index.resolve("call")
+    with pytest.raises(ValueError, match="Ambiguous"):
+        index.resolve("prepare")  # Contained in two active titles
+
+    # Words resembling display IDs are not mistaken for them
+    assert index.resolve("thesis") == 7
+    assert index.resolve(str_task_id(7)) == 7
+
+
+def test_resolve_tid(tmp_path, monkeypatch):
+    """Arguments are resolved locally and decoded only without a match."""
+    from reclaim.store import TaskStore
+
+    monkeypatch.setenv("RECLAIM_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("RECLAIM_TOKEN", "test")
+    TaskIndex(index_path(account_id("test"))).build(TASKS)
+    synced = []
+    monkeypatch.setattr(TaskStore, "sync", lambda self: synced.append(1))
+
+    config = argparse.Namespace()
+    assert resolve_tid("talk", config) == 4
+    assert resolve_tid("thesis", config) == 7
+    assert resolve_tid(str_task_id(3), config) == 3
+    assert not synced
+
+    # Unknown display IDs are decoded after a sync
+    assert resolve_tid(str_task_id(42), config) == 42
+    assert synced == [1]
+    with pytest.raises(ValueError, match="No task matches"):
+        resolve_tid("unrelated words", config)
+    assert synced == [1, 1]
+
+
+def test_resolve_tid_throttled(tmp_path, monkeypatch):
+    """Misses do not sync again if the store was synced recently."""
+    import time
+
+    from reclaim.store import TaskStore, store_path
+
+    monkeypatch.setenv("RECLAIM_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("RECLAIM_TOKEN", "test")
+    TaskIndex(index_path(account_id("test"))).build(TASKS)
+    synced = []
+
+    def sync(self):
+        synced.append(1)
+        with self.db:
+            self.set_meta("synced", time.time())
+
+    monkeypatch.setattr(TaskStore, "sync", sync)
+
+    config = argparse.Namespace()
+    for _ in range(3):
+        with pytest.raises(ValueError, match="No task matches"):
+            resolve_tid("unrelated words", config)
+    assert synced == [1]
+
+    # Outdated stores are synced again
+    store = TaskStore(store_path(account_id("test")))
+    store.expire()
+    with pytest.raises(ValueError, match="No task matches"):
+        resolve_tid("unrelated words", config)
+    assert synced == [1, 1]
+
+
+def test_resolve_tid_offline(tmp_path, monkeypatch):
+    """Queued changes and failed syncs fall back to display IDs."""
+    from reclaim.store import TaskStore
+
+    monkeypatch.setenv("RECLAIM_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("RECLAIM_TOKEN", "test")
+    TaskIndex(index_path(account_id("test"))).build(TASKS)
+    synced = []
+
+    def sync(self):
+        synced.append(1)
+        raise ConnectionError("unreachable")
+
+    monkeypatch.setattr(TaskStore, "sync", sync)
+
+    # Queued changes never sync
+    config = argparse.Namespace(queue=True)
+    assert resolve_tid("talk", config) == 4
+    assert resolve_tid(str_task_id(42), config) == 42
+    assert not synced
+
+    # Failed syncs are ignored
+    config = argparse.Namespace(queue=False)
+    assert resolve_tid(str_task_id(42), config) == 42
+    assert synced == [1]
+
+
+def test_resolve_tid_replay(tmp_path, monkeypatch):
+    """Arguments are resolved without an API token when replaying."""
+    from reclaim_sdk.client import ReclaimClient
+
+    monkeypatch.setenv("RECLAIM_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("RECLAIM_REPLAY", str(tmp_path / "cassettes"))
+    monkeypatch.delenv("RECLAIM_TOKEN", raising=False)
+    monkeypatch.setattr(ReclaimClient, "_instance", None)
+    monkeypatch.setattr(ReclaimClient, "_config", None)
+    TaskIndex(index_path(account_id("replay"))).build(TASKS)
+
+    assert resolve_tid("thesis", argparse.Namespace()) == 7
@@ -0,0 +1,75 @@
+"""Test cases for the workload engine.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from reclaim.load import bucket_bounds, load_buckets
+
+
+def fake_task(due, hours, snooze=None, spent=0):
+    """Create a task-like object with remaining work in hours."""
+    return SimpleNamespace(
+        id=1,
+        due=datetime(*due, 17, tzinfo=timezone.utc),
+        snooze_until=(
+            datetime(*snooze, tzinfo=timezone.utc) if snooze else None
+        ),
+        time_chunks_required=hours * 4,
+        time_chunks_spent=spent,
+    )
+
+
+def test_bucket_bounds():
+    """Periods start with the first full period on or after today."""
+    today = date(2025, 6, 5)  # Thursday
+    assert bucket_bounds(today, "day", 1)[:2] == [today, date(2025, 6, 6)]
+    assert bucket_bounds(today, "week", 2) == [
+        date(2025, 6, 9),
+        date(2025, 6, 16),
+        date(2025, 6, 23),
+    ]
+    assert bucket_bounds(today, "month", 52)[0] == date(2025, 7, 1)
+    assert bucket_bounds(today, "month", 52)[-1] == date(2026, 7, 1)
+
+
+def test_load_buckets():
+    """Remaining work is spread evenly until the due date."""
+    today = date(2025, 6, 9)  # Monday
+    tasks = [
+        fake_task((2025, 6, 23), 14),  # 1h per day for 14 days
+        fake_task((2025, 6, 16), 4, snooze=(2025, 6, 12)),  # 1h per day
+        fake_task((2025, 6, 30), 10, spent=40),  # Done
+    ]
+
+    weeks = load_buckets(tasks, today, "week", 3)
+    assert [round(hours, 6) for _, _, hours, _ in weeks] == [11, 7, 0]
+    assert [len(t) for _, _, _, t in weeks] == [2, 1, 0]
+
+    days = load_buckets(tasks, today, "day", 3)
+    assert sum(hours for _, _, hours, _ in days) == sum(
+        hours for _, _, hours, _ in weeks
+    )
+
+
+def test_load_buckets_scale():
+    """A year of daily load over thousands of tasks is fast."""
+    random.seed(0)
+    today = date(2025, 6, 9)
+    tasks = [
+        fake_task(
+            (2025, 6, 10) if i % 7 else (2026, 5, 30),
+            random.randint(1, 40),
+        )
+        for i in range(5000)
+    ]
+    for task in tasks:
+        task.due += timedelta(days=random.randint(0, 360))
+
+    start = time.perf_counter()
+    load_buckets(tasks, today, "day", 52)
+    assert time.perf_counter() - start < 0.5
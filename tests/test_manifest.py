@@ -0,0 +1,37 @@
+"""Test cases for the command manifest.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+from reclaim.commands import (
+    MANIFEST,
+    CommandStub,
+    load,
+    load_command,
+    select,
+)
+
+
+def test_manifest_matches_commands():
+    """Manifest entries match the attributes of the command classes."""
+    for info in MANIFEST:
+        cmd = load_command(info.name)
+        assert cmd.name == info.name
+        assert cmd.aliases == info.aliases
+        assert cmd.description == info.description
+
+
+def test_lazy_load_imports_selected_only():
+    """Lazy loading returns stubs for all but the selected command."""
+    cmds = {cmd.name: cmd for cmd in load(lazy=True, selected="list-tasks")}
+    assert len(cmds) == len(MANIFEST)
+    assert not isinstance(cmds["list-tasks"], CommandStub)
+    assert isinstance(cmds["show-task"], CommandStub)
+
+
+def test_select_command():
+    """The selected command is found by name or alias after options."""
+    assert select(["-c", "tasks", "show-task", "t00000"]).name == "show-task"
+    assert select(["--config=x", "tasks"]).name == "list-tasks"
+    assert select(["--replay", "log", "events"]).name == "list-events"
+    assert select(["-h"]) is None
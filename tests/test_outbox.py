@@ -0,0 +1,178 @@
+"""Test cases for the outbox of queued changes.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import argparse
+import json
+import os
+import threading
+
+import httpx
+
+from reclaim.outbox import (
+    RETRIES,
+    Outbox,
+    coalesce,
+    outbox_path,
+    queue,
+)
+from reclaim.utils import account_id
+
+
+def entry(key, op, task_id=1, time=0.0, **fields):
+    """Return a queued entry."""
+    return dict(key=key, op=op, id=task_id, time=time, **fields)
+
+
+def ops(changes):
+    """Return the operations and keys of coalesced changes."""
+    return [
+        (c["entry"] and c["entry"]["op"], "".join(c["keys"])) for c in changes
+    ]
+
+
+def test_coalesce():
+    """Redundant changes of a task are coalesced."""
+    entries = [
+        entry("a", "start", time=0),
+        entry("b", "start", time=60),
+        entry("c", "add", task_id=2, minutes=15),
+        entry("d", "stop", time=1800),
+        entry("e", "add", task_id=2, minutes=30),
+        entry("f", "complete", task_id=3),
+        entry("g", "incomplete", task_id=3),
+    ]
+    changes = coalesce(entries)
+    assert ops(changes) == [
+        ("log", "abd"),
+        ("add", "ce"),
+        ("incomplete", "fg"),
+    ]
+    assert changes[0]["entry"]["minutes"] == 30
+    assert changes[0]["entry"]["end"] == 1800
+    assert changes[1]["entry"]["minutes"] == 45
+
+    # Changes in between are not reordered
+    entries = [entry("a", "start"), entry("b", "log"), entry("c", "stop")]
+    assert ops(coalesce(entries)) == [
+        ("start", "a"),
+        ("log", "b"),
+        ("stop", "c"),
+    ]
+
+    # A start stopped within a minute leaves nothing to send
+    entries = [entry("a", "start", time=0), entry("b", "stop", time=20)]
+    assert ops(coalesce(entries)) == [(None, "ab")]
+
+
+def test_outbox_flush(tmp_path):
+    """Queued changes are sent in order and removed."""
+    outbox = Outbox(str(tmp_path / "outbox.jsonl"))
+    for i, op in enumerate(["log", "complete", "stop"]):
+        outbox.append(entry(str(i), op, task_id=i, minutes=10))
+
+    sent = []
+    assert outbox.flush(lambda e: sent.append(e["op"])) == (3, 0, 0)
+    assert sent == ["log", "complete", "stop"]
+    assert outbox.entries() == []
+
+    # An empty outbox has nothing to send
+    assert outbox.flush(sent.append) == (0, 0, 0)
+
+
+def test_outbox_failures(tmp_path):
+    """Rejected changes are reported or kept for a later report."""
+    outbox = Outbox(str(tmp_path / "outbox.jsonl"))
+    outbox.append(entry("a", "stop"))
+    outbox.append(entry("b", "stop", task_id=2))
+
+    def apply(e):
+        if e["id"] == 1:
+            raise ValueError("Task not found")
+
+    assert outbox.flush(apply) == (1, 1, 0)
+    assert outbox.failures(clear=True) == [
+        (entry("a", "stop"), "Task not found")
+    ]
+    assert outbox.failures() == []
+
+    reported = []
+    outbox.append(entry("c", "stop"))
+    outbox.flush(apply, lambda e, error: reported.append(e["key"]))
+    assert reported == ["c"] and outbox.failures() == []
+
+
+def test_outbox_unreachable(tmp_path):
+    """Changes are retried and kept if the API cannot be reached."""
+    outbox = Outbox(str(tmp_path / "outbox.jsonl"))
+    outbox.append(entry("a", "stop"))
+    outbox.append(entry("b", "stop", task_id=2))
+
+    def apply(e):
+        raise httpx.ConnectError("unreachable")
+
+    delays = []
+    assert outbox.flush(apply, sleep=delays.append) == (0, 0, 2)
+    assert len(delays) == RETRIES
+    assert [e["key"] for e in outbox.entries()] == ["a", "b"]
+
+    # Changes queued meanwhile are sent after the kept ones
+    outbox.append(entry("c", "stop", task_id=3))
+    sent = []
+    assert outbox.flush(lambda e: sent.append(e["key"])) == (3, 0, 0)
+    assert sent == ["a", "b", "c"]
+
+
+def test_outbox_interrupted(tmp_path):
+    """Entries both claimed and queued after an interruption are sent once."""
+    outbox = Outbox(str(tmp_path / "outbox.jsonl"))
+    outbox.append(entry("a", "stop"))
+    with open(outbox.claimed, "w") as f:
+        f.write(json.dumps(entry("a", "stop")) + "\n")
+        f.write('{"key": "b", "op"')  # Partial line
+
+    sent = []
+    assert outbox.flush(lambda e: sent.append(e["key"])) == (1, 0, 0)
+    assert sent == ["a"]
+
+
+def test_outbox_concurrent_flush(tmp_path):
+    """Only one flush runs at a time."""
+    outbox = Outbox(str(tmp_path / "outbox.jsonl"))
+    outbox.append(entry("a", "stop"))
+
+    results, started, release = [], threading.Event(), threading.Event()
+
+    def apply(e):
+        started.set()
+        release.wait(5)
+
+    thread = threading.Thread(
+        target=lambda: results.append(outbox.flush(apply))
+    )
+    thread.start()
+    started.wait(5)
+    assert outbox.flush(apply) is None
+    release.set()
+    thread.join()
+    assert results == [(1, 0, 0)]
+
+
+def test_queue(tmp_path, monkeypatch, capsys):
+    """Changes of a command are queued without a request."""
+    monkeypatch.setenv("RECLAIM_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("RECLAIM_TOKEN", "token")
+    args = argparse.Namespace(id=[1, 2], config="~/.reclaim")
+    args.queue_flush = False
+
+    assert queue(args, "log", minutes=90, end=0.0) == [1, 2]
+    assert capsys.readouterr().out.count("Change: log 1h30m") == 2
+
+    path = outbox_path(account_id("token"))
+    entries = Outbox(path).entries()
+    assert [(e["op"], e["id"], e["minutes"]) for e in entries] == [
+        ("log", 1, 90),
+        ("log", 2, 90),
+    ]
+    assert os.stat(path).st_mode & 0o777 == 0o600
@@ -0,0 +1,84 @@
+"""Test cases for machine-readable output.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import io
+import json
+import subprocess
+import sys
+
+from reclaim.output import RecordWriter
+from reclaim.utils import event_record
+
+
+def test_record_writer():
+    """Records are written as JSON lines, CSV and TSV."""
+    record = {"id": "t00abc", "due": None, "title": "Write, read"}
+
+    stream = io.StringIO()
+    RecordWriter("jsonl", ["id", "due", "title"], stream).write(record)
+    assert json.loads(stream.getvalue()) == record
+
+    stream = io.StringIO()
+    RecordWriter("csv", ["id", "due", "title"], stream).write(record)
+    assert stream.getvalue() == 'id,due,title\nt00abc,,"Write, read"\n'
+
+    stream = io.StringIO()
+    RecordWriter("tsv", ["id", "title"], stream).write(record)
+    assert stream.getvalue() == "id\ttitle\nt00abc\tWrite, read\n"
+
+
+def test_event_record():
+    """Events are converted to records of plain values."""
+    event = {
+        "title": "Write",
+        "eventDate": {
+            "start": "2025-06-05T09:00:00+00:00",
+            "end": "2025-06-05T10:30:00+00:00",
+        },
+        "reclaimData": {
+            "reclaimEventType": "TASK_ASSIGNMENT",
+            "priority": "P2",
+            "reclaimResourceId": {"type": "TaskId", "id": 1},
+        },
+    }
+    record = event_record(event)
+    assert record["duration"] == 90
+    assert record["type"] == "T2"
+    assert record["id"].startswith("t")
+    assert event_record({"dateMode": "ALL_DAY"}) is None
+
+
+def test_format_without_rich():
+    """Tasks are listed as JSON lines without importing rich."""
+    code = """
+import argparse, sys
+sys.modules["httpx._main"] = None  # As in the entry point of the CLI
+import reclaim.store
+from reclaim.commands import load_command
+from reclaim_sdk.resources.task import Task
+
+reclaim.store.TaskStore.tasks = lambda self, max_age: [
+    Task(id=1, title="Write", status="NEW", priority="P2",
+         timeChunksRequired=8, timeChunksSpent=2)
+]
+cmd = load_command("list-tasks")
+args = argparse.Namespace(all=False, status="active", due=None,
+    at_risk=False, order="due", format="jsonl", id=None)
+cmd.run(cmd.validate_args(args))
+assert "rich" not in sys.modules
+"""
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"RECLAIM_TOKEN": "x", "PATH": ""},
+    ).stdout
+    record = json.loads(out)
+    assert (record["title"], record["left"], record["state"]) == (
+        "Write",
+        90,
+        "N2",
+    )
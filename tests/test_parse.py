@@ -0,0 +1,127 @@
+"""Test cases for parsing functions.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import io
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from reclaim.parse import (
+    parse_datetime,
+    parse_datetime_fast,
+    parse_event_time,
+    parse_event_times,
+    parse_tid,
+    read_ids,
+    set_languages,
+)
+from reclaim.str import str_task_id
+
+
+def test_parse_event_time_iso():
+    """ISO timestamps with offsets, "Z" suffixes and fractions are parsed."""
+    utc = datetime(2025, 3, 7, 14, tzinfo=timezone.utc)
+    assert parse_event_time("2025-03-07T14:00:00Z") == utc
+    assert parse_event_time("2025-03-07T09:00:00-05:00") == utc
+    assert parse_event_time("2025-03-07T14:00:00.5Z") == utc + timedelta(
+        milliseconds=500
+    )
+    assert parse_event_time("2025-03-07T14:00:00") == datetime(2025, 3, 7, 14)
+
+
+def test_parse_event_time_fallback():
+    """Malformed timestamps fall back to dateparser."""
+    assert parse_event_time("March 7, 2025 14:00") == datetime(2025, 3, 7, 14)
+    assert parse_event_time("garbage") is None
+    assert parse_event_time(None) is None
+
+
+def test_parse_event_times():
+    """Start and end times of events are parsed in one pass."""
+    events = [
+        {"eventDate": {"start": "2025-03-07T09:00:00Z"}},
+        {"eventDate": None},
+    ]
+    times = parse_event_times(events)
+    assert times[0][0].hour == 9 and times[0][1] is None
+    assert times[1] == (None, None)
+
+
+def test_parse_datetime_fast():
+    """Common datetime expressions are parsed without dateparser."""
+    now = datetime(2025, 6, 4, 12, 30)  # Wednesday
+    assert parse_datetime_fast("tomorrow 17:00", now) == datetime(
+        2025, 6, 5, 17
+    )
+    assert parse_datetime_fast("in 3 days", now) == now + timedelta(days=3)
+    assert parse_datetime_fast("fri", now) == datetime(2025, 6, 6)
+    assert parse_datetime_fast("wed", now) == datetime(2025, 6, 11)
+    assert parse_datetime_fast("2025-06-01 9am", now) == datetime(
+        2025, 6, 1, 9
+    )
+    assert parse_datetime_fast("9am", now) == datetime(2025, 6, 5, 9)
+    assert parse_datetime_fast("eow", now) == datetime(2025, 6, 6, 17)
+    assert parse_datetime_fast("next week", now) is None
+    assert parse_datetime_fast("17", now) is None
+
+
+def test_parse_datetime_languages():
+    """Dateparser is restricted to the configured languages."""
+    try:
+        set_languages(["en"])
+        assert parse_datetime("next week")
+        with pytest.raises(ValueError):
+            parse_datetime("nächste Woche")
+    finally:
+        set_languages(None)
+
+
+def test_read_ids():
+    """Task IDs are read from plain lines, JSON records and task listings."""
+    stream = io.StringIO(
+        "t00abc\n"
+        '{"id": "t00abd", "title": "Write"}\n'
+        "  t00abe  Review paper   1h  ▶\n"
+        "\n"
+    )
+    assert read_ids(stream) == ["t00abc", "t00abd", "t00abe"]
+
+
+def test_read_ids_records(capsys):
+    """Task IDs are read from CSV and TSV records piped from list-tasks."""
+    from reclaim.output import TASK_FIELDS, RecordWriter
+
+    for fmt in ("csv", "tsv"):
+        writer = RecordWriter(fmt, TASK_FIELDS)
+        writer.write({"id": "tac6h1", "title": "Report", "status": "NEW"})
+        writer.write({"id": "t00abd", "title": "Review, paper"})
+        stream = io.StringIO(capsys.readouterr().out)
+        assert read_ids(stream) == ["tac6h1", "t00abd"]
+
+
+def test_read_ids_pipe(tmp_path, monkeypatch, capsys):
+    """Listings in CSV format can be piped into a task command."""
+    import argparse
+
+    from reclaim.commands import load_command
+    from reclaim.index import TaskIndex, index_path
+    from reclaim.output import TASK_FIELDS, RecordWriter
+    from reclaim.utils import account_id
+
+    monkeypatch.setenv("RECLAIM_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("RECLAIM_TOKEN", "test")
+    tasks = [(parse_tid("tac6h1"), "Report", "NEW")]
+    tasks += [(parse_tid("t00abd"), "Review paper", "NEW")]
+    TaskIndex(index_path(account_id("test"))).build(tasks)
+
+    # reclaim list-tasks --format csv | reclaim mark-task - complete
+    writer = RecordWriter("csv", TASK_FIELDS)
+    for task_id, title, _ in tasks:
+        writer.write({"id": str_task_id(task_id), "title": title})
+    monkeypatch.setattr("sys.stdin", io.StringIO(capsys.readouterr().out))
+
+    args = argparse.Namespace(id=["-"], mark="complete")
+    load_command("mark-task").validate_args(args)
+    assert args.id == [task_id for task_id, _, _ in tasks]
@@ -0,0 +1,62 @@
+"""Test cases for profiling.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import io
+
+import httpx
+import pytest
+
+from reclaim.profile import Profile, phase, profile_mode
+from reclaim.transport import ProfilingTransport
+
+
+def test_profile_mode(monkeypatch):
+    """Profile options are taken from the command line or environment."""
+    monkeypatch.delenv("RECLAIM_PROFILE", raising=False)
+    assert profile_mode(["tasks"]) == (None, ["tasks"])
+    assert profile_mode(["--profile", "tasks"]) == ("summary", ["tasks"])
+    assert profile_mode(["--profile=cprofile:x", "tasks"])[0] == "cprofile:x"
+    assert profile_mode(["--profile", "cprofile:x", "tasks"]) == (
+        "cprofile:x",
+        ["tasks"],
+    )
+    assert profile_mode(["tasks", "--profile"]) == ("summary", ["tasks"])
+
+    monkeypatch.setenv("RECLAIM_PROFILE", "1")
+    assert profile_mode(["tasks"]) == ("summary", ["tasks"])
+
+    with pytest.raises(ValueError):
+        profile_mode(["--profile=bad"])
+
+
+def test_profile_report(monkeypatch):
+    """Phases and requests are timed and reported."""
+    monkeypatch.setattr("reclaim.transport._WRAPPERS", [])
+    profile = Profile()
+    profile.start()
+    try:
+        with phase("run command"):
+            with phase("dateparser"):
+                pass
+            transport = ProfilingTransport(
+                httpx.MockTransport(lambda r: httpx.Response(200, text="x")),
+                profile.record,
+            )
+            client = httpx.Client(transport=transport, base_url="https://x")
+            client.get("/api/tasks", params={"a": 1})
+    finally:
+        profile.stop()
+
+    assert [(name, depth) for name, depth, _ in profile.phases] == [
+        ("imports", 0),
+        ("run command", 0),
+        ("dateparser", 1),
+    ]
+    assert profile.requests[0][:4] == ("GET", "/api/tasks", 200, 1)
+
+    stream = io.StringIO()
+    profile.report(stream)
+    assert "    dateparser" in stream.getvalue()
+    assert "1 requests" in stream.getvalue()
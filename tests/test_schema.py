@@ -0,0 +1,46 @@
+"""Test cases for the schema of the config file.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import pytest
+
+from reclaim.schema import config_errors, validate_config
+
+
+def test_config_errors():
+    """Types, typos and calendars are checked."""
+    config = {
+        "reclaim_token": "abc",
+        "theme": "dark",
+        "workers": 4,
+        "rate_limit": 2.5,
+        "extra": "kept",
+        "calendars": {
+            123: {"name": "Work", "color": "sage"},
+            "456": {"name": None, "color": "#33B679"},
+        },
+    }
+    assert config_errors(config) == []
+
+    assert config_errors({"workers": "4"}) == [
+        "workers: expected int, got '4'"
+    ]
+    assert config_errors({"workers": True})
+    assert config_errors({"theme": "blue"})
+    assert "did you mean 'workers'" in config_errors({"worker": 4})[0]
+    assert config_errors({"calendars": {1: {"color": "sagee"}}}) == [
+        "calendars.1.color: unknown color 'sagee'"
+    ]
+    assert config_errors(["list"])
+
+    # Languages are given as list or comma-separated string
+    assert config_errors({"date_languages": ["en", "de"]}) == []
+    assert config_errors({"date_languages": "en, de"}) == []
+    assert config_errors({"date_languages": 1})
+
+
+def test_validate_config():
+    """All errors of a config are raised at once."""
+    with pytest.raises(ValueError, match="workers.*; retries"):
+        validate_config({"workers": "x", "retries": "y"}, "~/.reclaim")
@@ -0,0 +1,31 @@
+"""Test cases for the interactive shell.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import pytest
+
+import reclaim.transport
+from reclaim.shell import Shell
+
+
+def test_shell_execute(tmp_path, capsys, monkeypatch):
+    """Command lines are parsed with a parser built once."""
+    monkeypatch.setattr(reclaim.transport, "_WRAPPERS", [])
+    shell = Shell(str(tmp_path / "config"))
+
+    assert shell.execute("") == 0
+    assert shell.execute("help") == 0
+    assert "list-tasks" in capsys.readouterr().out
+    assert shell.execute("list-tasks --unknown") == 2
+    assert shell.execute("serve") == 2
+    assert shell.execute("refresh") == 0
+
+    # Global options only apply when starting the shell
+    capsys.readouterr()
+    assert shell.execute("--offline list-tasks") == 2
+    assert "--offline is only supported" in capsys.readouterr().err
+    assert shell.execute("--profile list-tasks") == 2
+    assert shell.execute("-c other list-tasks") == 2
+    with pytest.raises(EOFError):
+        shell.execute("exit")
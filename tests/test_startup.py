@@ -0,0 +1,74 @@
+"""Test cases for startup costs.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import os
+import subprocess
+import sys
+
+# Import-time budget for `reclaim --help` in milliseconds
+IMPORT_BUDGET = float(os.environ.get("RECLAIM_IMPORT_BUDGET", "50"))
+
+# Modules that must not be loaded for help and argument errors
+HEAVY_MODULES = ["dateparser", "pydantic", "reclaim_sdk", "rich", "yaml"]
+
+
+def import_times(*args):
+    """Return the top-level import times in milliseconds."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "reclaim", *args],
+        capture_output=True,
+        text=True,
+    )
+
+    times, started = {}, False
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[12:].split("|")
+        started = started or name.strip().startswith("reclaim")
+        if started and not name[1:].startswith(" "):
+            times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def imported_modules(*args):
+    """Return the names of all modules imported."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "reclaim", *args],
+        capture_output=True,
+        text=True,
+    )
+    return {
+        line.split("|")[-1].strip().split(".")[0]
+        for line in proc.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+
+def test_help_import_budget():
+    """Importing for `reclaim --help` stays within the budget."""
+    total = sum(import_times("--help").values())
+    assert total < IMPORT_BUDGET, f"{total:.1f}ms > {IMPORT_BUDGET}ms"
+
+
+def test_help_imports():
+    """Help does not load heavy modules."""
+    assert not set(HEAVY_MODULES) & imported_modules("--help")
+
+
+def test_invalid_args_import():
+    """Argument errors do not load heavy modules."""
+    modules = imported_modules("tasks", "--status", "bogus")
+    assert not set(HEAVY_MODULES) & modules
+
+
+def test_import_side_effects():
+    """Importing the package leaves other modules importable."""
+    proc = subprocess.run(
+        [sys.executable, "-c", "import reclaim, httpx._main"],
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0, proc.stderr
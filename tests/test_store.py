@@ -0,0 +1,76 @@
+"""Test cases for the local task store.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import pytest
+from reclaim_sdk.client import ReclaimClient
+
+from reclaim.store import TaskStore
+
+
+def make_task(task_id, updated, title="Task"):
+    """Return the API data of a task."""
+    return {"id": task_id, "title": title, "status": "NEW", "updated": updated}
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Serve the task list from a mutable list instead of the API."""
+    ReclaimClient.configure(token="test")
+    tasks, calls = [], []
+
+    def get(self, endpoint, **kwargs):
+        calls.append(endpoint)
+        return list(tasks)
+
+    monkeypatch.setattr(ReclaimClient, "get", get)
+    return tasks, calls
+
+
+def test_store_sync(tmp_path, api):
+    """Sync writes changed tasks only and removes deleted tasks."""
+    tasks, _ = api
+    tasks += [
+        make_task(1, "2025-01-01T10:00:00Z"),
+        make_task(2, "2025-01-02T10:00:00Z"),
+    ]
+    store = TaskStore(str(tmp_path / "tasks.sqlite"))
+    assert store.sync() == 2
+
+    tasks[0] = make_task(1, "2025-01-03T10:00:00Z", title="Changed")
+    del tasks[1]
+    assert store.sync() == 2
+    assert [t.title for t in store.tasks()] == ["Changed"]
+
+
+def test_store_sync_unchanged(tmp_path, api):
+    """Sync without changes counts no changes and keeps the index."""
+    tasks, _ = api
+    tasks += [
+        make_task(1, "2025-01-01T10:00:00Z"),
+        make_task(2, "2025-01-02T10:00:00Z"),
+    ]
+    store = TaskStore(str(tmp_path / "tasks.sqlite"))
+    assert store.sync() == 2
+
+    index = tmp_path / "tasks.index"
+    mtime = index.stat().st_mtime_ns
+    assert store.sync() == 0
+    assert store.sync() == 0
+    assert index.stat().st_mtime_ns == mtime
+
+
+def test_store_max_age(tmp_path, api):
+    """Reads are served locally within the freshness bound."""
+    tasks, calls = api
+    tasks.append(make_task(1, "2025-01-01T10:00:00Z"))
+    store = TaskStore(str(tmp_path / "tasks.sqlite"))
+
+    assert len(store.tasks(max_age=60)) == 1
+    assert len(store.tasks(max_age=60)) == 1
+    assert len(calls) == 1
+
+    store.expire()
+    store.tasks(max_age=60)
+    assert len(calls) == 2
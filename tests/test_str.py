@@ -0,0 +1,58 @@
+"""Test cases for string functions.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import pytest
+
+import reclaim.str as rstr
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Use a temporary cache directory and reset the theme."""
+    monkeypatch.setenv("RECLAIM_CACHE_DIR", str(tmp_path))
+    yield tmp_path
+    rstr.set_theme("auto")
+
+
+def test_theme_override(cache_dir, monkeypatch):
+    """A configured theme skips terminal detection."""
+    monkeypatch.setattr(rstr, "is_dark_terminal", pytest.fail)
+    rstr.set_theme("dark")
+    assert rstr._resolve_color("tomato") == rstr._brighten("#D50000")
+    rstr.set_theme("light")
+    assert rstr._resolve_color("tomato") == "#D50000"
+
+
+def test_theme_cached(cache_dir, monkeypatch):
+    """Terminal detection runs once per terminal and is cached on disk."""
+    calls = []
+
+    def detect():
+        calls.append(1)
+        return True
+
+    monkeypatch.setattr(rstr, "is_dark_terminal", detect)
+    rstr.set_theme("auto")
+    assert rstr.dark_terminal() is True
+    assert rstr.dark_terminal() is True
+    assert len(calls) == 1
+    assert (cache_dir / "themes.json").exists()
+
+
+def test_theme_not_detected(cache_dir, monkeypatch):
+    """Failed detections are not cached and are tried again."""
+    calls = []
+    monkeypatch.setattr(rstr, "is_dark_terminal", lambda: calls.append(1))
+    rstr.set_theme("auto")
+    assert rstr.dark_terminal() is None
+    assert rstr.dark_terminal() is None
+    assert len(calls) == 2
+    assert not (cache_dir / "themes.json").exists()
+
+
+def test_invalid_theme():
+    """Unknown themes are rejected."""
+    with pytest.raises(ValueError):
+        rstr.set_theme("blue")
@@ -0,0 +1,286 @@
+"""Test cases for the HTTP transport layers.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import time
+
+import httpx
+import pytest
+
+from reclaim.transport import (
+    CachingTransport,
+    CassetteTransport,
+    OfflineError,
+    RateLimitTransport,
+    RetryTransport,
+    SnapshotTransport,
+    offline_since,
+    reset_offline,
+)
+
+
+def test_caching_transport():
+    """GET responses are cached until another request is sent."""
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        return httpx.Response(200, json={"calls": len(calls)})
+
+    transport = CachingTransport(httpx.MockTransport(handler), ttl=60)
+    client = httpx.Client(transport=transport, base_url="https://x")
+
+    assert client.get("/api/events").json() == {"calls": 1}
+    assert client.get("/api/events").json() == {"calls": 1}
+    client.post("/api/events", json={})
+    assert client.get("/api/events").json() == {"calls": 3}
+
+
+def test_caching_transport_write_through():
+    """Mutated tasks are written through to the cached task list."""
+    tasks = {1: {"id": 1, "title": "Write"}, 2: {"id": 2, "title": "Read"}}
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if request.url.path == "/api/tasks":
+            return httpx.Response(200, json=list(tasks.values()))
+        if request.url.path == "/api/planner/done/task/1":
+            return httpx.Response(
+                200, json={"taskOrHabit": {"id": 1, "title": "Done"}}
+            )
+        return httpx.Response(204)
+
+    transport = CachingTransport(httpx.MockTransport(handler), ttl=60)
+    client = httpx.Client(transport=transport, base_url="https://x")
+
+    client.get("/api/tasks")
+    client.post("/api/planner/done/task/1")
+    client.delete("/api/tasks/2")
+    assert client.get("/api/tasks").json() == [{"id": 1, "title": "Done"}]
+    assert client.get("/api/tasks/1").json()["title"] == "Done"
+    assert calls.count("/api/tasks") == 1
+
+
+def test_retry_transport(monkeypatch):
+    """Idempotent requests are retried on transient server errors."""
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    statuses = [503, 502, 200, 503, 200]
+
+    def handler(request):
+        return httpx.Response(statuses.pop(0))
+
+    transport = RetryTransport(httpx.MockTransport(handler), retries=3)
+    client = httpx.Client(transport=transport, base_url="https://x")
+
+    assert client.get("/api/tasks").status_code == 200
+    assert client.post("/api/tasks").status_code == 503
+    assert statuses == [200]
+
+
+def test_retry_transport_connect(monkeypatch):
+    """Requests are retried if the connection cannot be established."""
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        raise httpx.ConnectError("Connection refused", request=request)
+
+    transport = RetryTransport(httpx.MockTransport(handler), retries=2)
+    client = httpx.Client(transport=transport, base_url="https://x")
+
+    with pytest.raises(httpx.ConnectError):
+        client.post("/api/tasks")
+    assert len(attempts) == 3
+
+
+def test_rate_limit_transport():
+    """Requests are paced by a token bucket and retried after 429."""
+    statuses = [200, 200, 429, 200]
+
+    def handler(request):
+        return httpx.Response(statuses.pop(0), headers={"Retry-After": "0.05"})
+
+    transport = RateLimitTransport(httpx.MockTransport(handler), 50, 1)
+    client = httpx.Client(transport=transport, base_url="https://x")
+
+    start = time.monotonic()
+    assert client.get("/api/tasks").status_code == 200
+    assert client.get("/api/tasks").status_code == 200
+    assert client.post("/api/tasks").status_code == 200
+    assert time.monotonic() - start >= 0.05 + 2 / 50
+    assert transport.stats["requests"] == 4
+    assert transport.stats["limited"] == 1
+    assert transport.stats["wait"] > 0
+
+
+def test_rate_limit_transport_shared(tmp_path):
+    """The token bucket is shared across processes with a lock file."""
+    path = str(tmp_path / "ratelimit.json")
+    mock = httpx.MockTransport(lambda request: httpx.Response(200))
+    first = RateLimitTransport(mock, rate=20, burst=1, path=path)
+    second = RateLimitTransport(mock, rate=20, burst=1, path=path)
+
+    first.acquire()
+    second.acquire()
+    assert first.stats["throttled"] == 0
+    assert second.stats["throttled"] == 1
+
+
+def test_cassette_transport(tmp_path):
+    """Recorded responses are replayed in order without network access."""
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.params["start"])
+        return httpx.Response(200, json={"calls": len(calls)})
+
+    transport = CassetteTransport(tmp_path, httpx.MockTransport(handler))
+    client = httpx.Client(transport=transport, base_url="https://x")
+    for _ in range(2):
+        client.get("/api/events", params={"start": "2025-01-01"})
+
+    # Replay on another day; the last response repeats
+    client = httpx.Client(
+        transport=CassetteTransport(tmp_path), base_url="https://x"
+    )
+    params = {"start": "2026-10-18"}
+    assert client.get("/api/events", params=params).json() == {"calls": 1}
+    assert client.get("/api/events", params=params).json() == {"calls": 2}
+    assert client.get("/api/events", params=params).json() == {"calls": 2}
+    assert len(calls) == 2
+
+    with pytest.raises(httpx.ConnectError):
+        client.get("/api/tasks")
+
+
+def test_cassette_transport_body(tmp_path):
+    """Changes are only replayed for the recorded payload."""
+
+    def handler(request):
+        return httpx.Response(200, json={"id": 1})
+
+    transport = CassetteTransport(tmp_path, httpx.MockTransport(handler))
+    client = httpx.Client(transport=transport, base_url="https://x")
+    payload = {"title": "Task", "due": "2025-01-01T10:00:00Z"}
+    client.post("/api/tasks", json=payload)
+
+    # Replay at another time, but not with another title
+    client = httpx.Client(
+        transport=CassetteTransport(tmp_path), base_url="https://x"
+    )
+    payload["due"] = "2026-10-18T09:47:25.519802Z"
+    assert client.post("/api/tasks", json=payload).json() == {"id": 1}
+    with pytest.raises(httpx.ConnectError):
+        client.post("/api/tasks", json=dict(payload, title="Other"))
+
+
+def test_snapshot_transport(tmp_path, monkeypatch):
+    """Snapshots are served on failures and in offline mode."""
+    monkeypatch.setattr("reclaim.transport._OFFLINE_SINCE", None)
+    online = [True]
+
+    def handler(request):
+        if not online[0]:
+            raise httpx.ConnectError("down", request=request)
+        return httpx.Response(200, json=[{"id": 1, "title": "Write"}])
+
+    path = str(tmp_path / "snapshots.sqlite")
+    transport = SnapshotTransport(httpx.MockTransport(handler), path)
+    client = httpx.Client(transport=transport, base_url="https://x")
+    assert client.get("/api/tasks").json()[0]["title"] == "Write"
+    assert offline_since() is None
+
+    # Fall back to the snapshot, also for a single task of the list
+    online[0] = False
+    assert client.get("/api/tasks").json()[0]["title"] == "Write"
+    assert client.get("/api/tasks/1").json() == {"id": 1, "title": "Write"}
+    assert offline_since() is not None
+    reset_offline()
+    assert offline_since() is None
+    with pytest.raises(httpx.ConnectError):
+        client.get("/api/events")
+
+    offline = SnapshotTransport(
+        httpx.MockTransport(handler), path, offline=True
+    )
+    client = httpx.Client(transport=offline, base_url="https://x")
+    assert client.get("/api/tasks").status_code == 200
+    with pytest.raises(OfflineError):
+        client.post("/api/tasks", json={})
+
+
+def test_snapshot_transport_retries(tmp_path, monkeypatch):
+    """Snapshots are served only after retries within the timeout."""
+    monkeypatch.setattr("reclaim.transport._OFFLINE_SINCE", None)
+    monkeypatch.setattr("reclaim.transport.time.sleep", lambda s: None)
+    calls, timeouts = [], []
+
+    def handler(request):
+        calls.append(request.url.path)
+        timeouts.append(request.extensions["timeout"])
+        if len(calls) == 2:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"calls": len(calls)})
+
+    path = str(tmp_path / "snapshots.sqlite")
+    retry = RetryTransport(httpx.MockTransport(handler), retries=2)
+    transport = SnapshotTransport(retry, path, timeout=5.0)
+    client = httpx.Client(
+        transport=transport,
+        base_url="https://x",
+        timeout=httpx.Timeout(30.0, connect=10.0),
+    )
+    assert client.get("/api/tasks").json() == {"calls": 1}
+
+    # The transient error is retried instead of served from the snapshot
+    assert client.get("/api/tasks").json() == {"calls": 3}
+    assert offline_since() is None
+    assert timeouts[-1]["read"] == 30.0 and timeouts[-1]["connect"] == 10.0
+
+
+def test_snapshot_transport_deadline(tmp_path, monkeypatch):
+    """Snapshots are served if a response takes longer than the timeout."""
+    import threading
+
+    monkeypatch.setattr("reclaim.transport._OFFLINE_SINCE", None)
+    calls, release = [], threading.Event()
+
+    def handler(request):
+        calls.append(request.url.path)
+        if len(calls) > 1:
+            release.wait(5)  # Connected, but answering slowly
+        return httpx.Response(200, json={"calls": len(calls)})
+
+    path = str(tmp_path / "snapshots.sqlite")
+    transport = SnapshotTransport(
+        httpx.MockTransport(handler), path, timeout=0.1
+    )
+    client = httpx.Client(transport=transport, base_url="https://x")
+    assert client.get("/api/tasks").json() == {"calls": 1}
+
+    start = time.time()
+    assert client.get("/api/tasks").json() == {"calls": 1}
+    assert time.time() - start < 1
+    assert offline_since() is not None
+    release.set()
+
+
+def test_install_order(tmp_path, monkeypatch):
+    """Snapshots wrap the retries in the transport chain."""
+    import argparse
+
+    from reclaim_sdk.client import ReclaimClient
+
+    from reclaim.transport import install
+
+    monkeypatch.setenv("RECLAIM_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr("reclaim.transport._WRAPPERS", [])
+    client = install(
+        ReclaimClient.configure(token="test"), argparse.Namespace()
+    )
+    transport = client.session._transport
+    assert isinstance(transport, SnapshotTransport)
+    assert isinstance(transport.transport, RetryTransport)
@@ -0,0 +1,88 @@
+"""Test cases for utility functions.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+import reclaim.store
+import reclaim.utils
+from reclaim.utils import fetch_parallel, for_each_task, read_config
+
+
+def test_fetch_parallel():
+    """Independent calls run concurrently and keep their order."""
+
+    def call(value):
+        time.sleep(0.2)
+        return value
+
+    start = time.monotonic()
+    assert fetch_parallel(lambda: call(1), lambda: call(2)) == [1, 2]
+    assert time.monotonic() - start < 0.35
+
+
+def test_fetch_parallel_error():
+    """Errors of a call are raised after all calls are joined."""
+
+    def fail():
+        raise ValueError("Not found")
+
+    with pytest.raises(ValueError):
+        fetch_parallel(fail, lambda: None)
+
+
+def test_for_each_task(monkeypatch, capsys):
+    """Failures of single tasks are reported without stopping the rest."""
+
+    class FakeTask:
+        def __init__(self, task_id):
+            self.id = task_id
+            self.title = f"Task {task_id}"
+
+    def get_task(task_id):
+        if task_id == 2:
+            raise ValueError("Not found")
+        return FakeTask(task_id)
+
+    monkeypatch.setattr(reclaim.utils, "get_task", get_task)
+    monkeypatch.setattr(reclaim.store, "expire_tasks", lambda: None)
+
+    with pytest.raises(ValueError, match="1 of 3 tasks failed"):
+        for_each_task([1, 2, 3], lambda task: "Done", workers=2)
+
+    out, err = capsys.readouterr()
+    assert out.count("Done") == 2
+    assert "Not found" in err
+
+
+def test_read_config_cache(tmp_path, monkeypatch):
+    """The config is parsed once and reparsed after a change."""
+    monkeypatch.setenv("RECLAIM_CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "reclaim.yaml"
+    path.write_text("reclaim_token: abc\nworkers: 2\n")
+    assert read_config(str(path)) == {"reclaim_token": "abc", "workers": 2}
+
+    # Cached config is read without YAML
+    monkeypatch.setitem(sys.modules, "yaml", None)
+    assert read_config(str(path))["workers"] == 2
+    monkeypatch.undo()
+
+    monkeypatch.setenv("RECLAIM_CACHE_DIR", str(tmp_path / "cache"))
+    path.write_text("reclaim_token: abc\nworkers: 8\n")
+    os.utime(path, ns=(0, 0))
+    assert read_config(str(path))["workers"] == 8
+    assert read_config(str(tmp_path / "missing")) is None
+
+
+def test_read_config_invalid(tmp_path, monkeypatch):
+    """Invalid configs are rejected and not cached."""
+    monkeypatch.setenv("RECLAIM_CACHE_DIR", str(tmp_path))
+    path = tmp_path / "reclaim.yaml"
+    path.write_text("calendars:\n  123:\n    colour: sage\n")
+    with pytest.raises(ValueError, match="did you mean 'color'"):
+        read_config(str(path))
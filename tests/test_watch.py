@@ -0,0 +1,168 @@
+"""Test cases for watching listings.
+
+Copyright (c) 2025 Konrad Rieck <konrad@mlsec.org>
+"""
+
+import argparse
+
+import pytest
+
+from reclaim.watch import (
+    BACKOFF,
+    MAX_BACKOFF,
+    RowCache,
+    check_watch_args,
+    next_interval,
+    watch,
+)
+
+
+def test_row_cache():
+    """Rows are only formatted for new or changed items."""
+    formatted = []
+
+    def format_row(item):
+        formatted.append(item)
+        return (str(item),)
+
+    cache = RowCache(format_row)
+    assert cache.get([1, 2], ["a", "b"]) == [("1",), ("2",)]
+    assert cache.get([1, 3], ["a", "c"]) == [("1",), ("3",)]
+    assert formatted == [1, 2, 3]
+
+    # Items with equal keys are all shown
+    assert cache.get([1, 1], ["a", "a"]) == [("1",), ("1",)]
+    assert formatted == [1, 2, 3]
+
+
+def test_next_interval():
+    """Polling backs off while nothing changes."""
+    assert next_interval(10, 10, False) == 10 * BACKOFF
+    assert next_interval(10 * MAX_BACKOFF, 10, False) == 10 * MAX_BACKOFF
+    assert next_interval(30, 10, True) == 10
+
+
+def test_watch():
+    """Listings are polled until interrupted, with backoff and errors."""
+    results = ["first", None, RuntimeError("offline"), "second"]
+    delays = []
+
+    def poll():
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def sleep(delay):
+        delays.append(delay)
+        if not results:
+            raise KeyboardInterrupt
+
+    watch(poll, 2, sleep)
+    assert delays == [2, 2 * BACKOFF, 2 * BACKOFF**2, 2]
+
+
+def test_check_watch_args():
+    """Watching requires a positive interval and the table format."""
+    check_watch_args(argparse.Namespace(watch=None, format="csv"))
+    check_watch_args(argparse.Namespace(watch=5, format="table"))
+    with pytest.raises(ValueError):
+        check_watch_args(argparse.Namespace(watch=0, format="table"))
+    with pytest.raises(ValueError):
+        check_watch_args(argparse.Namespace(watch=5, format="jsonl"))
+
+
+def test_watch_tasks_unchanged(tmp_path, monkeypatch):
+    """An unchanged task store is not redrawn and polling backs off."""
+    from reclaim_sdk.client import ReclaimClient
+
+    import reclaim.watch
+    from reclaim.commands import load_command
+    from reclaim.store import TaskStore
+
+    ReclaimClient.configure(token="test")
+    tasks = [
+        {
+            "id": 1,
+            "title": "Task",
+            "status": "NEW",
+            "priority": "P2",
+            "updated": "2025-01-01T10:00:00Z",
+            "timeChunksRequired": 4,
+            "timeChunksSpent": 1,
+            "timeChunksRemaining": 3,
+            "eventColor": "NONE",
+        }
+    ]
+    monkeypatch.setattr(ReclaimClient, "get", lambda self, e, **kw: tasks)
+
+    drawn, delays, original = [], [], reclaim.watch.watch
+
+    def sleep(delay):
+        delays.append(delay)
+        if len(delays) == 4:
+            raise KeyboardInterrupt
+
+    def watch(poll, interval):
+        def counted():
+            result = poll()
+            drawn.append(result is not None)
+            return result
+
+        original(counted, interval, sleep)
+
+    monkeypatch.setattr(reclaim.watch, "watch", watch)
+    store = TaskStore(str(tmp_path / "tasks.sqlite"))
+    cmd = load_command("list-tasks")
+    args = argparse.Namespace(watch=2, status=[], at_risk=False, due=None)
+    args.order = "due"
+    cmd.watch_tasks(store, store.tasks(), args)
+
+    assert drawn == [True, False, False, False]
+    assert delays == [2, 2 * BACKOFF, 2 * BACKOFF**2, 2 * BACKOFF**3]
+
+
+def test_watch_events_habits(monkeypatch):
+    """Habits created while watching are looked up again on changes."""
+    import reclaim.watch
+    from reclaim.commands import load_command
+    from reclaim.str import str_habit_id
+
+    def event(n, title):
+        return {
+            "eventId": f"e{n}",
+            "title": title,
+            "eventDate": {
+                "start": f"2025-01-01T{9 + n:02d}:00:00+00:00",
+                "end": f"2025-01-01T{10 + n:02d}:00:00+00:00",
+            },
+            "reclaimData": {
+                "reclaimResourceId": {"type": "SmartSeriesId", "seriesId": n}
+            },
+        }
+
+    events = [event(0, "Focus"), event(0, "Focus"), event(1, "Lunch")]
+    habits = [{"title": "Focus", "id": 1}, {"title": "Lunch", "id": 2}]
+
+    class Client(object):
+        def get(self, endpoint, **kwargs):
+            return habits
+
+    cmd = load_command("list-events")
+    monkeypatch.setattr(cmd, "fetch", lambda args, client: events)
+    shown = []
+    monkeypatch.setattr(
+        cmd, "create_table", lambda rows, multi_day: shown.append(rows)
+    )
+
+    def watch(poll, interval):
+        poll()
+        poll()
+
+    monkeypatch.setattr(reclaim.watch, "watch", watch)
+    args = argparse.Namespace(watch=2, future=None)
+    cmd.watch_events(Client(), events[:2], {"Focus": 1}, args)
+
+    # Duplicate events are kept and the new habit is looked up
+    assert [row[1] for row in shown[0]] == [str_habit_id(1)] * 2
+    assert [row[1] for row in shown[1]][2] == str_habit_id(2)